@@ -8,12 +8,32 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 import time
 import csv
-import pandas as pd
 import re
 import os
+import sys
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, FIRST_COMPLETED
+from concurrent.futures import wait as wait_for_futures
 import subprocess
+from driver_pool import DriverPool
+from geofence import CHENNAI_GEOFENCE, check_place_url
+from place_fields import (
+    FIELD_SELECTORS, PHONE_XPATHS,
+    CATEGORY_SELECTORS, STATUS_SELECTORS, HOURS_CELL_XPATHS, RATING_SELECTORS,
+    REVIEW_SELECTORS, CLOSED_SELECTORS, SECTION_MARKERS, SELECTOR_TIERS, phone_candidate_text, parse_phone_text,
+    is_store_type_text, parse_status_text, parse_hours_text, parse_rating_text,
+    parse_review_count, is_permanently_closed_text, build_place_result, probed_selectors, absent_fields
+)
+from place_parser import LXML_AVAILABLE, parse_place_html, save_place_html, parse_stored_page
+from place_urls import PlaceIndex
+from storage import PlaceStore, DEFAULT_DB_FILENAME
+from result_writer import ResultWriter, CsvSink, StoreSink
+from rate_limiter import RateLimiter
+from selector_stats import SelectorStats
+from driver_watchdog import Watchdog, kill_driver_process_tree
+from retry_policy import (
+    EMPTY_PANEL, TIMEOUT, WRITE_ERROR, RetryQueue, ErrorStore, classify_failure, is_empty_panel, backoff_delay
+)
 
 # Try to import webdriver_manager for automatic ChromeDriver management
 try:
@@ -27,6 +47,128 @@ except ImportError:
 # Global lock for thread-safe CSV writing
 csv_lock = threading.Lock()
 
+# Places already written to the output CSV, matched by feature ID or place ID.
+# Loaded once at startup by load_processed_index and kept current by
+# append_result_to_csv (under csv_lock), once the row is actually written.
+processed_keys = PlaceIndex()
+processed_index_source = None
+# Places that have an 'Error' row in the output CSV, loaded with processed_keys
+# and kept current by claim_error_row (the SQLite store upserts, so a later row
+# for the place there just replaces the old one)
+error_keys = PlaceIndex()
+
+# Where results are stored: 'csv' appends to the output CSV, 'sqlite' upserts into
+# STORAGE_DB_FILENAME in batched transactions (export with: python storage.py export-places out.csv)
+STORAGE_BACKEND = 'csv'
+STORAGE_DB_FILENAME = DEFAULT_DB_FILENAME
+STORAGE_BATCH_SIZE = 50
+place_store = None
+
+# Batched background writer used during multithreaded runs (see result_writer.py).
+# Workers only queue rows; a batch is written at RESULT_WRITER_BATCH_SIZE rows or
+# after RESULT_WRITER_FLUSH_SECONDS. Durability (RESULT_WRITER_FSYNC):
+#   'batch'    fsync every written batch: a crash loses only rows not yet written
+#   'interval' fsync at most every RESULT_WRITER_FSYNC_SECONDS
+#   'none'     leave syncing to the OS
+# Rows lost in a crash were never written, so the next run re-processes them.
+RESULT_WRITER_BATCH_SIZE = 25
+RESULT_WRITER_FLUSH_SECONDS = 2.0
+RESULT_WRITER_FSYNC = 'batch'
+RESULT_WRITER_FSYNC_SECONDS = 10.0
+result_writer = None
+
+# Adaptive page rate (token bucket, see rate_limiter.py): starts at PAGES_PER_MINUTE,
+# rises while pages succeed and halves on errors, within the min/max bounds.
+# Extraction processes using the same RATE_LIMIT_STATE_FILE share one budget (its
+# 'extraction' entry; Google_Maps.py keeps a separate 'discovery' one there);
+# None keeps the limit per process.
+PAGES_PER_MINUTE = 20
+MIN_PAGES_PER_MINUTE = 4
+MAX_PAGES_PER_MINUTE = 60
+RATE_LIMIT_STATE_FILE = 'xtract_rate_limit.json'
+
+# Failed pages are retried instead of written as 'Error' rows (see retry_policy.py).
+# Every failed attempt goes to <output>_errors.csv with its failure class; the URL is
+# re-queued after RETRY_BACKOFF_SECONDS, doubling per attempt up to the max. Only a
+# success, or an 'Error' row after MAX_ATTEMPTS, reaches the main output. With
+# RETRY_EXHAUSTED_NEXT_RUN those 'Error' rows do not count as processed on resume;
+# a place that fails again is not given a second 'Error' row, and one that now
+# succeeds has its old 'Error' row dropped from the output CSV at the end of the run.
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 5.0
+RETRY_BACKOFF_MAX_SECONDS = 120.0
+RETRY_EXHAUSTED_NEXT_RUN = True
+
+# Wall-clock budget per URL (page load + extraction, not the rate-limit wait).
+# Past it the watchdog kills the worker's Chrome/chromedriver process tree; the
+# URL is retried as a 'timeout' and the pool starts a fresh driver. None disables it.
+# 'auto' derives it from TIMING_PROFILE (see url_time_budget): a sparse listing on
+# which every waited-for selector times out must still fit, or it would end as an
+# 'Error' row after MAX_ATTEMPTS kills.
+URL_TIME_BUDGET_SECONDS = 'auto'
+ELEMENT_WAIT_SECONDS = 15          # Element wait per selector outside the 'event' profile
+PAGE_LOAD_ALLOWANCE_SECONDS = 30   # driver.get() and the readyState waits
+FIXED_SLEEP_SECONDS = 45           # Unconditional sleeps of a page (and its scroll passes) at sleep_scale 1.0
+WATCHDOG_GRACE_SECONDS = 30  # Kill again and report if the worker is still not back
+
+# Output CSV columns, in order
+OUTPUT_FIELDNAMES = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status', 'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
+
+# Driver pool recycling policy: each worker keeps its Chrome driver across URLs
+# and only restarts it after this many pages, or after a failed page
+DRIVER_RECYCLE_AFTER_PAGES = 50
+DRIVER_RECYCLE_ON_ERROR = True
+
+# Page timing profiles (select with TIMING_PROFILE)
+# 'fixed': the original unconditional sleeps after navigation, scrolling and lookups
+# 'event': wait for the place title, the info rows and a short mutation-free window,
+#          bounded by a per-page deadline, and skip the fixed sleeps entirely
+TIMING_PROFILE = 'fixed'
+TIMING_PROFILES = {
+    'fixed': {'sleep_scale': 1.0, 'page_deadline': None, 'quiet_window': None, 'element_timeout': None},
+    'event': {'sleep_scale': 0.0, 'page_deadline': 20, 'quiet_window': 0.5, 'element_timeout': 2},
+}
+
+# Field extraction mode (select with EXTRACTION_MODE)
+# 'selenium': one find_elements/scrollIntoView/.text round-trip per selector and candidate
+# 'snapshot': one execute_script evaluating every selector list, validated in Python
+# 'offline':  capture the place panel HTML once and parse it with lxml in a process pool
+EXTRACTION_MODE = 'selenium'
+SNAPSHOT_CANDIDATE_LIMIT = 25  # Max candidates returned per selector
+OFFLINE_HTML_DIR = 'place_html'  # Captured panels are kept here for re-parsing
+PARSE_PROCESSES = os.cpu_count() or 2
+
+# 'selenium' mode: probe once per page which panel sections exist (one execute_script)
+# and skip the extractors, waits and fallback selectors of sections that are absent
+PRESENCE_PROBE = True
+
+# Geo-fence applied to input rows before any browser work (None disables it).
+# A fence is {'center': (lat, lng), 'radius_km': ...} and/or {'polygon': [(lat, lng), ...]}.
+# Out-of-area rows are written to <input>_out_of_area.csv ('quarantine') or skipped ('drop').
+GEOFENCE = CHENNAI_GEOFENCE
+GEOFENCE_ACTION = 'quarantine'
+GEOFENCE_KEEP_UNKNOWN = True  # Rows whose URL has no coordinates are still processed
+
+# Readiness wait totals per step (count, sum, max seconds), recorded by
+# wait_for_place_ready; fixed size however many pages a run loads
+READINESS_STEPS = ('title', 'info_rows', 'quiet', 'total')
+readiness_totals = {'pages': 0, 'timed_out_pages': 0,
+                    'steps': {step: {'count': 0, 'sum': 0.0, 'max': 0.0} for step in READINESS_STEPS}}
+readiness_lock = threading.Lock()
+
+# Pages probed and how often each field's section was absent (probe_place_sections)
+probe_counts = {'pages': 0, 'absent': {}}
+
+# Selector registry (see selector_stats.py): the extractors try their selectors in
+# order of expected payoff (hit rate / latency) learned from earlier runs, only
+# within the precedence tiers of place_fields.SELECTOR_TIERS. The stats
+# are kept in SELECTOR_STATS_FILE. A DOM-change alert is printed when a field's
+# usual best selector stops matching. ADAPTIVE_SELECTOR_ORDER = False keeps the
+# configured order but still records the stats.
+SELECTOR_STATS_FILE = 'xtract_selector_stats.json'
+ADAPTIVE_SELECTOR_ORDER = True
+selector_stats = SelectorStats(adaptive=ADAPTIVE_SELECTOR_ORDER, configured=FIELD_SELECTORS, tiers=SELECTOR_TIERS)
+
 def get_chrome_version():
     """Get the installed Chrome browser version for better compatibility"""
     try:
@@ -123,20 +265,73 @@ def safe_driver_quit(driver):
         except Exception as e2:
             print(f"Warning: Error terminating process: {e2}")
             try:
-                # Force kill as last resort
-                if hasattr(driver, 'service') and driver.service and hasattr(driver.service, 'process') and driver.service.process:
-                    driver.service.process.kill()
+                # Force kill chromedriver and its Chrome children as last resort
+                kill_driver_process_tree(driver)
             except:
                 pass
 
+def get_place_store():
+    """The shared SQLite store, opened on first use (STORAGE_BACKEND = 'sqlite')"""
+    global place_store
+    with csv_lock:
+        if place_store is None:
+            place_store = PlaceStore(STORAGE_DB_FILENAME, batch_size=STORAGE_BATCH_SIZE)
+        return place_store
+
+def start_result_writer(output_filename):
+    """Start the batched background writer for the configured storage backend"""
+    global result_writer
+    if STORAGE_BACKEND == 'sqlite':
+        sink = StoreSink(get_place_store())
+    else:
+        sink = CsvSink(output_filename, OUTPUT_FIELDNAMES)
+    result_writer = ResultWriter(sink, batch_size=RESULT_WRITER_BATCH_SIZE,
+                                 flush_interval=RESULT_WRITER_FLUSH_SECONDS,
+                                 fsync_policy=RESULT_WRITER_FSYNC,
+                                 fsync_interval=RESULT_WRITER_FSYNC_SECONDS)
+    return result_writer
+
+def stop_result_writer():
+    """Drain queued rows to disk and stop the writer; later results are written directly"""
+    global result_writer
+    writer_thread = result_writer
+    if writer_thread is None:
+        return None
+    result_writer = None
+    writer_thread.close()
+    return writer_thread.stats()
+
+def confirm_written(url, written):
+    """Result writer callback: index the place once its row is on disk"""
+    if written.exception() is None:
+        with csv_lock:
+            processed_keys.add(url)
+
 def append_result_to_csv(result, output_filename, write_header=False):
     """
     Thread-safe append of a single result to the output CSV file immediately
+    With the 'sqlite' backend the result is upserted into the store instead.
+    While the batched result writer is running the row is only queued for it,
+    and the returned Future resolves (or raises) once the writer has written it.
     """
     try:
+        writer_thread = result_writer
+        if writer_thread is not None:
+            url = result.get('URL')
+            written = writer_thread.submit(result)
+            written.add_done_callback(lambda done: confirm_written(url, done))
+            return written
+
+        if STORAGE_BACKEND == 'sqlite':
+            store = get_place_store()
+            with csv_lock:
+                store.upsert_place(result)
+                processed_keys.add(result.get('URL'))
+            return True
+
         with csv_lock:  # Thread-safe CSV writing
             with open(output_filename, 'a', newline='', encoding='utf-8') as file:
-                fieldnames = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status', 'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
+                fieldnames = OUTPUT_FIELDNAMES
                 writer = csv.DictWriter(file, fieldnames=fieldnames)
 
                 # Write header only if this is the first write
@@ -145,6 +340,7 @@ def append_result_to_csv(result, output_filename, write_header=False):
 
                 # Write the data row
                 writer.writerow(result)
+                processed_keys.add(result.get('URL'))
 
         return True
     except Exception as e:
@@ -153,23 +349,191 @@ def append_result_to_csv(result, output_filename, write_header=False):
         traceback.print_exc()
         return False
 
+def load_processed_index(output_filename):
+    """
+    Build the in-memory index of processed places from the output CSV.
+    Read once at startup; returns the number of distinct places already processed.
+    """
+    global processed_index_source
+
+    urls = []
+    error_urls = []
+    if STORAGE_BACKEND == 'sqlite':
+        urls = get_place_store().processed_urls(include_errors=not RETRY_EXHAUSTED_NEXT_RUN)
+    elif os.path.exists(output_filename):
+        try:
+            with open(output_filename, 'r', newline='', encoding='utf-8') as file:
+                for row in csv.DictReader(file):
+                    if row.get('Name') == 'Error':
+                        error_urls.append(row.get('URL'))
+                        if RETRY_EXHAUSTED_NEXT_RUN:
+                            continue
+                    urls.append(row.get('URL'))
+        except Exception as e:
+            print(f"Warning: Error reading processed URLs: {e}")
+
+    with csv_lock:
+        processed_keys.clear()
+        for url in urls:
+            processed_keys.add(url)
+        error_keys.clear()
+        for url in error_urls:
+            error_keys.add(url)
+        processed_index_source = output_filename
+        return len(processed_keys)
+
 def check_url_already_processed(url, output_filename):
     """
-    Check if a URL has already been processed by reading the existing output file
+    Check if a URL's place has already been processed, using the in-memory index
     """
-    if not os.path.exists(output_filename):
-        return False
+    if processed_index_source != output_filename:
+        load_processed_index(output_filename)
 
-    try:
+    with csv_lock:
+        return url in processed_keys
+
+def claim_error_row(url):
+    """True when this URL's place has no 'Error' row yet; it is recorded as having one from now on"""
+    with csv_lock:
+        return error_keys.add(url)
+
+def drop_superseded_error_rows(output_filename):
+    """
+    Rewrite the output CSV without the 'Error' rows of places that also have a
+    real row (a retry in a later run succeeded). Returns the number of rows dropped.
+    """
+    if STORAGE_BACKEND != 'csv' or not os.path.exists(output_filename):
+        return 0
+    with csv_lock:
         with open(output_filename, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            found = PlaceIndex(row.get('URL') for row in csv.DictReader(file) if row.get('Name') != 'Error')
+            file.seek(0)
+            superseded = sum(1 for row in csv.DictReader(file) if row.get('Name') == 'Error' and row.get('URL') in found)
+        if not superseded:
+            return 0
+
+        temp_filename = f"{output_filename}.{os.getpid()}.tmp"
+        with open(output_filename, 'r', newline='', encoding='utf-8') as source, \
+                open(temp_filename, 'w', newline='', encoding='utf-8') as target:
+            reader = csv.DictReader(source)
+            writer = csv.DictWriter(target, fieldnames=reader.fieldnames)
+            writer.writeheader()
             for row in reader:
-                if row.get('URL') == url:
-                    return True
-    except Exception as e:
-        print(f"Warning: Error checking processed URLs: {e}")
+                if not (row.get('Name') == 'Error' and row.get('URL') in found):
+                    writer.writerow(row)
+        os.replace(temp_filename, output_filename)
+    return superseded
+
+def url_time_budget():
+    """
+    URL_TIME_BUDGET_SECONDS, with 'auto' worked out from the timing profile as the
+    worst case: page load, the profile's sleeps or readiness deadline, and an
+    element timeout for every selector tried through wait.until (address,
+    website, name, then every status and rating selector)
+    """
+    if URL_TIME_BUDGET_SECONDS != 'auto':
+        return URL_TIME_BUDGET_SECONDS
+    profile = TIMING_PROFILES[TIMING_PROFILE]
+    element_timeout = profile['element_timeout'] or ELEMENT_WAIT_SECONDS
+    waited_selectors = 3 + len(STATUS_SELECTORS) + len(RATING_SELECTORS)
+    sleeps = FIXED_SLEEP_SECONDS * profile['sleep_scale'] + (profile['page_deadline'] or 0)
+    return int(PAGE_LOAD_ALLOWANCE_SECONDS + sleeps + waited_selectors * element_timeout)
+
+def profile_sleep(seconds):
+    """Sleep for a fixed pause scaled by the active timing profile (skipped in 'event')"""
+    scale = TIMING_PROFILES[TIMING_PROFILE]['sleep_scale']
+    if scale > 0:
+        time.sleep(seconds * scale)
+
+# Resolves once the place panel has had no DOM mutations for the quiet window,
+# or when the maximum wait is reached. Returns the milliseconds spent waiting.
+WAIT_FOR_DOM_QUIET_JS = """
+var quietMs = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var target = document.querySelector("div[role='main']") || document.body;
+var start = Date.now(), last = Date.now();
+var observer = new MutationObserver(function () { last = Date.now(); });
+observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+(function check() {
+    var now = Date.now();
+    if (now - last >= quietMs || now - start >= maxMs) {
+        observer.disconnect();
+        done(now - start);
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+def wait_for_place_ready(driver, profile):
+    """
+    Wait for concrete DOM conditions instead of fixed sleeps:
+    the place title (h1.DUwDvf), the info rows (rogA2c) and a mutation-free quiet window.
+    All waits share the profile's per-page deadline. Returns the recorded timings.
+    """
+    start = time.time()
+    deadline = start + profile['page_deadline']
+    timings = {'title': None, 'info_rows': None, 'quiet': None, 'total': None, 'timed_out': []}
+
+    conditions = [
+        ('title', (By.CSS_SELECTOR, "h1.DUwDvf")),
+        ('info_rows', (By.CSS_SELECTOR, "div.rogA2c")),
+    ]
+    for name, locator in conditions:
+        step_start = time.time()
+        remaining = deadline - step_start
+        if remaining <= 0:
+            timings['timed_out'].append(name)
+            continue
+        try:
+            WebDriverWait(driver, remaining, poll_frequency=0.1).until(
+                EC.presence_of_element_located(locator)
+            )
+        except TimeoutException:
+            # Sparse listings may have no info rows; carry on with what rendered
+            timings['timed_out'].append(name)
+        timings[name] = round(time.time() - step_start, 3)
+
+    remaining = deadline - time.time()
+    if remaining > 0:
+        step_start = time.time()
+        try:
+            driver.set_script_timeout(remaining + 1)
+            driver.execute_async_script(WAIT_FOR_DOM_QUIET_JS,
+                                        int(profile['quiet_window'] * 1000), int(remaining * 1000))
+        except (TimeoutException, WebDriverException):
+            timings['timed_out'].append('quiet')
+        timings['quiet'] = round(time.time() - step_start, 3)
+    else:
+        timings['timed_out'].append('quiet')
+
+    timings['total'] = round(time.time() - start, 3)
+    with readiness_lock:
+        readiness_totals['pages'] += 1
+        if timings['timed_out']:
+            readiness_totals['timed_out_pages'] += 1
+        for step in READINESS_STEPS:
+            if timings[step] is not None:
+                totals = readiness_totals['steps'][step]
+                totals['count'] += 1
+                totals['sum'] += timings[step]
+                totals['max'] = max(totals['max'], timings[step])
+    return timings
+
+def summarize_readiness_timings():
+    """Print average and worst readiness wait per step for the 'event' profile"""
+    with readiness_lock:
+        pages = readiness_totals['pages']
+        timed_out = readiness_totals['timed_out_pages']
+        steps = {step: dict(totals) for step, totals in readiness_totals['steps'].items()}
+    if not pages:
+        return
 
-    return False
+    print(f"Readiness waits ({pages} pages, profile '{TIMING_PROFILE}'):")
+    for step in READINESS_STEPS:
+        totals = steps[step]
+        if totals['count']:
+            print(f"  {step}: avg {totals['sum'] / totals['count']:.2f}s, max {totals['max']:.2f}s")
+    print(f"  pages with a timed-out condition: {timed_out}")
 
 def scroll_page(driver):
     """
@@ -181,37 +545,23 @@ def scroll_page(driver):
     # Scroll in increments
     for i in range(0, total_height, 500):
         driver.execute_script(f"window.scrollTo(0, {i});")
-        time.sleep(0.5)
+        profile_sleep(0.5)
     
     # Scroll back to top
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
+    profile_sleep(1)
 
 
-def extract_phone_number(driver, wait):
+def extract_phone_number(driver, wait, xpaths=PHONE_XPATHS):
     """Extract phone number using exact Google Maps HTML structure"""
     try:
         # Scroll and wait for page to be fully loaded
         scroll_page(driver)
         wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Exact XPath selectors based on confirmed HTML structure
-        phone_xpaths = [
-            # Most specific - targets the exact phone div structure
-            "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium') and contains(@class, 'kR99db')]",
-
-            # Parent-child relationship targeting phone container
-            "//div[contains(@class, 'rogA2c')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium')]",
-
-            # Class combination for phone text element
-            "//div[contains(@class, 'Io6YTe') and contains(@class, 'kR99db')]",
-
-            # Fallback for tel: links
-            "//a[contains(@href, 'tel:')]"
-        ]
+        profile_sleep(1)
 
-        for xpath in phone_xpaths:
+        for xpath in selector_stats.ordered('phone', xpaths):
+            started, hit = time.time(), False
             try:
                 phone_elements = driver.find_elements(By.XPATH, xpath)
 
@@ -219,43 +569,22 @@ def extract_phone_number(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
+                        profile_sleep(0.3)
 
                         # Extract text or href for tel: links
-                        if "tel:" in xpath:
-                            phone_text = element.get_attribute("href")
-                            if phone_text and phone_text.startswith("tel:"):
-                                phone_text = phone_text.replace("tel:", "").strip()
-                        else:
-                            phone_text = element.text.strip()
-
-                        if phone_text:
-                            # Phone number regex patterns for Indian numbers
-                            phone_patterns = [
-                                r'\+91[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # +91 format with spaces
-                                r'0\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # 0 prefix format (like 044 2522 2944)
-                                r'\d{3}[-.\s]?\d{4}[-.\s]?\d{4}',  # 3-4-4 format
-                                r'\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # General landline format
-                                r'[6-9]\d{9}',  # 10-digit mobile format
-                                r'\+91[-.\s]?[6-9]\d{9}'  # +91 mobile format
-                            ]
-
-                            for pattern in phone_patterns:
-                                phone_matches = re.findall(pattern, phone_text)
-                                if phone_matches:
-                                    phone_number = phone_matches[0]
-                                    # Clean the phone number (keep digits and + only)
-                                    cleaned_number = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-
-                                    # Validate length (Indian numbers: 10-13 digits)
-                                    digit_count = len(re.findall(r'\d', cleaned_number))
-                                    if 10 <= digit_count <= 13:
-                                        return cleaned_number
+                        href = element.get_attribute("href") if "tel:" in xpath else None
+                        text = None if "tel:" in xpath else element.text.strip()
+                        phone_number = parse_phone_text(phone_candidate_text(xpath, text, href))
+                        if phone_number:
+                            hit = True
+                            return phone_number
                     except Exception:
                         continue
 
             except (NoSuchElementException, TimeoutException):
                 continue
+            finally:
+                selector_stats.record('phone', xpath, hit, time.time() - started)
 
         return "Phone Number Not Found"
 
@@ -264,30 +593,19 @@ def extract_phone_number(driver, wait):
         return "Phone Number Not Found"
 
 
-def extract_store_type(driver, wait):
+def extract_store_type(driver, wait, selectors=CATEGORY_SELECTORS):
     """Extract business category/store type from Google Maps page"""
     try:
         # Enhanced scrolling and waiting for elements to load
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
+        profile_sleep(2)
 
         # Wait for page to be fully loaded
         wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try multiple selectors for store type/category (prioritized by reliability)
-        category_selectors = [
-            "//button[contains(@class, 'DkEaL')]",  # Most reliable - confirmed working
-            "//button[contains(@class, 'DkEaL') and contains(@jsaction, 'pane.wfvdle18.category')]",
-            "//button[contains(@jsaction, 'pane.wfvdle18.category')]",
-            "//div[contains(@class, 'fontBodyMedium')]//button[contains(@class, 'DkEaL')]",
-            "//div[contains(@class, 'LBgpqf')]//button[contains(@class, 'DkEaL')]",
-            "//span[contains(@class, 'YhemCb')]",
-            "//div[contains(@class, 'LBgpqf')]//button",
-            "//button[contains(@aria-label, 'Category')]",
-        ]
+        profile_sleep(1)
 
-        for selector in category_selectors:
+        for selector in selector_stats.ordered('store_type', selectors):
+            started, hit = time.time(), False
             try:
                 # Find elements directly (find_elements never throws exception)
                 category_elements = driver.find_elements(By.XPATH, selector)
@@ -296,21 +614,19 @@ def extract_store_type(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
+                        profile_sleep(0.5)
 
                         category_text = element.text.strip()
-
-                        if category_text and len(category_text) > 0:
-                            # Filter out common non-category buttons
-                            # IMPORTANT: "book" should NOT be in excluded_terms as "Book store" is a valid category
-                            excluded_terms = ['directions', 'save', 'share', 'nearby', 'call', 'website', 'menu', 'order']
-                            if not any(term in category_text.lower() for term in excluded_terms):
-                                return category_text
+                        if is_store_type_text(category_text):
+                            hit = True
+                            return category_text
                     except Exception:
                         continue
 
             except (NoSuchElementException, TimeoutException):
                 continue
+            finally:
+                selector_stats.record('store_type', selector, hit, time.time() - started)
 
     except Exception as e:
         print(f"Error extracting store type: {str(e)}")
@@ -318,7 +634,8 @@ def extract_store_type(driver, wait):
     return "Not Found"
 
 
-def extract_operating_status_and_hours(driver, wait):
+def extract_operating_status_and_hours(driver, wait, status_selectors=STATUS_SELECTORS,
+                                       hours_xpaths=HOURS_CELL_XPATHS):
     """Extract operating status and hours from Google Maps page"""
     try:
         status = "Not Found"
@@ -326,23 +643,14 @@ def extract_operating_status_and_hours(driver, wait):
 
         # Enhanced scrolling and waiting
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
+        profile_sleep(2)
 
         # Wait for page to be fully loaded
         wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try to find operating status with prioritized selectors (confirmed working)
-        status_selectors = [
-            "//span[contains(@class, 'ZDu9vd')]",  # Most reliable - confirmed working
-            "//div[contains(@class, 'MkV9')]//span[contains(@class, 'ZDu9vd')]",
-            "//span[contains(text(), 'Open') or contains(text(), 'Closed') or contains(text(), 'Closes')]",
-            "//div[contains(@class, 'o0Svhf')]//span",
-            "//span[contains(@class, 'ZDu9vd')]//span",
-            "//div[contains(@aria-expanded, 'true')]//span[contains(@class, 'ZDu9vd')]"
-        ]
+        profile_sleep(1)
 
-        for selector in status_selectors:
+        for selector in selector_stats.ordered('status', status_selectors):
+            started, hit = time.time(), False
             try:
                 # Use WebDriverWait for better reliability
                 status_elements = wait.until(lambda d: d.find_elements(By.XPATH, selector))
@@ -351,125 +659,34 @@ def extract_operating_status_and_hours(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
-
-                        status_text = element.text.strip()
-
-                        if status_text and any(keyword in status_text.lower() for keyword in ['open', 'closed', 'closes', 'opens']):
-                            # Enhanced parsing logic with correct business logic
-                            status_text_lower = status_text.lower()
-
-                            # CRITICAL: If operating hours exist, business is operational (status = "Open")
-                            # Only set status to "Closed" if NO operating hours are found
-
-                            # Handle "Closed ⋅ Opens 8 am" format - business is OPEN (has operating hours)
-                            if "closed" in status_text_lower and "opens" in status_text_lower:
-                                status = "Open"  # Business is operational (has hours)
-                                # Extract opening time
-                                opens_patterns = [
-                                    r'opens\s+(.+?)(?:\s+\w{3})?$',  # "Opens 8 am Tue" -> "8 am"
-                                    r'opens\s+(.+)',  # General opens pattern
-                                ]
-                                for pattern in opens_patterns:
-                                    opens_match = re.search(pattern, status_text, re.IGNORECASE)
-                                    if opens_match:
-                                        time_part = opens_match.group(1).strip()
-                                        # Remove day abbreviations (Mon, Tue, etc.)
-                                        time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
-                                        operating_hours = f"Opens {time_part}"
-                                        break
-                                # Return immediately after successful parsing
-                                return status, operating_hours
-
-                            # Handle "Open ⋅ Closes 9 pm" format - business is OPEN
-                            elif "open" in status_text_lower and "closes" in status_text_lower:
-                                if "open now" in status_text_lower:
-                                    status = "Open now"
-                                else:
-                                    status = "Open"
-                                # Extract closing time
-                                closes_patterns = [
-                                    r'closes\s+(.+?)(?:\s+\w{3})?$',  # "Closes 9 pm" -> "9 pm"
-                                    r'closes\s+(.+)',  # General closes pattern
-                                ]
-                                for pattern in closes_patterns:
-                                    closes_match = re.search(pattern, status_text, re.IGNORECASE)
-                                    if closes_match:
-                                        time_part = closes_match.group(1).strip()
-                                        # Remove day abbreviations
-                                        time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
-                                        operating_hours = f"Closes {time_part}"
-                                        break
-                                # Return immediately after successful parsing
-                                return status, operating_hours
-
-                            # Handle simple "Open now" or "Open" status
-                            elif "open now" in status_text_lower:
-                                status = "Open now"
-                                # Return immediately
-                                return status, operating_hours
-                            elif "open" in status_text_lower:
-                                status = "Open"
-                                # Return immediately
-                                return status, operating_hours
-
-                            # Only set to "Closed" if no operating hours are found
-                            elif "closed" in status_text_lower and "opens" not in status_text_lower:
-                                status = "Closed"
-                                # Return immediately
-                                return status, operating_hours
+                        profile_sleep(0.5)
+
+                        # Return immediately after successful parsing
+                        parsed = parse_status_text(element.text.strip())
+                        if parsed:
+                            hit = True
+                            return parsed
                     except Exception:
                         continue
 
-                if status != "Not Found":
-                    break
-
             except (NoSuchElementException, TimeoutException):
                 continue
+            finally:
+                selector_stats.record('status', selector, hit, time.time() - started)
 
-        # Try to extract detailed operating hours from the hours table
-        if operating_hours == "Not Found":
+        # Try to extract today's hours from the hours table
+        for cell_selector in selector_stats.ordered('hours', hours_xpaths):
+            started, hit = time.time(), False
             try:
-                # Look for the hours table with multiple selectors
-                hours_selectors = [
-                    "//table[contains(@class, 'eK4R0e')]",
-                    "//div[contains(@class, 't39EBf')]//table",
-                    "//table//tr[contains(@class, 'y0skZc')]"
-                ]
-
-                for table_selector in hours_selectors:
-                    try:
-                        if "//table" in table_selector:
-                            hours_table = driver.find_element(By.XPATH, table_selector)
-                            if hours_table:
-                                # Get today's hours (first row that's not a header)
-                                today_row = hours_table.find_element(By.XPATH, ".//tr[contains(@class, 'y0skZc')][1]")
-                                if today_row:
-                                    hours_cell = today_row.find_element(By.XPATH, ".//td[contains(@class, 'mxowUb')]")
-                                    if hours_cell:
-                                        hours_text = hours_cell.text.strip()
-                                        if hours_text and ("–" in hours_text or "-" in hours_text):
-                                            operating_hours = hours_text
-                                            break
-                        else:
-                            # Direct row selector
-                            today_rows = driver.find_elements(By.XPATH, table_selector)
-                            if today_rows:
-                                for row in today_rows[:1]:  # Take first row
-                                    hours_cell = row.find_element(By.XPATH, ".//td[contains(@class, 'mxowUb')]")
-                                    if hours_cell:
-                                        hours_text = hours_cell.text.strip()
-                                        if hours_text and ("–" in hours_text or "-" in hours_text):
-                                            operating_hours = hours_text
-                                            break
-                    except (NoSuchElementException, TimeoutException):
-                        continue
-
-                    if operating_hours != "Not Found":
-                        break
-
+                for hours_cell in driver.find_elements(By.XPATH, cell_selector)[:1]:
+                    hours_text = parse_hours_text(hours_cell.text.strip())
+                    if hours_text:
+                        hit = True
+                        return status, hours_text
             except (NoSuchElementException, TimeoutException):
-                pass
+                continue
+            finally:
+                selector_stats.record('hours', cell_selector, hit, time.time() - started)
 
     except Exception as e:
         print(f"Error extracting operating status and hours: {str(e)}")
@@ -477,28 +694,19 @@ def extract_operating_status_and_hours(driver, wait):
     return status, operating_hours
 
 
-def extract_rating(driver, wait):
+def extract_rating(driver, wait, selectors=RATING_SELECTORS):
     """Extract rating and review count from Google Maps page"""
     try:
         # Enhanced scrolling and waiting for rating elements
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
+        profile_sleep(2)
 
         # Wait for page to be fully loaded
         wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try multiple selectors for rating (prioritized by reliability)
-        rating_selectors = [
-            "//div[contains(@class, 'F7nice')]//span[@aria-hidden='true']",  # Most reliable - confirmed working
-            "//span[contains(@class, 'ceNzKf')]/preceding-sibling::span[@aria-hidden='true']",
-            "//div[contains(@jslog, '76333')]//span[@aria-hidden='true']",
-            "//div[contains(@class, 'F7nice')]//span[1]",
-            "//span[@aria-hidden='true' and string-length(text()) <= 3]",
-            "//div[contains(@class, 'jANrlb')]//div[contains(@class, 'F7nice')]//span"
-        ]
+        profile_sleep(1)
 
-        for selector in rating_selectors:
+        for selector in selector_stats.ordered('rating', selectors):
+            started, hit = time.time(), False
             try:
                 # Use WebDriverWait for better reliability
                 rating_elements = wait.until(lambda d: d.find_elements(By.XPATH, selector))
@@ -507,29 +715,19 @@ def extract_rating(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
-
-                        rating_text = element.text.strip()
-
-                        if rating_text:
-                            # Validate that it's a numeric rating
-                            if rating_text.replace('.', '').replace(',', '').isdigit():
-                                try:
-                                    rating_value = float(rating_text.replace(',', '.'))
-                                    if 0 <= rating_value <= 5:  # Valid rating range
-                                        return rating_text
-                                except ValueError:
-                                    continue
-
-                            # Also check for patterns like "4.5" or "5.0"
-                            rating_match = re.search(r'^([0-5](?:\.[0-9])?)$', rating_text)
-                            if rating_match:
-                                return rating_match.group(1)
+                        profile_sleep(0.5)
+
+                        rating = parse_rating_text(element.text.strip())
+                        if rating:
+                            hit = True
+                            return rating
                     except Exception:
                         continue
 
             except (NoSuchElementException, TimeoutException):
                 continue
+            finally:
+                selector_stats.record('rating', selector, hit, time.time() - started)
 
     except Exception as e:
         print(f"Error extracting rating: {str(e)}")
@@ -537,27 +735,19 @@ def extract_rating(driver, wait):
     return "Not Found"
 
 
-def extract_review_count(driver, wait):
+def extract_review_count(driver, wait, selectors=REVIEW_SELECTORS):
     """Extract review count from Google Maps page"""
     try:
         # Enhanced scrolling and waiting for review elements
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
+        profile_sleep(1)
 
         # Wait for page to be fully loaded
         wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try multiple selectors for review count (prioritized by reliability)
-        review_selectors = [
-            "//span[contains(@aria-label, 'review')]",  # Most reliable - targets aria-label with "review"
-            "//div[contains(@class, 'F7nice')]//span[contains(@aria-label, 'review')]",  # Within rating section
-            "//span[contains(@aria-label, 'reviews')]",  # Plural form
-            "//span[contains(@aria-label, 'review') and contains(text(), '(')]",  # With parentheses
-            "//div[contains(@jslog, '76333')]//span[contains(@aria-label, 'review')]"  # Within rating container
-        ]
+        profile_sleep(1)
 
-        for selector in review_selectors:
+        for selector in selector_stats.ordered('review_count', selectors):
+            started, hit = time.time(), False
             try:
                 # Find elements directly (find_elements never throws exception)
                 review_elements = driver.find_elements(By.XPATH, selector)
@@ -566,35 +756,20 @@ def extract_review_count(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
-
-                        # Extract aria-label attribute
-                        aria_label = element.get_attribute("aria-label")
-
-                        if aria_label:
-                            # Extract number from aria-label like "40 reviews" or "1 review"
-                            review_match = re.search(r'(\d+)\s+reviews?', aria_label)
-                            if review_match:
-                                review_count = review_match.group(1)
-                                # Validate that it's a numeric value
-                                if review_count.isdigit():
-                                    return review_count
-
-                        # Also try extracting from visible text in parentheses
-                        review_text = element.text.strip()
-                        if review_text:
-                            # Extract number from text like "(40)" or "(150)"
-                            text_match = re.search(r'\((\d+)\)', review_text)
-                            if text_match:
-                                review_count = text_match.group(1)
-                                if review_count.isdigit():
-                                    return review_count
+                        profile_sleep(0.3)
 
+                        # aria-label like "40 reviews", or visible text like "(40)"
+                        review_count = parse_review_count(element.get_attribute("aria-label"), element.text.strip())
+                        if review_count:
+                            hit = True
+                            return review_count
                     except Exception:
                         continue
 
             except (NoSuchElementException, TimeoutException):
                 continue
+            finally:
+                selector_stats.record('review_count', selector, hit, time.time() - started)
 
         return "Not Found"
 
@@ -603,23 +778,20 @@ def extract_review_count(driver, wait):
         return "Not Found"
 
 
-def extract_permanently_closed_status(driver, wait):
+def extract_permanently_closed_status(driver, wait, selectors=CLOSED_SELECTORS):
     """Check if business is permanently closed"""
     try:
-        # Look for permanently closed indicator
-        closed_selectors = [
-            "//span[contains(@class, 'aSftqf') and contains(text(), 'Permanently closed')]",
-            "//div[contains(@class, 'MkV9')]//span[contains(text(), 'Permanently closed')]",
-            "//span[contains(text(), 'Permanently closed')]"
-        ]
-
-        for selector in closed_selectors:
+        for selector in selector_stats.ordered('permanently_closed', selectors):
+            started, hit = time.time(), False
             try:
                 closed_element = driver.find_element(By.XPATH, selector)
-                if closed_element and "Permanently closed" in closed_element.text:
+                if closed_element and is_permanently_closed_text(closed_element.text):
+                    hit = True
                     return "Yes"
             except (NoSuchElementException, TimeoutException):
                 continue
+            finally:
+                selector_stats.record('permanently_closed', selector, hit, time.time() - started)
 
     except Exception as e:
         print(f"Error checking permanently closed status: {str(e)}")
@@ -627,67 +799,256 @@ def extract_permanently_closed_status(driver, wait):
     return "No"
 
 
-def scrape_data(url, driver, wait):
+# Evaluates every selector list of place_fields.FIELD_SELECTORS in the browser and
+# returns the raw candidates ({text, href, aria}) per selector in one round-trip
+SNAPSHOT_JS = """
+var fieldSelectors = arguments[0], limit = arguments[1], snapshot = {};
+Object.keys(fieldSelectors).forEach(function (field) {
+    snapshot[field] = fieldSelectors[field].map(function (xpath) {
+        var candidates = [];
+        try {
+            var result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < result.snapshotLength && i < limit; i++) {
+                var el = result.snapshotItem(i);
+                candidates.push({
+                    text: (el.innerText || el.textContent || '').trim(),
+                    href: el.getAttribute('href'),
+                    aria: el.getAttribute('aria-label')
+                });
+            }
+        } catch (e) {}
+        return candidates;
+    });
+});
+return snapshot;
+"""
+
+def take_place_snapshot(driver):
+    """Collect the raw candidates for every field with a single execute_script call"""
+    return driver.execute_script(SNAPSHOT_JS, FIELD_SELECTORS, SNAPSHOT_CANDIDATE_LIMIT) or {}
+
+
+# Reports, without waiting, which field selectors and section markers match right now
+PRESENCE_PROBE_JS = """
+var fieldSelectors = arguments[0], sectionMarkers = arguments[1], probe = {selectors: {}, markers: {}};
+Object.keys(fieldSelectors).forEach(function (field) {
+    probe.selectors[field] = fieldSelectors[field].map(function (xpath) {
+        try {
+            return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+                .singleNodeValue !== null;
+        } catch (e) {
+            return true;  // Let the extractor deal with a selector the browser rejects
+        }
+    });
+});
+Object.keys(sectionMarkers).forEach(function (field) {
+    probe.markers[field] = sectionMarkers[field].some(function (css) {
+        return document.querySelector(css) !== null;
+    });
+});
+return probe;
+"""
+
+def probe_place_sections(driver):
+    """One round-trip probe of which panel sections exist (see place_fields.probed_selectors)"""
     try:
-        # Navigate to the URL
-        driver.get(url)
-        time.sleep(8)  # Increased wait time for page to load completely
+        probe = driver.execute_script(PRESENCE_PROBE_JS, FIELD_SELECTORS, SECTION_MARKERS)
+    except WebDriverException as e:
+        print(f"Presence probe failed, trying every selector: {e}")
+        return None
+    with readiness_lock:
+        probe_counts['pages'] += 1
+        for field in absent_fields(probe):
+            probe_counts['absent'][field] = probe_counts['absent'].get(field, 0) + 1
+    return probe
+
+def probe_field_selectors(probe, field):
+    """
+    probed_selectors() for a field. When the section is present, the selectors
+    the probe found no match for are recorded as (untimed) misses, so a selector
+    that stops matching shows up in its hit rate even though it is not tried.
+    """
+    selectors = probed_selectors(probe, field)
+    if probe and selectors:
+        for selector in FIELD_SELECTORS[field]:
+            if selector not in selectors:
+                selector_stats.record(field, selector, False)
+    return selectors
+
+def summarize_probe_counts():
+    """Print how often each section was absent and its extractor skipped"""
+    with readiness_lock:
+        pages = probe_counts['pages']
+        absent = dict(probe_counts['absent'])
+    if not pages:
+        return
+    skipped = ', '.join(f"{field} {count}" for field, count in sorted(absent.items())) or "none"
+    print(f"Presence probe ({pages} pages), sections absent and skipped: {skipped}")
 
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(2)
+def summarize_selector_stats():
+    """Persist the selector stats and print each field's current best selector and any alerts"""
+    try:
+        selector_stats.save()
+    except OSError as e:
+        print(f"Warning: Could not save selector stats: {e}")
+    summary = selector_stats.summary()
+    if not summary:
+        return
+    print(f"Best selectors ({SELECTOR_STATS_FILE}):")
+    for field, (selector, hit_rate, tries) in sorted(summary.items()):
+        print(f"  {field:<18} {hit_rate:>4.0%} of {tries} tries  {selector}")
+    for alert in selector_stats.alerts:
+        print(alert)
 
-        # Scroll the page to ensure all elements are loaded
-        scroll_page(driver)
-        time.sleep(3)  # Additional wait after scrolling
 
-        # Additional scroll to ensure dynamic content is loaded
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
+CAPTURE_PANEL_JS = """
+var panel = document.querySelector("div[role='main']");
+return panel ? panel.outerHTML : document.documentElement.outerHTML;
+"""
+
+def capture_place_html(driver):
+    """Grab the place panel HTML in one call (whole document if the panel is missing)"""
+    return driver.execute_script(CAPTURE_PANEL_JS) or driver.page_source
+
+def reparse_stored_pages(output_filename, html_dir=OFFLINE_HTML_DIR):
+    """
+    Re-parse every stored place panel (e.g. after fixing a selector) without a browser
+    and write a fresh output CSV
+    """
+    if not os.path.isdir(html_dir):
+        print(f"❌ No stored pages: '{html_dir}' does not exist (pages are stored in EXTRACTION_MODE 'offline')")
+        return
+    paths = [os.path.join(html_dir, name) for name in sorted(os.listdir(html_dir)) if name.endswith('.html')]
+    print(f"Re-parsing {len(paths)} stored pages from {html_dir} with {PARSE_PROCESSES} processes")
+
+    with open(output_filename, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=OUTPUT_FIELDNAMES)
+        writer.writeheader()
+        with ProcessPoolExecutor(max_workers=PARSE_PROCESSES) as parse_executor:
+            for url, fields in parse_executor.map(parse_stored_page, paths, chunksize=16):
+                result = {'URL': url}
+                result.update(fields)
+                result['Latitude'], result['Longitude'] = extract_coordinates_from_url(url or '')
+                writer.writerow(result)
+
+    print(f"✅ Wrote {len(paths)} re-parsed records to {output_filename}")
+
+
+def scrape_data(url, driver, wait, parse_executor=None):
+    try:
+        profile = TIMING_PROFILES[TIMING_PROFILE]
+
+        # Navigate to the URL
+        driver.get(url)
+
+        if profile['page_deadline']:
+            # Event-driven readiness: wait on the DOM instead of fixed sleeps
+            wait_for_place_ready(driver, profile)
+            # The panel has rendered, so missing elements should fail fast
+            wait = WebDriverWait(driver, profile['element_timeout'])
+        else:
+            time.sleep(8)  # Increased wait time for page to load completely
+
+            # Wait for page to be fully loaded
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+            time.sleep(2)
+
+            # Scroll the page to ensure all elements are loaded
+            scroll_page(driver)
+            time.sleep(3)  # Additional wait after scrolling
+
+            # Additional scroll to ensure dynamic content is loaded
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(2)
+            driver.execute_script("window.scrollTo(0, 0);")
+            time.sleep(2)
+
+        if EXTRACTION_MODE == 'snapshot':
+            # One round-trip for all fields, validated in Python
+            result = {'URL': url}
+            result.update(build_place_result(take_place_snapshot(driver)))
+            result['Latitude'], result['Longitude'] = extract_coordinates_from_url(url)
+            return result
+
+        if EXTRACTION_MODE == 'offline':
+            # Capture the panel once; parsing is CPU work for the process pool
+            page_html = capture_place_html(driver)
+            save_place_html(url, page_html, OFFLINE_HTML_DIR)
+            if parse_executor:
+                # Parsed after the driver is released (see process_single_url)
+                return {'URL': url, 'Page_HTML': page_html}
+            fields = parse_place_html(page_html)
+            result = {'URL': url}
+            result.update(fields)
+            result['Latitude'], result['Longitude'] = extract_coordinates_from_url(url)
+            return result
+
+        # One probe for which sections exist; absent ones cost no waits or lookups
+        probe = probe_place_sections(driver) if PRESENCE_PROBE else None
 
         # Initialize variables with default values
         address = website = phone = "Not Found"
 
-        try:
-            # Address extraction
-            address_element = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//div[contains(@class,'rogA2c')]/div[contains(@class,'Io6YTe')]")
-            ))
-            # Scroll to address element
-            driver.execute_script("arguments[0].scrollIntoView(true);", address_element)
-            address = address_element.text
-        except (TimeoutException, NoSuchElementException):
-            pass
+        address_xpaths = probed_selectors(probe, 'address')
+        if address_xpaths:
+            try:
+                # Address extraction
+                address_element = wait.until(EC.presence_of_element_located(
+                    (By.XPATH, address_xpaths[0])
+                ))
+                # Scroll to address element
+                driver.execute_script("arguments[0].scrollIntoView(true);", address_element)
+                address = address_element.text
+            except (TimeoutException, NoSuchElementException):
+                pass
 
-        try:
-            # Website extraction
-            website_element = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//a[contains(@aria-label, 'Website')]")
-            ))
-            website = website_element.get_attribute("href")
-        except (TimeoutException, NoSuchElementException):
+        website_xpaths = probed_selectors(probe, 'website')
+        if website_xpaths:
+            try:
+                # Website extraction
+                website_element = wait.until(EC.presence_of_element_located(
+                    (By.XPATH, website_xpaths[0])
+                ))
+                website = website_element.get_attribute("href")
+            except (TimeoutException, NoSuchElementException):
+                pass
 
-            pass
-        try:
-            name_element = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//h1[contains(@class, 'DUwDvf lfPIob')]")
-            ))
-            driver.execute_script("arguments[0].scrollIntoView(true);", name_element)
-            name = name_element.text.strip()
-        except (TimeoutException, NoSuchElementException):
-            name = "Name Not Found"
+        name = "Name Not Found"
+        name_xpaths = probed_selectors(probe, 'name')
+        if name_xpaths:
+            try:
+                name_element = wait.until(EC.presence_of_element_located(
+                    (By.XPATH, name_xpaths[0])
+                ))
+                driver.execute_script("arguments[0].scrollIntoView(true);", name_element)
+                name = name_element.text.strip()
+            except (TimeoutException, NoSuchElementException):
+                pass
 
         # Phone number extraction
-        phone = extract_phone_number(driver, wait)
+        phone_xpaths = probe_field_selectors(probe, 'phone')
+        phone = extract_phone_number(driver, wait, phone_xpaths) if phone_xpaths else "Phone Number Not Found"
 
         # Extract new business information
-        store_type = extract_store_type(driver, wait)
-        operating_status, operating_hours = extract_operating_status_and_hours(driver, wait)
-        rating = extract_rating(driver, wait)
-        review_count = extract_review_count(driver, wait)
-        permanently_closed = extract_permanently_closed_status(driver, wait)
+        category_selectors = probe_field_selectors(probe, 'store_type')
+        store_type = extract_store_type(driver, wait, category_selectors) if category_selectors else "Not Found"
+
+        status_selectors = probe_field_selectors(probe, 'status')
+        hours_xpaths = probe_field_selectors(probe, 'hours')
+        operating_status, operating_hours = "Not Found", "Not Found"
+        if status_selectors or hours_xpaths:
+            operating_status, operating_hours = extract_operating_status_and_hours(
+                driver, wait, status_selectors, hours_xpaths)
+
+        rating_selectors = probe_field_selectors(probe, 'rating')
+        rating = extract_rating(driver, wait, rating_selectors) if rating_selectors else "Not Found"
+
+        review_selectors = probe_field_selectors(probe, 'review_count')
+        review_count = extract_review_count(driver, wait, review_selectors) if review_selectors else "Not Found"
+
+        closed_selectors = probe_field_selectors(probe, 'permanently_closed')
+        permanently_closed = (extract_permanently_closed_status(driver, wait, closed_selectors)
+                              if closed_selectors else "No")
 
         # Coordinate extraction from URL
         latitude, longitude = extract_coordinates_from_url(url)
@@ -710,23 +1071,18 @@ def scrape_data(url, driver, wait):
 
     except WebDriverException as e:
         print(f"Error processing URL {url}: {str(e)}")
-        # Even if scraping fails, we can still extract coordinates from the URL
-        latitude, longitude = extract_coordinates_from_url(url)
-        return {
-            'URL': url,
-            'Name': 'Error',
-            'Address': 'Error',
-            'Website': 'Error',
-            'Phone': 'Error',
-            'Store_Type': 'Error',
-            'Operating_Status': 'Error',
-            'Operating_Hours': 'Error',
-            'Rating': 'Error',
-            'Review_Count': 'Error',
-            'Permanently_Closed': 'Error',
-            'Latitude': latitude,
-            'Longitude': longitude
-        }
+        # The caller classifies the failure and retries the URL
+        raise
+
+def build_error_result(url):
+    """Output row for a URL that failed every attempt (coordinates still come from the URL)"""
+    result = {field: 'Error' for field in OUTPUT_FIELDNAMES}
+    result['URL'] = url
+    result['Latitude'], result['Longitude'] = extract_coordinates_from_url(url)
+    return result
+
+def error_store_filename(output_filename):
+    return os.path.splitext(output_filename)[0] + '_errors.csv'
 
 def main():
     # Check if the input CSV file exists
@@ -737,16 +1093,15 @@ def main():
         print("The file should be created by the Google Maps scraper with the correct spelling: 'stationery' not 'stationary'")
         return
 
-    # Read URLs from CSV file
+    # Check the header only; URLs are streamed from the file while processing
     try:
-        df = pd.read_csv(input_filename)
-        if 'URL' not in df.columns:
+        with open(input_filename, 'r', newline='', encoding='utf-8') as file:
+            columns = csv.DictReader(file).fieldnames or []
+        if 'URL' not in columns:
             print(f"Error: 'URL' column not found in {input_filename}")
-            print(f"Available columns: {list(df.columns)}")
+            print(f"Available columns: {columns}")
             return
-
-        urls = df['URL'].tolist()
-        print(f"Successfully loaded {len(urls)} URLs from {input_filename}")
+        print(f"Streaming URLs from {input_filename}")
     except Exception as e:
         print(f"Error reading CSV file: {str(e)}")
         return
@@ -757,33 +1112,99 @@ def main():
     # Check if output file already exists to determine if we need to write header
     file_exists = os.path.exists(output_filename)
 
-    # Count existing processed URLs for resume capability
-    processed_count = 0
-    if file_exists:
-        try:
-            with open(output_filename, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                processed_count = sum(1 for row in reader)
-            print(f"Found existing output file with {processed_count} processed URLs")
-            print("Will skip already processed URLs and continue from where left off")
-        except Exception as e:
-            print(f"Warning: Error reading existing output file: {e}")
+    # Load the processed-place index once for resume capability
+    if STORAGE_BACKEND == 'sqlite':
+        processed_count = load_processed_index(output_filename)
+        print(f"Using SQLite store {STORAGE_DB_FILENAME} with {processed_count} processed places")
+    elif file_exists:
+        processed_count = load_processed_index(output_filename)
+        print(f"Found existing output file with {processed_count} processed places")
+        print("Will skip already processed URLs and continue from where left off")
 
     # Continue with multithreaded processing
-    process_urls_multithreaded(urls, output_filename, file_exists)
+    process_urls_multithreaded(iter_input_urls(input_filename), output_filename, file_exists)
+
+def iter_input_urls(input_filename, geofence=GEOFENCE):
+    """
+    Yield URLs from the input CSV one row at a time, so the input is never fully loaded
+    Rows whose URL coordinates fall outside the geofence are never yielded
+    """
+    quarantine_filename = os.path.splitext(input_filename)[0] + '_out_of_area.csv'
+    quarantine_file = None
+    quarantine_writer = None
+    out_of_area = 0
+    unknown = 0
+
+    # The quarantine file is rewritten on every run, since the whole input is
+    # re-scanned: a run that finds no out-of-area rows must not leave the last one's
+    if geofence and GEOFENCE_ACTION == 'quarantine' and os.path.exists(quarantine_filename):
+        os.remove(quarantine_filename)
+
+    try:
+        with open(input_filename, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                url = (row.get('URL') or '').strip()
+                if not url:
+                    continue
+
+                if geofence:
+                    inside, latitude, longitude, distance_km = check_place_url(url, geofence)
+                    if inside is None:
+                        unknown += 1
+                        if not GEOFENCE_KEEP_UNKNOWN:
+                            continue
+                    elif not inside:
+                        out_of_area += 1
+                        if GEOFENCE_ACTION == 'quarantine':
+                            if quarantine_writer is None:
+                                quarantine_file = open(quarantine_filename, 'w', newline='', encoding='utf-8')
+                                quarantine_writer = csv.DictWriter(
+                                    quarantine_file,
+                                    fieldnames=list(reader.fieldnames) + ['Latitude', 'Longitude', 'Distance_Km'],
+                                    extrasaction='ignore'
+                                )
+                                quarantine_writer.writeheader()
+                            quarantine_writer.writerow({
+                                **row,
+                                'Latitude': latitude,
+                                'Longitude': longitude,
+                                'Distance_Km': round(distance_km, 1) if distance_km is not None else '',
+                            })
+                        continue
+
+                yield url
+    finally:
+        if quarantine_file:
+            quarantine_file.close()
+        if out_of_area:
+            action = f"quarantined to {quarantine_filename}" if GEOFENCE_ACTION == 'quarantine' else "dropped"
+            print(f"🌍 Geofence: {out_of_area} out-of-area rows {action}")
+        if unknown:
+            print(f"🌍 Geofence: {unknown} rows without URL coordinates {'kept' if GEOFENCE_KEEP_UNKNOWN else 'dropped'}")
 
 def process_urls_multithreaded(urls, output_filename, file_exists):
     """
     Process URLs using multithreading for improved performance
+
+    `urls` may be any iterable (e.g. iter_input_urls). It is consumed lazily and
+    only MAX_IN_FLIGHT URLs are queued or running at a time, so memory stays flat
+    regardless of input size and Ctrl-C stops the run after draining in-flight work.
+    Failed URLs wait in a retry queue and re-enter the window once their backoff
+    has elapsed (see MAX_ATTEMPTS). A row only counts as processed once the
+    result writer confirms it; rows it fails to write are retried.
     """
     # Multithreading configuration
     MAX_THREADS = 2  # Conservative number to avoid overwhelming Google Maps
+    MAX_IN_FLIGHT = MAX_THREADS * 2  # Bounded work queue: running + waiting tasks
 
     # Counters for real-time progress tracking
-    total_urls = len(urls)
+    total_urls = len(urls) if hasattr(urls, '__len__') else '?'
     processed_new = 0
     skipped_existing = 0
     errors = 0
+    retries = 0
+    write_failures = 0
 
     print(f"\n{'='*80}")
     print(f"STARTING MULTITHREADED REAL-TIME INCREMENTAL DATA EXTRACTION")
@@ -791,14 +1212,19 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
     print(f"Total URLs to process: {total_urls}")
     print(f"Output file: {output_filename}")
     print(f"Threads: {MAX_THREADS}")
+    print(f"Page rate: {PAGES_PER_MINUTE}/min adaptive ({MIN_PAGES_PER_MINUTE}-{MAX_PAGES_PER_MINUTE}/min)")
+    print(f"Timing profile: {TIMING_PROFILE}")
+    print(f"Extraction mode: {EXTRACTION_MODE}")
+    print(f"Per-URL time budget: {url_time_budget() or 'none'}s")
+    print(f"Retries: up to {MAX_ATTEMPTS} attempts per URL, failures logged to {error_store_filename(output_filename)}")
     print(f"Mode: Real-time incremental CSV writing with coordinates")
     print("-" * 80)
 
     # Write header if file doesn't exist
-    if not file_exists:
+    if not file_exists and STORAGE_BACKEND == 'csv':
         try:
             with open(output_filename, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status', 'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
+                fieldnames = OUTPUT_FIELDNAMES
                 writer = csv.DictWriter(file, fieldnames=fieldnames)
                 writer.writeheader()
             print("✅ Created output file with headers")
@@ -806,32 +1232,136 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
             print(f"❌ Error creating output file: {e}")
             return
 
+    if EXTRACTION_MODE == 'offline' and not LXML_AVAILABLE:
+        print("❌ EXTRACTION_MODE 'offline' requires lxml. Install it with: pip install lxml")
+        return
+
+    # CPU-bound HTML parsing runs in worker processes in 'offline' mode
+    parse_executor = ProcessPoolExecutor(max_workers=PARSE_PROCESSES) if EXTRACTION_MODE == 'offline' else None
+
+    # One long-lived driver per worker, shared through the pool
+    driver_pool = DriverPool(create_chrome_driver, safe_driver_quit, MAX_THREADS,
+                             recycle_after_pages=DRIVER_RECYCLE_AFTER_PAGES,
+                             recycle_on_error=DRIVER_RECYCLE_ON_ERROR)
+
+    rate_limiter = RateLimiter(PAGES_PER_MINUTE, min_rate=MIN_PAGES_PER_MINUTE, max_rate=MAX_PAGES_PER_MINUTE,
+                               state_file=RATE_LIMIT_STATE_FILE, workload='extraction')
+    selector_stats.adaptive = ADAPTIVE_SELECTOR_ORDER
+    selector_stats.load(SELECTOR_STATS_FILE)
+    watchdog = Watchdog(url_time_budget(), kill_driver_process_tree, grace_seconds=WATCHDOG_GRACE_SECONDS)
+    executor = ThreadPoolExecutor(max_workers=MAX_THREADS)
+    start_result_writer(output_filename)
+    in_flight = {}
+    pending_writes = {}  # Write future -> (url, index, attempt) for rows queued to the result writer
+    retry_queue = RetryQueue()
+    error_store = ErrorStore(error_store_filename(output_filename))
+    submitted = PlaceIndex()  # Places handed to the executor in this run
+    duplicates = 0
+    url_stream = enumerate(urls, 1)
+    input_exhausted = False
+
     try:
-        # Process URLs using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            # Submit all URL processing tasks
-            future_to_url = {}
-            for index, url in enumerate(urls, 1):
+        while True:
+            # Retries whose backoff has elapsed go first
+            while len(in_flight) < MAX_IN_FLIGHT:
+                ready = retry_queue.pop_ready()
+                if ready is None:
+                    break
+                url, index, attempt = ready
                 future = executor.submit(process_single_url, url, output_filename,
-                                       index % MAX_THREADS, total_urls, index)
-                future_to_url[future] = (url, index)
+                                       index % MAX_THREADS, total_urls, index, driver_pool,
+                                       parse_executor, rate_limiter, attempt, watchdog)
+                in_flight[future] = (url, index, attempt, 'page')
 
-            # Process completed tasks
-            for future in as_completed(future_to_url):
-                url, index = future_to_url[future]
+            # Producer: top up the bounded window from the lazy URL stream
+            while not input_exhausted and len(in_flight) < MAX_IN_FLIGHT:
                 try:
-                    result = future.result()
+                    index, url = next(url_stream)
+                except StopIteration:
+                    input_exhausted = True
+                    break
+
+                # Already-processed places never reach the executor
+                if check_url_already_processed(url, output_filename):
+                    skipped_existing += 1
+                    continue
+                # Same place listed again in the input (another slug/authuser/rclk variant)
+                if not submitted.add(url):
+                    duplicates += 1
+                    continue
+
+                future = executor.submit(process_single_url, url, output_filename,
+                                       index % MAX_THREADS, total_urls, index, driver_pool,
+                                       parse_executor, rate_limiter, 1, watchdog)
+                in_flight[future] = (url, index, 1, 'page')
 
-                    if result['status'] == 'success':
+            if not in_flight and not pending_writes:
+                if not retry_queue:
+                    break
+                # Only backed-off retries left: sleep until the next one is due
+                time.sleep(retry_queue.next_ready_in())
+                continue
+
+            # Consumer: handle whichever tasks finished first (or wake up for a due retry)
+            done, _ = wait_for_futures(list(in_flight) + list(pending_writes),
+                                       timeout=retry_queue.next_ready_in(), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in pending_writes:
+                    url, index, attempt = pending_writes.pop(future)
+                    stage = 'write'
+                else:
+                    url, index, attempt, stage = in_flight.pop(future)
+                try:
+                    if stage == 'write':
+                        # The result writer's verdict on a queued row
+                        write_error = future.exception()
+                        if write_error is None:
+                            result = {'status': 'written', 'url': url}
+                        else:
+                            write_failures += 1
+                            result = {'status': 'retry', 'url': url, 'error_class': WRITE_ERROR,
+                                      'error': str(write_error)}
+                    else:
+                        result = future.result()
+                    if stage == 'parse':
+                        # Fields from the parser processes: finish and save the row here
+                        result = save_parsed_page(url, result, output_filename)
+
+                    if result['status'] == 'parsing':
+                        # The driver is free again; the parse stays in the window until saved
+                        in_flight[result['parse_future']] = (url, index, attempt, 'parse')
+                        continue
+                    if result['status'] == 'success' and isinstance(result.get('write'), Future):
+                        # Queued for the result writer: counted once it confirms the row
+                        pending_writes[result['write']] = (url, index, attempt)
+                        continue
+                    if result['status'] in ('success', 'written'):
                         processed_new += 1
                     elif result['status'] == 'skipped':
                         skipped_existing += 1
+                    elif result['status'] == 'retry':
+                        final = attempt >= MAX_ATTEMPTS
+                        error_store.record(url, attempt, result['error_class'], result['error'], final=final)
+                        if not final:
+                            retries += 1
+                            delay = backoff_delay(attempt + 1, RETRY_BACKOFF_SECONDS, RETRY_BACKOFF_MAX_SECONDS)
+                            retry_queue.schedule(delay, url, index, attempt + 1)
+                            print(f"🔁 Retrying in {delay:.0f}s ({result['error_class']}, attempt {attempt + 1}/{MAX_ATTEMPTS}): {url}")
+                            continue
+                        # Exhausted: an empty panel keeps what was found, anything else is an 'Error' row
+                        errors += 1
+                        final_result = result.get('result') if result['error_class'] == EMPTY_PANEL else None
+                        if final_result:
+                            append_result_to_csv(final_result, output_filename)
+                        elif claim_error_row(url):
+                            append_result_to_csv(build_error_result(url), output_filename)
+                        print(f"❌ Giving up after {attempt} attempts ({result['error_class']}): {url}")
                     else:
                         errors += 1
 
                     # Progress update
                     completed = processed_new + skipped_existing + errors
-                    print(f"📊 Progress: {completed}/{total_urls} | New: {processed_new} | Skipped: {skipped_existing} | Errors: {errors}")
+                    print(f"📊 Progress: {completed}/{total_urls} | New: {processed_new} | Skipped: {skipped_existing} | Errors: {errors} | Retry queue: {len(retry_queue)} | {rate_limiter.describe()}")
 
                 except Exception as e:
                     errors += 1
@@ -839,12 +1369,50 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
 
     except KeyboardInterrupt:
         print(f"\n⚠️  Script interrupted by user")
+        # Drop queued work, let the URLs already being scraped finish and save
+        for future in in_flight:
+            future.cancel()
+        running = [future for future in in_flight if not future.cancelled()]
+        if running:
+            print(f"Waiting for {len(running)} in-flight URLs to finish (Ctrl-C again to stop immediately)...")
+            try:
+                wait_for_futures(running)
+                # 'offline' pages already captured still need their parsed rows saved
+                for future, (url, index, attempt, stage) in in_flight.items():
+                    if future.cancelled() or future.exception() is not None:
+                        continue
+                    outcome = future.result()
+                    if stage == 'page' and outcome.get('status') == 'parsing':
+                        outcome = save_parsed_page(url, outcome['parse_future'].result(), output_filename)
+                    elif stage == 'parse':
+                        outcome = save_parsed_page(url, outcome, output_filename)
+                    if isinstance(outcome.get('write'), Future):
+                        pending_writes[outcome['write']] = (url, index, attempt)
+            except KeyboardInterrupt:
+                print("⚠️  Stopping without waiting for in-flight URLs")
         print(f"✅ Progress saved: {processed_new} URLs processed and saved to {output_filename}")
     except Exception as e:
         print(f"\n❌ An error occurred: {str(e)}")
         print(f"✅ Progress saved: {processed_new} URLs processed and saved to {output_filename}")
 
     finally:
+        # Stop accepting work, then quit the pooled drivers and stop the parser processes
+        executor.shutdown(wait=False, cancel_futures=True)
+        driver_pool.close()
+        watchdog.close()
+        if parse_executor:
+            parse_executor.shutdown()
+        pool_stats = driver_pool.stats()
+        watchdog_stats = watchdog.stats()
+        # Everything the workers finished is on disk after this
+        writer_stats = stop_result_writer()
+        # Rows still queued when the loop stopped count once the drain confirms them
+        for written in pending_writes:
+            if written.done() and written.exception() is None:
+                processed_new += 1
+            else:
+                write_failures += 1
+
         # Final summary
         print(f"\n{'='*80}")
         print(f"MULTITHREADED EXTRACTION COMPLETED!")
@@ -852,13 +1420,38 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
         print(f"Total URLs: {total_urls}")
         print(f"New URLs processed: {processed_new}")
         print(f"Already existing (skipped): {skipped_existing}")
-        print(f"Errors encountered: {errors}")
+        print(f"Duplicate input rows (same place): {duplicates}")
+        print(f"Errors encountered: {errors} (after {MAX_ATTEMPTS} attempts)")
+        print(f"Retries scheduled: {retries} | Failed attempts by class: {error_store.describe()}")
+        if retry_queue:
+            print(f"Retries still pending at exit: {len(retry_queue)} (re-processed on the next run)")
         print(f"Output file: {output_filename}")
         print(f"Threads used: {MAX_THREADS}")
+        print(f"Chrome drivers launched: {pool_stats['drivers_created']} (recycled: {pool_stats['drivers_recycled']})")
+        if watchdog_stats['expired']:
+            print(f"Watchdog: {watchdog_stats['expired']} URLs over the {watchdog.budget_seconds}s budget killed "
+                  f"({watchdog_stats['stuck']} needed a second kill)")
+        if writer_stats:
+            print(f"Result writer: {writer_stats['rows_written']} rows in {writer_stats['batches_written']} batches, "
+                  f"{writer_stats['fsyncs']} fsyncs (policy '{RESULT_WRITER_FSYNC}'), {writer_stats['failed_rows']} failed")
+        if write_failures:
+            print(f"Rows the result writer could not write: {write_failures} (retried, or re-processed on the next run)")
+        summarize_readiness_timings()
+        summarize_probe_counts()
+        summarize_selector_stats()
+        try:
+            dropped = drop_superseded_error_rows(output_filename)
+            if dropped:
+                print(f"🧹 Dropped {dropped} 'Error' rows of places that have since been extracted")
+        except Exception as e:
+            print(f"Warning: Could not drop superseded 'Error' rows: {e}")
 
         # Count final records in output file
         try:
-            if os.path.exists(output_filename):
+            if STORAGE_BACKEND == 'sqlite':
+                # Commits any results still pending in the current batch
+                print(f"Total places in {STORAGE_DB_FILENAME}: {get_place_store().count_places()}")
+            elif os.path.exists(output_filename):
                 with open(output_filename, 'r', newline='', encoding='utf-8') as file:
                     reader = csv.DictReader(file)
                     final_count = sum(1 for _ in reader)
@@ -964,25 +1557,87 @@ def create_chrome_driver(thread_id=0):
 
     return driver
 
-def process_single_url(url, output_filename, thread_id, total_urls, current_index):
+def save_parsed_page(url, fields, output_filename):
+    """Finish and save an 'offline' row once the parser processes return its fields"""
+    result = {'URL': url}
+    result.update(fields)
+    result['Latitude'], result['Longitude'] = extract_coordinates_from_url(url)
+    if is_empty_panel(result):
+        return {'status': 'retry', 'url': url, 'error_class': EMPTY_PANEL,
+                'error': 'No fields found in the place panel', 'result': result}
+    saved = append_result_to_csv(result, output_filename, write_header=False)
+    if saved:
+        print(f"✅ Parsed and saved: {result.get('Name', 'N/A')}")
+        return {'status': 'success', 'url': url, 'result': result, 'write': saved}
+    print(f"❌ Failed to save parsed result for {url}")
+    return {'status': 'csv_error', 'url': url}
+
+def process_single_url(url, output_filename, thread_id, total_urls, current_index, driver_pool=None,
+                       parse_executor=None, rate_limiter=None, attempt=1, watchdog=None):
     """
     Process a single URL in a thread-safe manner
+
+    When a driver_pool is given the URL is scraped with a pooled driver that is
+    returned afterwards; otherwise a driver is created and quit for this URL only.
+    A rate_limiter paces page loads and is told whether each page succeeded.
+    A failed page is not saved: the returned 'retry' status carries its failure
+    class, and the caller decides whether to re-queue it. A watchdog kills the
+    driver if the page runs over its time budget; the slot then gets a new one.
+    In 'offline' mode with a parse_executor the returned 'parsing' status carries
+    the parse future, and the caller saves the row once it completes. While the
+    result writer runs, 'success' carries the row's write Future in 'write'.
     """
     driver = None
+    slot = None
+    page_failed = False
+    watch_token = None
     try:
-        print(f"\n[Thread {thread_id}] [{current_index}/{total_urls}] Processing URL: {url}")
+        retry_note = f" (attempt {attempt}/{MAX_ATTEMPTS})" if attempt > 1 else ""
+        print(f"\n[Thread {thread_id}] [{current_index}/{total_urls}] Processing URL{retry_note}: {url}")
 
         # Check if this URL was already processed (thread-safe check)
         if check_url_already_processed(url, output_filename):
             print(f"[Thread {thread_id}] ⏭️  Skipping - already processed")
             return {'status': 'skipped', 'url': url}
 
-        # Create driver for this thread
-        driver = create_chrome_driver(thread_id)
-        wait = WebDriverWait(driver, 15)
+        # Borrow a long-lived driver from the pool, or create one for this URL
+        if driver_pool:
+            slot = driver_pool.checkout()
+            driver = slot['driver']
+            thread_id = slot['slot_id']
+        else:
+            driver = create_chrome_driver(thread_id)
+        wait = WebDriverWait(driver, ELEMENT_WAIT_SECONDS)
+
+        # Wait for the shared page budget before loading the page
+        if rate_limiter:
+            rate_limiter.acquire()
+
+        # The time budget starts with the page load
+        if watchdog:
+            watch_token = watchdog.watch(driver, f"[Thread {thread_id}] {url}")
 
         # Extract data from the URL
-        result = scrape_data(url, driver, wait)
+        result = scrape_data(url, driver, wait, parse_executor)
+
+        # Killed mid-page but the fields still came back (e.g. a last sleep): don't trust them
+        if watchdog and watchdog.expired(watch_token):
+            page_failed = True
+            return {'status': 'retry', 'url': url, 'error_class': TIMEOUT,
+                    'error': f"Over the {watchdog.budget_seconds}s time budget"}
+
+        if 'Page_HTML' in result:
+            # 'offline' mode: hand the HTML to the parser processes and give the driver back now
+            parse_future = parse_executor.submit(parse_place_html, result['Page_HTML'])
+            print(f"[Thread {thread_id}] 📄 Captured panel, parsing in the background")
+            return {'status': 'parsing', 'url': url, 'parse_future': parse_future}
+
+        # The page loaded but the panel never rendered: retry rather than save blanks
+        if is_empty_panel(result):
+            page_failed = True
+            print(f"[Thread {thread_id}] ⚠️  Empty place panel")
+            return {'status': 'retry', 'url': url, 'error_class': EMPTY_PANEL,
+                    'error': 'No fields found in the place panel', 'result': result}
 
         # Thread-safe CSV writing
         success = append_result_to_csv(result, output_filename, write_header=False)
@@ -992,41 +1647,49 @@ def process_single_url(url, output_filename, thread_id, total_urls, current_inde
             print(f"[Thread {thread_id}]    Address: {result.get('Address', 'N/A')[:50]}...")
             print(f"[Thread {thread_id}]    Phone: {result.get('Phone', 'N/A')}")
             print(f"[Thread {thread_id}]    Coordinates: {result.get('Latitude', 'N/A')}, {result.get('Longitude', 'N/A')}")
-            return {'status': 'success', 'url': url, 'result': result}
+            return {'status': 'success', 'url': url, 'result': result, 'write': success}
         else:
             print(f"[Thread {thread_id}] ❌ Failed to save result to CSV")
             return {'status': 'csv_error', 'url': url}
 
     except Exception as e:
-        print(f"[Thread {thread_id}] ❌ Error processing URL: {str(e)}")
+        page_failed = True
+        error = str(e)
+        if watchdog and watchdog.expired(watch_token):
+            # The watchdog killed the driver: whatever Selenium raised, the page hung
+            error_class = TIMEOUT
+            error = f"Over the {watchdog.budget_seconds}s time budget ({error})"
+        else:
+            error_class = classify_failure(e)
+        print(f"[Thread {thread_id}] ❌ Error processing URL ({error_class}): {error}")
+        return {'status': 'retry', 'url': url, 'error_class': error_class, 'error': error}
 
-        # Still try to save an error record with coordinates
-        try:
-            latitude, longitude = extract_coordinates_from_url(url)
-            error_result = {
-                'URL': url,
-                'Name': 'Error',
-                'Address': 'Error',
-                'Website': 'Error',
-                'Phone': 'Error',
-                'Latitude': latitude,
-                'Longitude': longitude
-            }
-            append_result_to_csv(error_result, output_filename, write_header=False)
-        except:
-            pass
+    finally:
+        driver_killed = watchdog.release(watch_token) if watchdog else False
 
-        return {'status': 'error', 'url': url, 'error': str(e)}
+        # Feed the outcome back to the adaptive rate (skipped URLs never loaded a page)
+        if rate_limiter and driver:
+            if page_failed:
+                rate_limiter.record_failure()
+            else:
+                rate_limiter.record_success()
 
-    finally:
-        # Clean up driver
-        if driver:
+        # Return the pooled driver (recycled on error or after N pages) or clean up
+        if slot:
+            driver_pool.checkin(slot, failed=page_failed, retire=driver_killed)
+        elif driver:
             safe_driver_quit(driver)
 
 
-
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == 'reparse':
+        # python Extract_Maps.py reparse OUTPUT.csv [HTML_DIR]: rebuild results from stored pages
+        if len(sys.argv) < 3:
+            print(f"Usage: python Extract_Maps.py reparse OUTPUT.csv [HTML_DIR (default: {OFFLINE_HTML_DIR})]")
+            sys.exit(1)
+        reparse_stored_pages(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else OFFLINE_HTML_DIR)
+    else:
+        main()
     
     
 
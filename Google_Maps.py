@@ -112,9 +112,10 @@ if __name__ == "__main__":
     scroll_google_maps()'''
 #Pipeline -1
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
 import undetected_chromedriver as uc
 import time
 import csv
@@ -123,6 +124,17 @@ import os
 from urllib.parse import quote
 import signal
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED
+from concurrent.futures import wait as wait_for_futures
+from discovery_planner import (
+    root_tiles, plan_discovery, tile_key, tile_viewport, nearest_pincode, pincode_centers_from_csv
+)
+from driver_pool import DriverPool
+from driver_watchdog import kill_driver_process_tree, driver_process_records, kill_recorded_process_trees
+from place_urls import PlaceIndex
+from rate_limiter import RateLimiter
+from storage import PlaceStore, DEFAULT_DB_FILENAME
 
 # Define search terms for stationery businesses
 SEARCH_TERMS = [
@@ -221,6 +233,153 @@ CHENNAI_PINCODES = [
     "600118"
 ]
 
+MASTER_CSV_FILENAME = 'stationery_shops_chennai_master.csv'
+
+# Parallel discovery tuning (adjust for the machine)
+DISCOVERY_WORKERS = 2               # K searches running at once
+DISCOVERY_DRIVER_POOL_SIZE = 2      # Chrome drivers shared by the workers (one per worker)
+DISCOVERY_MAX_IN_FLIGHT = DISCOVERY_WORKERS * 2  # Searches queued or running at once (bounded window)
+DISCOVERY_SEARCHES_PER_MINUTE = 6   # Starting polite rate across all workers (adapts, see below)
+DISCOVERY_MIN_SEARCHES_PER_MINUTE = 2
+DISCOVERY_MAX_SEARCHES_PER_MINUTE = 15
+# Discovery processes using this file share one 'discovery' budget (None: per process);
+# Extract_Maps.py keeps its own 'extraction' entry in the same file. The learnt rate
+# persists between runs and restarts from the default after 10 idle minutes.
+RATE_LIMIT_STATE_FILE = 'xtract_rate_limit.json'
+DISCOVERY_SEARCHES_PER_DRIVER = 25  # Searches a driver runs before a restart (1 = fresh browser per search)
+# After all drivers are closed, kill whatever is left of the Chrome/chromedriver
+# processes this run's own drivers started (recorded by PID when each driver starts;
+# needs psutil). Other programs' Chrome, e.g. a side-by-side Extract_Maps.py run, is never touched.
+END_OF_RUN_CHROME_SWEEP = False
+
+# How a search is opened: 'searchbox' types into the Maps search box,
+# 'url' navigates straight to the search-results URL and waits for the feed
+DISCOVERY_ENTRY_MODE = 'searchbox'
+SEARCH_RESULTS_TIMEOUT = 20
+SEARCH_TIME_LIMIT_SECONDS = 300  # Scrolling one search's results stops after this (5 minutes)
+# Optional map viewport per pincode for 'url' mode: {"600001": (13.0878, 80.2785, 15)}
+PINCODE_VIEWPORTS = {}
+
+# 'flat' searches every term in every pincode; 'quadtree' searches viewport tiles
+# around the pincode centres (taken from PINCODE_CENTERS_CSV) and splits tiles
+# whose feed hit the result cap (see discovery_planner.py). Tiles use 'url' entry.
+DISCOVERY_STRATEGY = 'flat'
+PINCODE_CENTERS_CSV = MASTER_CSV_FILENAME
+
+# Where discoveries are stored: 'csv' (per-term and master CSVs) or 'sqlite'
+# (STORAGE_DB_FILENAME, one transaction per search; export with storage.py)
+STORAGE_BACKEND = 'csv'
+STORAGE_DB_FILENAME = DEFAULT_DB_FILENAME
+place_store = None
+
+# Serializes appends to the per-term and master CSVs (and their indexes)
+discovery_lock = threading.Lock()
+
+# (pid, create_time) of every pooled driver's root processes started by this run,
+# for the END_OF_RUN_CHROME_SWEEP
+run_driver_processes = []
+
+# Checkpoint journal: one row per finished (term, pincode) search, latest row wins.
+# Searches whose latest status is 'done' or 'empty' are skipped on restart.
+DISCOVERY_CHECKPOINT_FILENAME = 'discovery_checkpoints.csv'
+CHECKPOINT_FIELDNAMES = ['Search_Term', 'Pincode', 'Status', 'Result_Count', 'New_Count', 'End_Reason', 'Error', 'Timestamp']
+# True: only re-run searches whose latest status is 'failed' or 'empty'
+RERUN_FAILED_OR_EMPTY = False
+
+# Places already in each discovery CSV (master and per-term files), matched by
+# feature ID or place ID.
+# Each file is read once per run, then kept current by the append functions.
+discovery_indexes = {}
+
+# Returns only the place hrefs not returned before for this search, in one call.
+# Cards already harvested are stamped with the search id (arguments[0]), and a
+# Set of hrefs for that search drops repeats, so each call costs one round-trip
+# and only ships the new links. Stamps from an earlier search don't hide a card.
+HARVEST_NEW_PLACE_URLS_JS = """
+const searchId = String(arguments[0]);
+// Only the current search's Set is kept; a reused driver starts the next search clean
+if (!window.__xtractHarvest || window.__xtractHarvest.id !== searchId) {
+    window.__xtractHarvest = {id: searchId, seen: new Set()};
+}
+const seen = window.__xtractHarvest.seen;
+const fresh = [];
+for (const anchor of document.querySelectorAll("a[href*='maps/place']")) {
+    // Cards stamped by an earlier search (same node kept by a reused driver) count as new here
+    if (anchor.getAttribute('data-xtract-seen') === searchId) continue;
+    anchor.setAttribute('data-xtract-seen', searchId);
+    const href = anchor.href;
+    if (href && !seen.has(href)) {
+        seen.add(href);
+        fresh.push(href);
+    }
+}
+return fresh;
+"""
+
+# Candidates for the results list container, tried in order
+SCROLL_CONTAINER_SELECTORS = [
+    "div.m6QErb.DxyBCb.kA9KIf.dS8AEf.ecceSd",  # Original selector
+    "div[role='main']",  # Main content area
+    "div.siAUzd",  # Alternative container
+    "div.TFQHme",  # Another possible container
+    "div[data-value='Search results']",  # Search results container
+    ".m6QErb",  # Simplified version
+    "[role='main'] div[style*='overflow']",  # Any scrollable div in main
+]
+
+# Returns {element, selector} for the first element matching the selectors that
+# actually scrolls (scrollHeight > clientHeight), or null
+FIND_SCROLLABLE_CONTAINER_JS = """
+const selectors = arguments[0];
+for (const selector of selectors) {
+    let elements;
+    try {
+        elements = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;
+    }
+    for (const element of elements) {
+        if (element.scrollHeight > element.clientHeight) {
+            return {element: element, selector: selector};
+        }
+    }
+}
+return null;
+"""
+
+# Feed scrolling: wait at most FEED_GROWTH_TIMEOUT seconds per pass for new cards,
+# and stop after FEED_MAX_STALLED_ROUNDS passes in a row without growth
+FEED_GROWTH_TIMEOUT = 3
+FEED_MAX_STALLED_ROUNDS = 2
+
+# Scrolls the results container to the bottom, then resolves as soon as the feed
+# gains cards, Google's "You've reached the end of the list" marker appears, or the
+# timeout passes. Returns {before, after, end, waited} in one round-trip.
+SCROLL_AND_WAIT_FOR_FEED_JS = """
+var container = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var feed = container.querySelector("div[role='feed']") || container;
+function atEnd() {
+    var marker = container.querySelector("span.HlvSq");
+    return !!marker || (container.innerText || '').indexOf("reached the end of the list") !== -1;
+}
+var before = feed.children.length, start = Date.now(), nudged = false;
+container.scrollTop = container.scrollHeight;
+(function check() {
+    var after = feed.children.length, end = atEnd();
+    if (after > before || end || Date.now() - start >= maxMs) {
+        done({before: before, after: after, end: end, waited: Date.now() - start});
+        return;
+    }
+    if (!nudged && Date.now() - start > maxMs / 2) {
+        // Nudge up and back down once to retrigger lazy loading
+        nudged = true;
+        container.scrollTop = container.scrollHeight - 200;
+        setTimeout(function () { container.scrollTop = container.scrollHeight; }, 50);
+    }
+    setTimeout(check, 100);
+})();
+"""
+
 def safe_driver_quit(driver):
     """
     Safely quit the Chrome driver with enhanced cleanup for virtual servers.
@@ -274,35 +433,37 @@ def safe_driver_quit(driver):
     except Exception as e:
         print(f"⚠ Process termination failed: {e}")
 
-    # Step 4: System-level cleanup (last resort)
+    # Step 4: Kill this driver's chromedriver/Chrome process tree (never other drivers')
     try:
-        import psutil
-        print("Performing system-level Chrome cleanup...")
-        killed_count = 0
+        killed_count = kill_driver_process_tree(driver)
+        if killed_count:
+            print(f"✓ Killed {killed_count} driver processes")
+    except Exception as e:
+        print(f"⚠ Process tree kill failed: {e}")
 
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if proc.info['name'] and 'chrome' in proc.info['name'].lower():
-                    cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                    # Only kill Chrome processes that look like our webdriver instances
-                    if any(keyword in cmdline.lower() for keyword in ['chromedriver', 'undetected', 'webdriver']):
-                        proc.kill()
-                        killed_count += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+    print("Driver cleanup completed")
 
-        if killed_count > 0:
-            print(f"✓ Killed {killed_count} remaining Chrome processes")
-        else:
-            print("✓ No remaining Chrome processes found")
+def start_discovery_driver(slot_id):
+    """Driver factory for the discovery pool; records the driver's processes for the end-of-run sweep"""
+    driver = create_stable_driver()
+    records = driver_process_records(driver)
+    with discovery_lock:
+        run_driver_processes.extend(records)
+    return driver
 
-    except ImportError:
-        print("⚠ psutil not available for system-level cleanup")
+def sweep_stray_chrome():
+    """End-of-run cleanup: kill what is left of this run's drivers (e.g. after a crash)"""
+    try:
+        with discovery_lock:
+            records = list(run_driver_processes)
+        killed_count = kill_recorded_process_trees(records)
+        if killed_count is None:
+            print("⚠ psutil not available for system-level cleanup")
+        elif killed_count > 0:
+            print(f"✓ Killed {killed_count} leftover Chrome processes")
     except Exception as e:
         print(f"⚠ System-level cleanup failed: {e}")
 
-    print("Driver cleanup completed")
-
 def create_stable_driver():
     """
     Create a Chrome driver optimized for virtual servers with enhanced stability
@@ -369,219 +530,267 @@ def create_stable_driver():
                 print("All driver creation attempts failed")
                 raise e
 
-def scroll_google_maps_single_search(search_term, pincode):
+def build_search_url(search_term, pincode, viewport=None):
+    """
+    Google Maps search-results URL for a term and pincode (pincode may be None)
+    viewport is an optional (lat, lng, zoom) to centre the map on
+    """
+    search_query = f"{search_term} {pincode}" if pincode else search_term
+    search_url = f"https://www.google.com/maps/search/{quote(search_query)}/"
+    if viewport:
+        lat, lng, zoom = viewport
+        search_url += f"@{lat},{lng},{zoom}z"
+    return search_url
+
+def open_search_results_url(driver, search_term, pincode, viewport=None):
+    """
+    Navigate straight to the search-results URL and wait only for the results feed
+    With a viewport (a planner tile) only the term is searched, bounded by the map view
+    Returns 'feed', or 'place' when Maps opened a single matching place instead
+    """
+    if viewport:
+        search_url = build_search_url(search_term, None, viewport)
+    else:
+        search_url = build_search_url(search_term, pincode, PINCODE_VIEWPORTS.get(pincode))
+    print(f"Opening search results: {search_url}")
+    driver.get(search_url)
+
+    WebDriverWait(driver, SEARCH_RESULTS_TIMEOUT).until(EC.any_of(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='feed']")),
+        EC.presence_of_element_located((By.CSS_SELECTOR, "h1.DUwDvf")),
+    ))
+    if driver.find_elements(By.CSS_SELECTOR, "div[role='feed']"):
+        print("✓ Results feed loaded")
+        return 'feed'
+    return 'place'
+
+def find_reusable_search_box(driver):
+    """
+    Return the search box if the driver is already showing Google Maps, else None
+    Lets a pooled driver run its next search without reloading the page
+    """
+    try:
+        if '/maps' not in (driver.current_url or ''):
+            return None
+        boxes = driver.find_elements(By.ID, "searchboxinput")
+        return boxes[0] if boxes else None
+    except WebDriverException:
+        return None
+
+def scroll_google_maps_single_search(search_term, pincode, driver=None, search_stats=None, viewport=None):
     """
     Scrape Google Maps for a single search term and pincode combination
     Uses interactive search method instead of URL-based approach
+
+    If a driver is passed (e.g. from a pool) it is used and left open; otherwise
+    a driver is created and quit for this search. When given, search_stats is
+    filled with details about the search ('error' is set if it failed).
+    A viewport (lat, lng, zoom) bounds the search to that map view via the search URL.
     """
-    driver = None
+    owns_driver = driver is None
     all_data = []
+    if search_stats is None:
+        search_stats = {}
 
     try:
-        driver = create_stable_driver()
+        if owns_driver:
+            driver = create_stable_driver()
 
         # Create search query with pincode
         search_query = f"{search_term} {pincode}"
 
         print(f"Searching for: {search_query}")
 
-        # Navigate to base Google Maps URL
-        maps_url = "https://www.google.com/maps/"
-        print(f"Opening Google Maps: {maps_url}")
-        driver.get(maps_url)
-
-        # Wait for page to load
-        print("Loading Google Maps...")
-        time.sleep(3)
-
-        # Wait for search box to be present
-        print("Waiting for search box to load...")
-        wait = WebDriverWait(driver, 15)
-        search_box = wait.until(EC.presence_of_element_located((By.ID, "searchboxinput")))
-        print("✓ Search box found")
-
-        # Clear and enter search query
-        print(f"Entering search query: {search_query}")
-        search_box.clear()
-        search_box.send_keys(f"{'search_query'}")
-        time.sleep(1)
-
-        # Click search button
-        print("Clicking search button...")
-        search_button = driver.find_element(By.ID, "searchbox-searchbutton")
-        search_button.click()
-
-        # Wait for results to load
-        print("Waiting for search results to load...")
-        time.sleep(5)
-
-        # Click the first result to open the results panel with timeout
-        print("Clicking first result to open results panel...")
-        try:
-            element = WebDriverWait(driver, 20).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, "hfpxzc"))
-            )
-            element.click()
-            print("✓ First result clicked successfully")
-        except TimeoutException:
-            print("⚠ Timeout waiting for first result - trying alternative approach")
-            # Try to find any clickable map result
+        if DISCOVERY_ENTRY_MODE == 'url' or viewport:
+            # Straight to the results list: no typing, clicks or fixed sleeps
+            landing = open_search_results_url(driver, search_term, pincode, viewport)
+            if landing == 'place':
+                # Maps jumped to a single matching place instead of a list
+                search_stats['end_reason'] = 'single_place'
+                print(f"Single place result: {driver.current_url}")
+                return [{
+                    'URL': driver.current_url,
+                    'Search_Term': search_term,
+                    'Pincode': pincode,
+                    'Search_Query': search_query
+                }]
+        else:
+            # A reused driver is already on Google Maps: resubmit the search box in place
+            search_box = find_reusable_search_box(driver)
+            if search_box is not None:
+                print("♻️ Reusing open Google Maps session")
+            else:
+                # Navigate to base Google Maps URL
+                maps_url = "https://www.google.com/maps/"
+                print(f"Opening Google Maps: {maps_url}")
+                driver.get(maps_url)
+
+                # Wait for page to load
+                print("Loading Google Maps...")
+                time.sleep(3)
+
+                # Wait for search box to be present
+                print("Waiting for search box to load...")
+                wait = WebDriverWait(driver, 15)
+                search_box = wait.until(EC.presence_of_element_located((By.ID, "searchboxinput")))
+                print("✓ Search box found")
+
+            # Clear and enter search query
+            print(f"Entering search query: {search_query}")
+            search_box.clear()
+            # clear() can leave the previous query in Maps' input; select-all removes it
+            search_box.send_keys(Keys.CONTROL, 'a')
+            search_box.send_keys(Keys.DELETE)
+            search_box.send_keys(search_query)
+            time.sleep(1)
+
+            # Click search button
+            print("Clicking search button...")
+            search_button = driver.find_element(By.ID, "searchbox-searchbutton")
+            search_button.click()
+
+            # Wait for results to load
+            print("Waiting for search results to load...")
+            time.sleep(5)
+
+            # Click the first result to open the results panel with timeout
+            print("Clicking first result to open results panel...")
             try:
-                alternative_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='maps/place'], .hfpxzc")
-                if alternative_elements:
-                    alternative_elements[0].click()
-                    print("✓ Alternative result clicked")
-                else:
-                    print("✗ No clickable results found")
+                element = WebDriverWait(driver, 20).until(
+                    EC.element_to_be_clickable((By.CLASS_NAME, "hfpxzc"))
+                )
+                element.click()
+                print("✓ First result clicked successfully")
+            except TimeoutException:
+                print("⚠ Timeout waiting for first result - trying alternative approach")
+                # Try to find any clickable map result
+                try:
+                    alternative_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='maps/place'], .hfpxzc")
+                    if alternative_elements:
+                        alternative_elements[0].click()
+                        print("✓ Alternative result clicked")
+                    else:
+                        print("✗ No clickable results found")
+                        return []
+                except Exception as e:
+                    print(f"✗ Alternative click failed: {e}")
+                    search_stats['error'] = f"Alternative click failed: {e}"
                     return []
-            except Exception as e:
-                print(f"✗ Alternative click failed: {e}")
-                return []
 
-        # Wait for the results panel to load
-        print("Waiting for results panel to load...")
-        time.sleep(5)
+            # Wait for the results panel to load
+            print("Waiting for results panel to load...")
+            time.sleep(5)
 
         urls = set()
-        scroll_pause_time = 3  # Increased pause time for better loading
+        harvest_id = f"{search_query}|{time.time()}"
         scroll_attempts = 0
         max_attempts = 25  # Reduced for faster completion
         consecutive_no_new_content = 0
-        max_consecutive_no_new = 3  # Reduced to prevent hanging
+        end_reason = None
+        scrollable_div = None
 
-        # Add overall timeout for the entire search (5 minutes max)
+        # Overall timeout for the entire search
         search_start_time = time.time()
-        max_search_time = 300  # 5 minutes timeout
+        max_search_time = SEARCH_TIME_LIMIT_SECONDS
 
         def find_scrollable_container():
-                """Try multiple selectors to find the scrollable container"""
-                selectors = [
-                    "div.m6QErb.DxyBCb.kA9KIf.dS8AEf.ecceSd",  # Original selector
-                    "div[role='main']",  # Main content area
-                    "div.siAUzd",  # Alternative container
-                    "div.TFQHme",  # Another possible container
-                    "div[data-value='Search results']",  # Search results container
-                    ".m6QErb",  # Simplified version
-                    "[role='main'] div[style*='overflow']",  # Any scrollable div in main
-                ]
-
-                for selector in selectors:
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for element in elements:
-                            # Check if element is scrollable
-                            scroll_height = driver.execute_script("return arguments[0].scrollHeight", element)
-                            client_height = driver.execute_script("return arguments[0].clientHeight", element)
-                            if scroll_height > client_height:
-                                print(f"Found scrollable container with selector: {selector}")
-                                return element
-                    except Exception as e:
-                        continue
+                """Resolve the first scrollable results container in one script call"""
+                match = driver.execute_script(FIND_SCROLLABLE_CONTAINER_JS, SCROLL_CONTAINER_SELECTORS)
+                if match:
+                    print(f"Found scrollable container with selector: {match['selector']}")
+                    return match['element']
                 return None
 
+        def harvest_new_urls():
+                """Collect the URLs added since the last pass (single script call)"""
+                for url in driver.execute_script(HARVEST_NEW_PLACE_URLS_JS, harvest_id) or []:
+                    if url not in urls:
+                        urls.add(url)
+                        # Add search context to the data
+                        all_data.append({
+                            'URL': url,
+                            'Search_Term': search_term,
+                            'Pincode': pincode,
+                            'Search_Query': f"{search_term} {pincode}"
+                        })
+
         while scroll_attempts < max_attempts:
                 try:
                     # Check for overall timeout
                     if time.time() - search_start_time > max_search_time:
                         print(f"⏰ Search timeout reached ({max_search_time/60:.1f} minutes). Stopping search.")
+                        end_reason = 'search_timeout'
                         break
 
-                    # Find the scrollable container using multiple strategies
-                    scrollable_div = find_scrollable_container()
+                    # Find the scrollable container once; re-resolve only after it went stale
+                    if scrollable_div is None:
+                        scrollable_div = find_scrollable_container()
 
                     if not scrollable_div:
                         print("Could not find scrollable container, trying alternative approach...")
                         # Fallback: scroll the entire page
                         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(scroll_pause_time)
+                        time.sleep(FEED_GROWTH_TIMEOUT)
                         scroll_attempts += 1
                         continue
 
                     # Store current URL count
                     previous_url_count = len(urls)
 
-                    # Get current scroll position
-                    last_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
-
-                    # Collect URLs and other data
-                    places = driver.find_elements(By.CSS_SELECTOR, "a[href*='maps/place']")
-                    for place in places:
-                        try:
-                            url = place.get_attribute('href')
-                            if url and url not in urls:
-                                urls.add(url)
-                                # Add search context to the data
-                                place_data = {
-                                    'URL': url,
-                                    'Search_Term': search_term,
-                                    'Pincode': pincode,
-                                    'Search_Query': f"{search_term} {pincode}"
-                                }
-                                all_data.append(place_data)
-                        except Exception as e:
-                            continue
-
-                    # Multiple scrolling strategies
-                    # Strategy 1: Scroll to bottom
-                    driver.execute_script(
-                        'arguments[0].scrollTop = arguments[0].scrollHeight',
-                        scrollable_div
-                    )
-                    time.sleep(1)
-
-                    # Strategy 2: Gradual scrolling to trigger lazy loading
-                    current_scroll = driver.execute_script("return arguments[0].scrollTop", scrollable_div)
-                    scroll_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
-
-                    # Scroll in smaller increments
-                    for i in range(3):
-                        new_scroll_pos = current_scroll + (scroll_height - current_scroll) // 3 * (i + 1)
-                        driver.execute_script(f"arguments[0].scrollTop = {new_scroll_pos}", scrollable_div)
-                        time.sleep(0.5)
-
-                    # Wait for new content to load
-                    time.sleep(scroll_pause_time)
-
-                    # Calculate new scroll height
-                    new_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
-
-                    # Check if we found new URLs
+                    harvest_new_urls()
+
+                    # Scroll to the bottom and wait for the feed to grow (or the end marker)
+                    try:
+                        feed = driver.execute_async_script(SCROLL_AND_WAIT_FOR_FEED_JS, scrollable_div,
+                                                           int(FEED_GROWTH_TIMEOUT * 1000))
+                    except StaleElementReferenceException:
+                        print("Scrollable container went stale, resolving it again...")
+                        scrollable_div = None
+                        continue
+
                     new_url_count = len(urls)
                     new_urls_found = new_url_count - previous_url_count
+                    print(f"Scroll attempt {scroll_attempts + 1}, Found {new_url_count} unique URLs (+{new_urls_found} new), "
+                          f"feed {feed['before']} -> {feed['after']} cards in {feed['waited'] / 1000:.1f}s")
 
-                    # Print progress
-                    print(f"Scroll attempt {scroll_attempts + 1}, Found {new_url_count} unique URLs (+{new_urls_found} new)")
+                    if feed['end']:
+                        print("🏁 Reached the end of the list")
+                        end_reason = 'end_of_list'
+                        break
 
                     # Update counters based on progress
-                    if new_height == last_height and new_urls_found == 0:
-                        consecutive_no_new_content += 1
-                        scroll_attempts += 1
-                    else:
+                    if feed['after'] > feed['before'] or new_urls_found > 0:
                         consecutive_no_new_content = 0
                         if new_urls_found > 0:
                             scroll_attempts = max(0, scroll_attempts - 1)  # Reset counter if we found new content
+                    else:
+                        consecutive_no_new_content += 1
+                        scroll_attempts += 1
 
-                    # Stop if we haven't found new content for several attempts
-                    if consecutive_no_new_content >= max_consecutive_no_new:
-                        print(f"No new content found for {max_consecutive_no_new} consecutive attempts. Stopping.")
+                    # Stop if the feed has not grown for several attempts
+                    if consecutive_no_new_content >= FEED_MAX_STALLED_ROUNDS:
+                        print(f"No new content found for {FEED_MAX_STALLED_ROUNDS} consecutive attempts. Stopping.")
+                        end_reason = 'no_new_content'
                         break
 
-                    # Strategy 3: Small scroll up and down to trigger loading of new content
-                    driver.execute_script(
-                        'arguments[0].scrollTop = arguments[0].scrollHeight - 200',
-                        scrollable_div
-                    )
-                    time.sleep(0.5)
-                    driver.execute_script(
-                        'arguments[0].scrollTop = arguments[0].scrollHeight',
-                        scrollable_div
-                    )
-                    time.sleep(0.5)
-
                 except Exception as e:
                     print(f"Scroll error: {str(e)}")
                     scroll_attempts += 1
+                    scrollable_div = None  # Re-resolve the container on the next attempt
                     time.sleep(2)
+        else:
+            # Ran out of attempts without a stop condition
+            end_reason = 'no_container' if scrollable_div is None else 'max_attempts'
+
+        # Harvest the cards the last scroll pass loaded, whatever stopped the loop
+        # (end marker, search timeout, stalled feed or attempts used up)
+        try:
+            harvest_new_urls()
+        except Exception as e:
+            print(f"Final harvest failed: {e}")
+
+        search_stats['end_reason'] = end_reason
+        print(f"Search ended: {end_reason}")
 
         # Print the complete list of URLs for this search
         print(f"\nComplete list of URLs for '{search_term} {pincode}':")
@@ -592,14 +801,18 @@ def scroll_google_maps_single_search(search_term, pincode):
         # Return the list of data
         return all_data
 
-    except TimeoutException:
+    except TimeoutException as e:
         print("Timeout waiting for element")
-    except NoSuchElementException:
+        search_stats['error'] = f"Timeout: {e}"
+    except NoSuchElementException as e:
         print("Element not found")
+        search_stats['error'] = f"Element not found: {e}"
     except Exception as e:
         print(f"An error occurred: {str(e)}")
+        search_stats['error'] = str(e)
     finally:
-        safe_driver_quit(driver)
+        if owns_driver:
+            safe_driver_quit(driver)
 
     return []
 
@@ -611,172 +824,403 @@ def get_individual_csv_filename(search_term):
     safe_search_term = safe_search_term.replace(' ', '_').lower()
     return f"{safe_search_term}_results.csv"
 
+def get_discovery_index(csv_filename):
+    """
+    Return the PlaceIndex of the places in a discovery CSV.
+    The file is only read the first time; later appends update the index in place.
+    """
+    if csv_filename not in discovery_indexes:
+        index = PlaceIndex()
+        if os.path.exists(csv_filename):
+            try:
+                with open(csv_filename, 'r', newline='', encoding='utf-8') as file:
+                    reader = csv.DictReader(file)
+                    for row in reader:
+                        index.add(row.get('URL'))
+            except Exception as e:
+                print(f"Warning: Error reading existing CSV {csv_filename}: {e}")
+        discovery_indexes[csv_filename] = index
+    return discovery_indexes[csv_filename]
+
+def append_new_places(data_list, csv_filename):
+    """
+    Append the places not yet in csv_filename, using its discovery index for dedup
+    Creates file with header if it doesn't exist. Returns the number of rows written.
+    """
+    index = get_discovery_index(csv_filename)
+
+    # Filter out duplicates (same place under a different URL variant included)
+    new_data = [item for item in data_list if index.add(item['URL'])]
+
+    if new_data:
+        file_exists = os.path.exists(csv_filename)
+        with open(csv_filename, 'a', newline='', encoding='utf-8') as file:
+            fieldnames = ['URL', 'Search_Term', 'Pincode', 'Search_Query']
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+
+            # Write header only if file is new
+            if not file_exists:
+                writer.writeheader()
+
+            writer.writerows(new_data)
+
+    return len(new_data)
+
 def append_to_individual_csv(data_list, search_term):
     """
     Append search results to individual CSV file for a specific search term
-    Creates file with header if it doesn't exist, otherwise appends data
+    Places already in that file are skipped
     """
     if not data_list:
         return 0
 
     csv_filename = get_individual_csv_filename(search_term)
-    file_exists = os.path.exists(csv_filename)
-
-    with open(csv_filename, 'a', newline='', encoding='utf-8') as file:
-        fieldnames = ['URL', 'Search_Term', 'Pincode', 'Search_Query']
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        # Write header only if file is new
-        if not file_exists:
-            writer.writeheader()
-
-        writer.writerows(data_list)
+    new_count = append_new_places(data_list, csv_filename)
 
-    print(f"Appended {len(data_list)} results to {csv_filename}")
-    return len(data_list)
+    print(f"Appended {new_count} results to {csv_filename}")
+    return new_count
 
-def append_to_master_csv(data_list, csv_filename='stationery_shops_chennai_master.csv'):
+def append_to_master_csv(data_list, csv_filename=MASTER_CSV_FILENAME):
     """
     Append data to master CSV file, avoiding duplicates
-    Optimized for real-time incremental updates
+    Optimized for real-time incremental updates: the dedup index is loaded once per run
     """
     if not data_list:
         return 0
 
-    # Check if file exists to determine if we need headers
-    file_exists = os.path.exists(csv_filename)
+    new_count = append_new_places(data_list, csv_filename)
+
+    if new_count:
+        print(f"Added {new_count} new unique entries to master CSV")
+    else:
+        print("No new unique entries to add to master CSV")
+
+    return new_count
 
-    # Read existing URLs to avoid duplicates (only if file exists and is not empty)
-    existing_urls = set()
-    if file_exists:
+def load_discovery_checkpoints(checkpoint_filename=DISCOVERY_CHECKPOINT_FILENAME):
+    """
+    Read the checkpoint journal
+    Returns {(search_term, pincode): latest checkpoint row}
+    """
+    checkpoints = {}
+    if os.path.exists(checkpoint_filename):
         try:
-            with open(csv_filename, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    existing_urls.add(row['URL'])
+            with open(checkpoint_filename, 'r', newline='', encoding='utf-8') as file:
+                for row in csv.DictReader(file):
+                    checkpoints[(row['Search_Term'], row['Pincode'])] = row
         except Exception as e:
-            print(f"Warning: Error reading existing master CSV: {e}")
+            print(f"Warning: Error reading checkpoint journal {checkpoint_filename}: {e}")
+    return checkpoints
 
-    # Filter out duplicates
-    new_data = []
-    for item in data_list:
-        if item['URL'] not in existing_urls:
-            new_data.append(item)
-            existing_urls.add(item['URL'])
+def record_discovery_checkpoint(outcome, checkpoint_filename=DISCOVERY_CHECKPOINT_FILENAME):
+    """
+    Append one finished search to the checkpoint journal
+    Status is 'failed' (error), 'empty' (no results) or 'done'
+    """
+    if outcome['error']:
+        status = 'failed'
+    elif outcome['result_count'] == 0:
+        status = 'empty'
+    else:
+        status = 'done'
 
-    # Append new data to CSV
-    if new_data:
-        with open(csv_filename, 'a', newline='', encoding='utf-8') as file:
-            fieldnames = ['URL', 'Search_Term', 'Pincode', 'Search_Query']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
+    with discovery_lock:
+        write_checkpoint_row(outcome, status, checkpoint_filename)
+    return status
 
-            # Write header only if file is new
-            if not file_exists:
-                writer.writeheader()
+def write_checkpoint_row(outcome, status, checkpoint_filename):
+    file_exists = os.path.exists(checkpoint_filename)
+    with open(checkpoint_filename, 'a', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=CHECKPOINT_FIELDNAMES)
+        if not file_exists:
+            writer.writeheader()
+        writer.writerow({
+            'Search_Term': outcome['search_term'],
+            'Pincode': outcome['pincode'],
+            'Status': status,
+            'Result_Count': outcome['result_count'],
+            'New_Count': outcome['master_new_count'],
+            'End_Reason': outcome['end_reason'] or '',
+            'Error': outcome['error'] or '',
+            'Timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        })
+        file.flush()
+
+def plan_discovery_searches(checkpoints, rerun_failed_or_empty=RERUN_FAILED_OR_EMPTY):
+    """
+    Build the list of (search_term, pincode) pairs still to run
+    Normal runs skip pairs that finished as 'done' or 'empty';
+    rerun mode picks only the pairs whose latest status is 'failed' or 'empty'
+    """
+    search_plan = []
+    # Pincode-major order: consecutive searches on a driver stay in the same area
+    for pincode in CHENNAI_PINCODES:
+        for search_term in SEARCH_TERMS:
+            checkpoint = checkpoints.get((search_term, pincode))
+            status = checkpoint['Status'] if checkpoint else None
+            if rerun_failed_or_empty:
+                if status in ('failed', 'empty'):
+                    search_plan.append((search_term, pincode))
+            elif status not in ('done', 'empty'):
+                search_plan.append((search_term, pincode))
+    return search_plan
+
+def get_place_store():
+    """The shared SQLite store, opened on first use (STORAGE_BACKEND = 'sqlite')"""
+    global place_store
+    with discovery_lock:
+        if place_store is None:
+            place_store = PlaceStore(STORAGE_DB_FILENAME)
+        return place_store
+
+def save_discoveries(results, search_term):
+    """
+    Store one search's results with the configured backend
+    Returns (new places for this search term, new places overall)
+    """
+    if STORAGE_BACKEND == 'sqlite':
+        return get_place_store().add_discoveries(results)
+    with discovery_lock:
+        return append_to_individual_csv(results, search_term), append_to_master_csv(results)
+
+def count_discovered_places(search_term=None):
+    """Unique places discovered overall, or for one search term"""
+    if STORAGE_BACKEND == 'sqlite':
+        return get_place_store().count_discovered_places(search_term)
+    csv_filename = MASTER_CSV_FILENAME if search_term is None else get_individual_csv_filename(search_term)
+    return len(get_discovery_index(csv_filename))
+
+def run_discovery_search(search_term, pincode, driver_pool, rate_limiter, search_number, total_searches, viewport=None):
+    """
+    Run one term/pincode search on a pooled driver and save its results
+    Called from the discovery worker threads; any failure (starting a driver,
+    searching or saving) is returned in 'error' so the run carries on
+    """
+    area = f"tile @{viewport[0]},{viewport[1]},{viewport[2]}z near {pincode}" if viewport else pincode
+    search_stats = {}
+    results = []
+    slot = None
+    try:
+        # Global politeness: all workers share one rate
+        rate_limiter.acquire()
+        print(f"\n[{search_number}/{total_searches}] Processing: {search_term} in {area}")
+        slot = driver_pool.checkout()
+        results = scroll_google_maps_single_search(search_term, pincode, driver=slot['driver'],
+                                                   search_stats=search_stats, viewport=viewport)
+    except Exception as e:
+        search_stats['error'] = str(e)
+        results = []
+    finally:
+        if slot is not None:
+            driver_pool.checkin(slot, failed='error' in search_stats)
 
-            writer.writerows(new_data)
+    # Errors and timeouts slow every worker down; clean searches speed them up
+    if 'error' in search_stats:
+        rate_limiter.record_failure()
+    else:
+        rate_limiter.record_success()
 
-        print(f"Added {len(new_data)} new unique entries to master CSV")
+    individual_new_count = master_new_count = 0
+    if results:
+        # REAL-TIME SAVING: Immediately save results (both CSV files, or one SQLite transaction)
+        try:
+            individual_new_count, master_new_count = save_discoveries(results, search_term)
+            print(f"✅ [{search_term} {pincode}] Saved: {individual_new_count} new for this term, {master_new_count} new overall")
+        except Exception as e:
+            # Not saved: checkpointed as 'failed' so the search runs again
+            search_stats['error'] = f"Saving results failed: {e}"
+            print(f"❌ Could not save results for '{search_term} {pincode}': {e}")
+    elif 'error' in search_stats:
+        print(f"❌ Error in search '{search_term} {pincode}': {search_stats['error']}")
     else:
-        print("No new unique entries to add to master CSV")
+        print(f"No results found for {search_term} in {pincode}")
+
+    return {
+        'search_term': search_term,
+        'pincode': pincode,
+        'result_count': len(results),
+        'master_new_count': master_new_count,
+        'end_reason': search_stats.get('end_reason'),
+        'error': search_stats.get('error'),
+    }
 
-    return len(new_data)
+def run_tiled_discovery(search_term, roots, pincode_centers, driver_pool, rate_limiter, checkpoints):
+    """
+    Quadtree discovery for one search term (DISCOVERY_STRATEGY = 'quadtree')
+    Each tile search is checkpointed under its tile key in the Pincode column;
+    finished tiles are replayed from the journal on restart instead of searched again
+    """
+    totals = {'search_term': search_term, 'searches': 0, 'failed': 0, 'result_count': 0, 'master_new_count': 0}
+    skip_statuses = ('done',) if RERUN_FAILED_OR_EMPTY else ('done', 'empty')
+
+    def search_tile(tile):
+        key = tile_key(tile)
+        checkpoint = checkpoints.get((search_term, key))
+        if checkpoint and checkpoint['Status'] in skip_statuses:
+            return {'result_count': int(checkpoint['Result_Count'] or 0), 'end_reason': checkpoint.get('End_Reason')}
+
+        outcome = run_discovery_search(search_term, nearest_pincode(tile, pincode_centers), driver_pool, rate_limiter,
+                                       totals['searches'] + 1, '?', viewport=tile_viewport(tile))
+        outcome['pincode'] = key
+        record_discovery_checkpoint(outcome)
+        totals['searches'] += 1
+        totals['failed'] += 1 if outcome['error'] else 0
+        totals['result_count'] += outcome['result_count']
+        totals['master_new_count'] += outcome['master_new_count']
+        return outcome
+
+    summary = plan_discovery(roots, search_tile)
+    print(f"🗺️ '{search_term}': {summary['searches']} tiles ({summary['splits']} split, "
+          f"{summary['capped_leaves']} still capped at max zoom)")
+    return totals
 
 def scroll_google_maps_multiple_searches():
     """
     Main function to search for all stationery terms with all pin codes
-    NEW BEHAVIOR: Real-time incremental data saving after each individual search
+    Runs DISCOVERY_WORKERS searches at once on a shared driver pool, paced by a
+    global rate limit, saving results in real time after each individual search.
+    Searches are submitted lazily, at most DISCOVERY_MAX_IN_FLIGHT at a time, so
+    Ctrl-C only has to wait for the few already queued or running.
     """
     total_results = 0
     total_new_results = 0
-    total_searches = len(SEARCH_TERMS) * len(CHENNAI_PINCODES)
+    failed_searches = 0
+    checkpoints = load_discovery_checkpoints()
     current_search = 0
+    term_totals = {search_term: 0 for search_term in SEARCH_TERMS}
+    tiled = DISCOVERY_STRATEGY == 'quadtree'
+
+    if tiled:
+        pincode_centers = pincode_centers_from_csv(PINCODE_CENTERS_CSV)
+        pincode_centers = {pincode: center for pincode, center in pincode_centers.items() if pincode in CHENNAI_PINCODES}
+        if not pincode_centers:
+            print(f"Error: no pincode centres could be derived from {PINCODE_CENTERS_CSV}")
+            return 0
+        missing = [pincode for pincode in CHENNAI_PINCODES if pincode not in pincode_centers]
+        if missing:
+            print(f"⚠️  No discovered places yet for {len(missing)} pincodes; only areas around known centres are tiled")
+        roots = root_tiles(pincode_centers.values())
+        search_plan = []
+        total_searches = '?'
+    else:
+        search_plan = plan_discovery_searches(checkpoints)
+        total_searches = len(search_plan)
 
     print(f"Starting comprehensive search for stationery shops in Chennai")
     print(f"REAL-TIME INCREMENTAL SAVING MODE")
-    print(f"Total searches to perform: {total_searches}")
+    if tiled:
+        print(f"🗺️ Quadtree discovery: {len(roots)} root tiles around {len(pincode_centers)} pincode centres per search term")
+    else:
+        print(f"Total searches to perform: {total_searches}")
+    if RERUN_FAILED_OR_EMPTY:
+        print(f"🔁 Re-running only failed or empty searches from {DISCOVERY_CHECKPOINT_FILENAME}")
+    elif checkpoints and not tiled:
+        skipped = len(SEARCH_TERMS) * len(CHENNAI_PINCODES) - total_searches
+        print(f"⏩ Skipping {skipped} searches already completed in {DISCOVERY_CHECKPOINT_FILENAME}")
     print(f"Search terms: {len(SEARCH_TERMS)}")
     print(f"Pin codes: {len(CHENNAI_PINCODES)}")
+    print(f"Parallel searches: {DISCOVERY_WORKERS} | Driver pool: {DISCOVERY_DRIVER_POOL_SIZE} | Rate: {DISCOVERY_SEARCHES_PER_MINUTE}/min adaptive ({DISCOVERY_MIN_SEARCHES_PER_MINUTE}-{DISCOVERY_MAX_SEARCHES_PER_MINUTE}/min)")
     print(f"Results will be saved immediately after each search")
     print("-" * 80)
 
-    # Process each search term across all pin codes
-    for search_term_index, search_term in enumerate(SEARCH_TERMS, 1):
-        print(f"\n{'='*80}")
-        print(f"PROCESSING SEARCH TERM {search_term_index}/{len(SEARCH_TERMS)}: '{search_term}'")
-        print(f"{'='*80}")
-
-        search_term_total_results = 0  # Track results for this search term
-
-        # Process this search term across all pin codes
-        for pincode_index, pincode in enumerate(CHENNAI_PINCODES, 1):
-            current_search += 1
-            print(f"\n[{current_search}/{total_searches}] Processing: {search_term} in {pincode}")
-            print(f"Pin code {pincode_index}/{len(CHENNAI_PINCODES)} for search term '{search_term}'")
-
-            try:
-                # Perform single search
-                results = scroll_google_maps_single_search(search_term, pincode)
-
-                if results:
-                    # REAL-TIME SAVING: Immediately save results to both CSV files
-                    print(f"Found {len(results)} results. Saving immediately...")
-
-                    # 1. Append to individual CSV for this search term
-                    individual_new_count = append_to_individual_csv(results, search_term)
-
-                    # 2. Append to master CSV
-                    master_new_count = append_to_master_csv(results)
-
-                    # Update counters
-                    search_term_total_results += len(results)
-                    total_results += len(results)
-                    total_new_results += master_new_count
-
-                    print(f"✅ Saved: {individual_new_count} to individual CSV, {master_new_count} new to master CSV")
-                else:
-                    print(f"No results found for {search_term} in {pincode}")
-
-                # Add delay between searches to avoid being blocked
-                if current_search < total_searches:
-                    print("Waiting 10 seconds before next search...")
-                    time.sleep(10)
-
-            except Exception as e:
-                print(f"❌ Error in search '{search_term} {pincode}': {e}")
-                print("Continuing to next search...")
-                continue
+    driver_pool = DriverPool(start_discovery_driver, safe_driver_quit, DISCOVERY_DRIVER_POOL_SIZE,
+                             recycle_after_pages=DISCOVERY_SEARCHES_PER_DRIVER, recycle_on_error=True)
+    rate_limiter = RateLimiter(DISCOVERY_SEARCHES_PER_MINUTE, min_rate=DISCOVERY_MIN_SEARCHES_PER_MINUTE,
+                               max_rate=DISCOVERY_MAX_SEARCHES_PER_MINUTE, state_file=RATE_LIMIT_STATE_FILE,
+                               workload='discovery')
+    executor = ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS)
+
+    if tiled:
+        # One job per term; each job walks its own quadtree
+        jobs = (((search_term, None), run_tiled_discovery, search_term, roots, pincode_centers, driver_pool,
+                 rate_limiter, checkpoints)
+                for search_term in SEARCH_TERMS)
+    else:
+        jobs = (((search_term, pincode), run_discovery_search, search_term, pincode, driver_pool, rate_limiter,
+                 search_number, total_searches)
+                for search_number, (search_term, pincode) in enumerate(search_plan, 1))
+    in_flight = {}  # future -> (search_term, pincode or None for a quadtree job)
+    jobs_exhausted = False
 
-        # After processing all pin codes for this search term:
-        print(f"\n{'-'*60}")
-        print(f"COMPLETED SEARCH TERM: '{search_term}'")
-        print(f"Total results found: {search_term_total_results}")
-        individual_csv_filename = get_individual_csv_filename(search_term)
-        print(f"Individual CSV: {individual_csv_filename}")
-        print(f"{'-'*60}")
+    try:
+        while True:
+            # Top up the bounded window from the lazy job stream
+            while not jobs_exhausted and len(in_flight) < DISCOVERY_MAX_IN_FLIGHT:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    jobs_exhausted = True
+                    break
+                in_flight[executor.submit(*job[1:])] = job[0]
+            if not in_flight:
+                break
+
+            done, _ = wait_for_futures(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                search_term, pincode = in_flight.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    # A search that blew up still counts, and is journalled as 'failed'
+                    print(f"❌ Search job '{search_term} {pincode or ''}' crashed: {e}")
+                    outcome = {'search_term': search_term, 'pincode': pincode, 'result_count': 0,
+                               'master_new_count': 0, 'end_reason': None, 'error': str(e),
+                               'searches': 1, 'failed': 1}
+                try:
+                    if tiled:
+                        # Tile searches were checkpointed as they ran
+                        current_search += outcome['searches']
+                        failed_searches += outcome['failed']
+                    else:
+                        current_search += 1
+                        if outcome['error']:
+                            failed_searches += 1
+                        record_discovery_checkpoint(outcome)
+                except Exception as e:
+                    print(f"⚠️  Could not record checkpoint for '{search_term} {pincode}': {e}")
+                term_totals[outcome['search_term']] += outcome['result_count']
+                total_results += outcome['result_count']
+                total_new_results += outcome['master_new_count']
+                print(f"📊 Searches completed: {current_search}/{total_searches} | Results: {total_results} | New unique: {total_new_results} | Failed: {failed_searches} | {rate_limiter.describe()}")
+
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Discovery interrupted by user - waiting for running searches to finish")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        driver_pool.close()
+        if END_OF_RUN_CHROME_SWEEP:
+            sweep_stray_chrome()
 
-        print(f"Completed {search_term_index}/{len(SEARCH_TERMS)} search terms")
+    # Results per search term
+    print(f"\n{'-'*60}")
+    for search_term in SEARCH_TERMS:
+        print(f"'{search_term}': {term_totals[search_term]} results -> {get_individual_csv_filename(search_term)}")
+    print(f"{'-'*60}")
 
     # Final summary - no need to create master CSV as it was built incrementally
     print(f"\n{'='*80}")
     print(f"SEARCH COMPLETED!")
     print(f"{'='*80}")
 
-    # Count total lines in master CSV to show final statistics
-    master_csv_filename = 'stationery_shops_chennai_master.csv'
-    total_unique_results = 0
-    if os.path.exists(master_csv_filename):
-        try:
-            with open(master_csv_filename, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                total_unique_results = sum(1 for row in reader)
-        except Exception as e:
-            print(f"Warning: Could not count master CSV rows: {e}")
+    # Unique places discovered, straight from the dedup index (or the SQLite store)
+    master_csv_filename = MASTER_CSV_FILENAME
+    total_unique_results = count_discovered_places()
 
     print(f"Total searches performed: {current_search}")
+    print(f"Failed searches: {failed_searches}")
     print(f"Total results found: {total_results}")
-    print(f"Total unique results in master CSV: {total_unique_results}")
+    print(f"Total unique results discovered: {total_unique_results}")
     print(f"Total new unique results added: {total_new_results}")
+
+    if STORAGE_BACKEND == 'sqlite':
+        print(f"SQLite store: {STORAGE_DB_FILENAME}")
+        for search_term in SEARCH_TERMS:
+            print(f"  '{search_term}': {count_discovered_places(search_term)} unique places")
+        print(f"Export CSVs with: python storage.py export-discoveries {master_csv_filename}")
+        get_place_store().close()
+        print("="*80)
+        return total_new_results
+
     print(f"Individual CSV files created: {len(SEARCH_TERMS)} files")
     print(f"Master CSV file: {master_csv_filename}")
     print(f"\n📁 Files created:")
@@ -785,13 +1229,7 @@ def scroll_google_maps_multiple_searches():
     for search_term in SEARCH_TERMS:
         individual_csv = get_individual_csv_filename(search_term)
         if os.path.exists(individual_csv):
-            try:
-                with open(individual_csv, 'r', newline='', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    count = sum(1 for row in reader)
-                print(f"  ✅ {individual_csv} ({count} results)")
-            except:
-                print(f"  ✅ {individual_csv}")
+            print(f"  ✅ {individual_csv} ({count_discovered_places(search_term)} unique places)")
 
     print(f"  ✅ {master_csv_filename} ({total_unique_results} unique results)")
     print("="*80)
@@ -0,0 +1,154 @@
+"""
+Adaptive geographic tiling for discovery searches.
+
+A Google Maps results feed stops at roughly 120 places, so one search per
+pincode under-collects dense areas and wastes a full scroll on sparse ones.
+The planner covers the pincode centres with a coarse grid of square viewport
+tiles and searches each tile. A tile whose feed hit the result cap is split
+into four children one zoom level deeper; any other tile (including a sparse
+one) is a leaf and stops there.
+
+The planner only needs a search_tile(tile) callback returning an outcome dict
+with 'result_count' (and optionally 'end_reason'), so it can be driven by the
+browser in Google_Maps.py or by a simulated feed in tests.
+"""
+
+import math
+import os
+from collections import deque
+
+import pandas as pd
+
+from place_urls import decode_place_urls
+
+# Side of a square tile, in degrees, at TILE_SPAN_ZOOM (about 4.4 km in Chennai)
+TILE_SPAN_DEGREES = 0.04
+TILE_SPAN_ZOOM = 15
+
+# Root grid zoom and deepest zoom a tile may be split to
+ROOT_ZOOM = 13
+MAX_ZOOM = 17
+
+# A feed with this many results is treated as truncated by Maps
+TILE_RESULT_CAP = 110
+
+
+def tile_span(zoom):
+    """Tile side in degrees at a zoom level (halves with every zoom step)"""
+    return TILE_SPAN_DEGREES * 2 ** (TILE_SPAN_ZOOM - zoom)
+
+
+def make_tile(row, col, zoom):
+    """
+    Tile at grid cell (row, col) of the given zoom level.
+    Grids are aligned across zooms, so a tile's children are exactly its quarters.
+    """
+    span = tile_span(zoom)
+    return {
+        'row': row,
+        'col': col,
+        'zoom': zoom,
+        'lat': round((row + 0.5) * span, 6),
+        'lng': round((col + 0.5) * span, 6),
+    }
+
+
+def tile_key(tile):
+    """Stable text id for a tile, usable as a checkpoint key"""
+    return f"@{tile['lat']},{tile['lng']},{tile['zoom']}z"
+
+
+def tile_viewport(tile):
+    """(lat, lng, zoom) to centre a Maps search on"""
+    return tile['lat'], tile['lng'], tile['zoom']
+
+
+def tile_bounds(tile):
+    """(south, west, north, east) of a tile"""
+    span = tile_span(tile['zoom'])
+    return tile['row'] * span, tile['col'] * span, (tile['row'] + 1) * span, (tile['col'] + 1) * span
+
+
+def tile_contains(tile, lat, lng):
+    south, west, north, east = tile_bounds(tile)
+    return south <= lat < north and west <= lng < east
+
+
+def split_tile(tile):
+    """The four children of a tile, one zoom level deeper"""
+    row, col, zoom = tile['row'] * 2, tile['col'] * 2, tile['zoom'] + 1
+    return [make_tile(row + dr, col + dc, zoom) for dr in (0, 1) for dc in (0, 1)]
+
+
+def root_tiles(centers, zoom=ROOT_ZOOM):
+    """
+    Grid tiles at `zoom` that contain at least one of the (lat, lng) centers,
+    in row/column order. Nearby pincodes share a root tile instead of each
+    getting its own search.
+    """
+    span = tile_span(zoom)
+    cells = sorted({(math.floor(lat / span), math.floor(lng / span)) for lat, lng in centers})
+    return [make_tile(row, col, zoom) for row, col in cells]
+
+
+def should_split(tile, outcome, result_cap=TILE_RESULT_CAP, max_zoom=MAX_ZOOM):
+    """A tile is split when its feed hit the cap without reaching the end of the list"""
+    if tile['zoom'] >= max_zoom:
+        return False
+    if outcome.get('end_reason') == 'end_of_list':
+        return False
+    return outcome['result_count'] >= result_cap
+
+
+def plan_discovery(roots, search_tile, result_cap=TILE_RESULT_CAP, max_zoom=MAX_ZOOM):
+    """
+    Search the root tiles breadth-first, splitting capped tiles into quarters.
+
+    Returns a summary dict: 'searches' (tiles searched), 'splits', 'capped_leaves'
+    (tiles still capped at max_zoom) and 'tiles', a list of (tile, outcome).
+    """
+    queue = deque(roots)
+    summary = {'searches': 0, 'splits': 0, 'capped_leaves': 0, 'tiles': []}
+
+    while queue:
+        tile = queue.popleft()
+        outcome = search_tile(tile)
+        summary['searches'] += 1
+        summary['tiles'].append((tile, outcome))
+
+        if should_split(tile, outcome, result_cap, max_zoom):
+            summary['splits'] += 1
+            queue.extend(split_tile(tile))
+        elif outcome['result_count'] >= result_cap and outcome.get('end_reason') != 'end_of_list':
+            summary['capped_leaves'] += 1
+
+    return summary
+
+
+def nearest_pincode(tile, pincode_centers):
+    """Pincode whose centre is closest to the tile centre (for the CSV Pincode column)"""
+    return min(
+        pincode_centers,
+        key=lambda pincode: (pincode_centers[pincode][0] - tile['lat']) ** 2
+                            + (pincode_centers[pincode][1] - tile['lng']) ** 2
+    )
+
+
+def pincode_centers_from_csv(csv_filename):
+    """
+    Approximate each pincode's centre as the median coordinates of the places
+    already discovered for it. Returns {pincode: (lat, lng)}, empty when the
+    file does not exist yet.
+    """
+    if not os.path.exists(csv_filename):
+        print(f"Error: {csv_filename} does not exist yet - run a 'flat' discovery first to seed the pincode centres")
+        return {}
+    df = pd.read_csv(csv_filename, dtype=str)
+    if 'URL' not in df.columns or 'Pincode' not in df.columns:
+        print(f"Error: 'URL' and 'Pincode' columns are needed in {csv_filename}")
+        return {}
+
+    decoded = decode_place_urls(df['URL'])
+    coordinates = pd.concat([df['Pincode'], decoded[['Latitude', 'Longitude']]], axis=1).dropna()
+    centers = coordinates.groupby('Pincode')[['Latitude', 'Longitude']].median()
+    return {pincode: (row.Latitude, row.Longitude) for pincode, row in centers.iterrows()}
@@ -0,0 +1,109 @@
+"""
+Pool of long-lived Chrome drivers shared by the worker threads of an executor.
+
+Launching Chrome is the most expensive step per URL, so workers check a driver
+out of the pool, use it for many pages and hand it back instead of creating and
+quitting a browser for every URL.
+"""
+
+import queue
+import threading
+
+
+class DriverPool:
+    """
+    Thread-safe pool of reusable drivers.
+
+    Drivers are created lazily with `driver_factory(slot_id)` and closed with
+    `quit_driver(driver)`. A driver is recycled (quit, then re-created on the
+    next checkout) once it has served `recycle_after_pages` pages, or right
+    after a failed page when `recycle_on_error` is True.
+    """
+
+    def __init__(self, driver_factory, quit_driver, size, recycle_after_pages=50, recycle_on_error=True):
+        self.driver_factory = driver_factory
+        self.quit_driver = quit_driver
+        self.size = size
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_on_error = recycle_on_error
+
+        self._slots = queue.Queue()
+        for slot_id in range(size):
+            self._slots.put({'slot_id': slot_id, 'driver': None, 'pages': 0})
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self.drivers_created = 0
+        self.drivers_recycled = 0
+
+    def checkout(self, timeout=None):
+        """Take a slot from the pool, starting its driver if it has none"""
+        slot = self._slots.get(timeout=timeout)
+        if slot['driver'] is None:
+            try:
+                slot['driver'] = self.driver_factory(slot['slot_id'])
+                slot['pages'] = 0
+                with self._lock:
+                    self.drivers_created += 1
+            except Exception:
+                # Give the empty slot back so another worker can retry
+                self._slots.put(slot)
+                raise
+        return slot
+
+    def checkin(self, slot, failed=False, retire=False):
+        """
+        Return a slot to the pool, recycling its driver if a policy says so.
+        retire=True always drops the driver (e.g. the watchdog killed it).
+        """
+        slot['pages'] += 1
+
+        recycle = self._closed or retire
+        if failed and self.recycle_on_error:
+            recycle = True
+        if self.recycle_after_pages and slot['pages'] >= self.recycle_after_pages:
+            recycle = True
+
+        if recycle:
+            self._retire(slot)
+        self._slots.put(slot)
+
+    def _retire(self, slot):
+        driver = slot['driver']
+        slot['driver'] = None
+        slot['pages'] = 0
+        if driver is not None:
+            with self._lock:
+                self.drivers_recycled += 1
+            try:
+                self.quit_driver(driver)
+            except Exception as e:
+                print(f"Warning: Error quitting pooled driver {slot['slot_id']}: {e}")
+
+    def close(self):
+        """Quit every idle driver; drivers still checked out are quit on checkin"""
+        self._closed = True
+        idle_slots = []
+        while True:
+            try:
+                idle_slots.append(self._slots.get_nowait())
+            except queue.Empty:
+                break
+        for slot in idle_slots:
+            if slot['driver'] is not None:
+                driver = slot['driver']
+                slot['driver'] = None
+                try:
+                    self.quit_driver(driver)
+                except Exception as e:
+                    print(f"Warning: Error quitting pooled driver {slot['slot_id']}: {e}")
+            self._slots.put(slot)
+
+    def stats(self):
+        """Counters for the end-of-run summary"""
+        with self._lock:
+            return {
+                'pool_size': self.size,
+                'drivers_created': self.drivers_created,
+                'drivers_recycled': self.drivers_recycled,
+            }
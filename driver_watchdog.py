@@ -0,0 +1,199 @@
+"""
+Per-URL wall-clock budget for worker drivers, and process-tree cleanup.
+
+A worker registers its driver with Watchdog.watch() before loading a page and
+releases it when the page is done. If the budget runs out first, the watchdog
+thread kills that driver's Chrome and chromedriver process tree. The worker's
+blocked Selenium call then fails at once (the session is gone), so the thread
+returns, the URL goes back to the retry queue and the pool starts a fresh
+driver for the slot. A worker that is still not back after grace_seconds gets
+its driver tree killed again and is reported as stuck.
+"""
+
+import threading
+import time
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    print("psutil not available, hung drivers can only be stopped via chromedriver. Install it with: pip install psutil")
+
+def driver_root_pids(driver):
+    """PIDs of the chromedriver service and (undetected-chromedriver) browser processes"""
+    pids = []
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None) if service else None
+    if process is not None and getattr(process, 'pid', None):
+        pids.append(process.pid)
+    browser_pid = getattr(driver, 'browser_pid', None)
+    if browser_pid and browser_pid not in pids:
+        pids.append(browser_pid)
+    return pids
+
+
+def kill_driver_process_tree(driver):
+    """
+    Kill a driver's chromedriver and Chrome processes, children included.
+    Returns the number of processes killed.
+    """
+    if not PSUTIL_AVAILABLE:
+        # Without psutil only chromedriver itself can be stopped
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        if process is not None and process.poll() is None:
+            process.kill()
+            return 1
+        return 0
+
+    procs = []
+    for pid in driver_root_pids(driver):
+        try:
+            root = psutil.Process(pid)
+            procs.extend(root.children(recursive=True))
+            procs.append(root)
+        except psutil.NoSuchProcess:
+            pass
+    return _kill_processes(procs)
+
+
+def driver_process_records(driver):
+    """
+    (pid, create_time) of a driver's root processes, taken when it starts so they
+    can be found again later without hitting a reused PID. Empty without psutil.
+    """
+    if not PSUTIL_AVAILABLE:
+        return []
+    records = []
+    for pid in driver_root_pids(driver):
+        try:
+            records.append((pid, psutil.Process(pid).create_time()))
+        except psutil.NoSuchProcess:
+            pass
+    return records
+
+
+def kill_recorded_process_trees(records):
+    """
+    Last-resort cleanup: kill whatever still runs of the recorded driver processes
+    (see driver_process_records), children included. Other programs' Chrome and
+    webdriver sessions are never touched. Returns the number killed, or None when
+    psutil is not installed.
+    """
+    if not PSUTIL_AVAILABLE:
+        return None
+    procs = []
+    for pid, create_time in records:
+        try:
+            root = psutil.Process(pid)
+            if root.create_time() != create_time:
+                continue  # The PID now belongs to another process
+            procs.extend(root.children(recursive=True))
+            procs.append(root)
+        except psutil.NoSuchProcess:
+            pass
+    return _kill_processes(procs)
+
+
+def _kill_processes(procs):
+    killed = 0
+    for proc in procs:
+        try:
+            proc.kill()
+            killed += 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    psutil.wait_procs(procs, timeout=5)
+    return killed
+
+
+class Watchdog:
+    """
+    Background thread enforcing a time budget per watched page. A budget of 0
+    or None disables the watchdog (watch() then returns None).
+    """
+
+    def __init__(self, budget_seconds, on_expire=kill_driver_process_tree, grace_seconds=30, check_interval=1.0):
+        self.budget_seconds = budget_seconds
+        self.on_expire = on_expire
+        self.grace_seconds = grace_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._watches = {}
+        self._next_token = 0
+        self._stopped = threading.Event()
+        self.watched = 0
+        self.expired_count = 0
+        self.stuck_count = 0
+        self._thread = None
+        if budget_seconds:
+            self._thread = threading.Thread(target=self._run, name='driver-watchdog', daemon=True)
+            self._thread.start()
+
+    def watch(self, driver, label=''):
+        """Start the budget for one page; returns a token for release()"""
+        if not self._thread:
+            return None
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._watches[token] = {
+                'driver': driver,
+                'label': label,
+                'deadline': time.monotonic() + self.budget_seconds,
+                'expired': False,
+                'stuck': False,
+            }
+            self.watched += 1
+        return token
+
+    def expired(self, token):
+        """True once the watchdog has killed the driver for this token"""
+        with self._lock:
+            watch = self._watches.get(token)
+            return bool(watch and watch['expired'])
+
+    def release(self, token):
+        """Stop watching; returns True when the budget had run out (the driver is dead)"""
+        if token is None:
+            return False
+        with self._lock:
+            watch = self._watches.pop(token, None)
+            return bool(watch and watch['expired'])
+
+    def close(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=self.check_interval * 2)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'watched': self.watched,
+                'expired': self.expired_count,
+                'stuck': self.stuck_count,
+                'active': len(self._watches),
+            }
+
+    def _run(self):
+        while not self._stopped.wait(self.check_interval):
+            now = time.monotonic()
+            to_kill = []
+            with self._lock:
+                for watch in self._watches.values():
+                    if not watch['expired'] and now >= watch['deadline']:
+                        watch['expired'] = True
+                        self.expired_count += 1
+                        to_kill.append((watch, "over budget"))
+                    elif watch['expired'] and not watch['stuck'] and now >= watch['deadline'] + self.grace_seconds:
+                        watch['stuck'] = True
+                        self.stuck_count += 1
+                        to_kill.append((watch, "still stuck after kill"))
+
+            # Kill outside the lock so workers can keep releasing their pages
+            for watch, reason in to_kill:
+                print(f"⏱️  Watchdog: {reason} ({self.budget_seconds}s), killing driver: {watch['label']}")
+                try:
+                    self.on_expire(watch['driver'])
+                except Exception as e:
+                    print(f"⚠️  Watchdog could not kill driver: {e}")
@@ -0,0 +1,67 @@
+"""
+Geo-fence checks for place URLs, run before any browser time is spent on them.
+
+Coordinates come straight from the URL (see place_urls.py). A fence is a dict
+with either a 'center' (lat, lng) and 'radius_km', or a 'polygon' list of
+(lat, lng) vertices, or both (a place must then satisfy both).
+"""
+
+import math
+
+from place_urls import decode_place_url
+
+# Chennai city: centre of the 600001-600118 pincode range with a generous radius
+CHENNAI_GEOFENCE = {'center': (13.0827, 80.2707), 'radius_km': 35}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def point_in_polygon(lat, lng, polygon):
+    """Ray-casting test; polygon is a list of (lat, lng) vertices"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lng_i > lng) != (lng_j > lng):
+            crossing_lat = lat_i + (lng - lng_i) * (lat_j - lat_i) / (lng_j - lng_i)
+            if lat < crossing_lat:
+                inside = not inside
+        j = i
+    return inside
+
+
+def geofence_check(lat, lng, fence):
+    """
+    Returns (inside, distance_km). distance_km is the distance to the fence
+    centre, or None for polygon-only fences.
+    """
+    inside = True
+    distance_km = None
+    if fence.get('center') is not None:
+        distance_km = haversine_km(lat, lng, *fence['center'])
+        inside = distance_km <= fence['radius_km']
+    if inside and fence.get('polygon'):
+        inside = point_in_polygon(lat, lng, fence['polygon'])
+    return inside, distance_km
+
+
+def check_place_url(url, fence):
+    """
+    Decode a place URL and check it against the fence.
+    Returns (inside, latitude, longitude, distance_km); inside is None when the
+    URL carries no coordinates.
+    """
+    decoded = decode_place_url(url)
+    lat, lng = decoded['Latitude'], decoded['Longitude']
+    if lat is None or lng is None:
+        return None, None, None, None
+    inside, distance_km = geofence_check(lat, lng, fence)
+    return inside, lat, lng, distance_km
@@ -0,0 +1,410 @@
+"""
+Selectors and validation rules for the fields of a Google Maps place panel.
+
+Shared by every extraction mode in Extract_Maps.py so that the per-element
+Selenium lookups and the single-round-trip snapshot see the same selectors
+and apply the same validation regexes.
+"""
+
+import re
+
+NAME_XPATHS = [
+    "//h1[contains(@class, 'DUwDvf lfPIob')]",
+]
+
+ADDRESS_XPATHS = [
+    "//div[contains(@class,'rogA2c')]/div[contains(@class,'Io6YTe')]",
+]
+
+WEBSITE_XPATHS = [
+    "//a[contains(@aria-label, 'Website')]",
+]
+
+# Exact XPath selectors based on confirmed HTML structure
+PHONE_XPATHS = [
+    # Most specific - targets the exact phone div structure
+    "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium') and contains(@class, 'kR99db')]",
+
+    # Parent-child relationship targeting phone container
+    "//div[contains(@class, 'rogA2c')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium')]",
+
+    # Class combination for phone text element
+    "//div[contains(@class, 'Io6YTe') and contains(@class, 'kR99db')]",
+
+    # Fallback for tel: links
+    "//a[contains(@href, 'tel:')]"
+]
+
+# Store type/category selectors (prioritized by reliability)
+CATEGORY_SELECTORS = [
+    "//button[contains(@class, 'DkEaL')]",  # Most reliable - confirmed working
+    "//button[contains(@class, 'DkEaL') and contains(@jsaction, 'pane.wfvdle18.category')]",
+    "//button[contains(@jsaction, 'pane.wfvdle18.category')]",
+    "//div[contains(@class, 'fontBodyMedium')]//button[contains(@class, 'DkEaL')]",
+    "//div[contains(@class, 'LBgpqf')]//button[contains(@class, 'DkEaL')]",
+    "//span[contains(@class, 'YhemCb')]",
+    "//div[contains(@class, 'LBgpqf')]//button",
+    "//button[contains(@aria-label, 'Category')]",
+]
+
+# Operating status selectors (prioritized, confirmed working)
+STATUS_SELECTORS = [
+    "//span[contains(@class, 'ZDu9vd')]",  # Most reliable - confirmed working
+    "//div[contains(@class, 'MkV9')]//span[contains(@class, 'ZDu9vd')]",
+    "//span[contains(text(), 'Open') or contains(text(), 'Closed') or contains(text(), 'Closes')]",
+    "//div[contains(@class, 'o0Svhf')]//span",
+    "//span[contains(@class, 'ZDu9vd')]//span",
+    "//div[contains(@aria-expanded, 'true')]//span[contains(@class, 'ZDu9vd')]"
+]
+
+# Today's hours cell in the opening-hours table (first row of the first matching table)
+HOURS_CELL_XPATHS = [
+    "(//table[contains(@class, 'eK4R0e')])[1]//tr[contains(@class, 'y0skZc')][1]//td[contains(@class, 'mxowUb')]",
+    "(//div[contains(@class, 't39EBf')]//table)[1]//tr[contains(@class, 'y0skZc')][1]//td[contains(@class, 'mxowUb')]",
+    "(//table//tr[contains(@class, 'y0skZc')])[1]//td[contains(@class, 'mxowUb')]"
+]
+
+# Rating selectors (prioritized by reliability)
+RATING_SELECTORS = [
+    "//div[contains(@class, 'F7nice')]//span[@aria-hidden='true']",  # Most reliable - confirmed working
+    "//span[contains(@class, 'ceNzKf')]/preceding-sibling::span[@aria-hidden='true']",
+    "//div[contains(@jslog, '76333')]//span[@aria-hidden='true']",
+    "//div[contains(@class, 'F7nice')]//span[1]",
+    "//span[@aria-hidden='true' and string-length(text()) <= 3]",
+    "//div[contains(@class, 'jANrlb')]//div[contains(@class, 'F7nice')]//span"
+]
+
+# Review count selectors (prioritized by reliability)
+REVIEW_SELECTORS = [
+    "//span[contains(@aria-label, 'review')]",  # Most reliable - targets aria-label with "review"
+    "//div[contains(@class, 'F7nice')]//span[contains(@aria-label, 'review')]",  # Within rating section
+    "//span[contains(@aria-label, 'reviews')]",  # Plural form
+    "//span[contains(@aria-label, 'review') and contains(text(), '(')]",  # With parentheses
+    "//div[contains(@jslog, '76333')]//span[contains(@aria-label, 'review')]"  # Within rating container
+]
+
+# Permanently closed indicator
+CLOSED_SELECTORS = [
+    "//span[contains(@class, 'aSftqf') and contains(text(), 'Permanently closed')]",
+    "//div[contains(@class, 'MkV9')]//span[contains(text(), 'Permanently closed')]",
+    "//span[contains(text(), 'Permanently closed')]"
+]
+
+# Every selector list by result field, in the order the extractors try them
+FIELD_SELECTORS = {
+    'name': NAME_XPATHS,
+    'address': ADDRESS_XPATHS,
+    'website': WEBSITE_XPATHS,
+    'phone': PHONE_XPATHS,
+    'store_type': CATEGORY_SELECTORS,
+    'status': STATUS_SELECTORS,
+    'hours': HOURS_CELL_XPATHS,
+    'rating': RATING_SELECTORS,
+    'review_count': REVIEW_SELECTORS,
+    'permanently_closed': CLOSED_SELECTORS,
+}
+
+# Precedence tiers, one per selector in FIELD_SELECTORS. The selectors of one tier
+# are equivalent and may be reordered by their recorded payoff (selector_stats.py);
+# tiers always run in this order, so precise selectors stay ahead of broad fallbacks
+# such as the generic rogA2c phone row or the short aria-hidden rating span.
+SELECTOR_TIERS = {
+    'name': [0],
+    'address': [0],
+    'website': [0],
+    'phone': [0, 1, 2, 2],
+    'store_type': [0, 1, 1, 1, 1, 2, 3, 3],
+    'status': [0, 1, 2, 3, 3, 3],
+    'hours': [0, 1, 2],
+    'rating': [0, 1, 1, 1, 2, 3],
+    'review_count': [0, 1, 1, 1, 1],
+    'permanently_closed': [0, 0, 1],
+}
+
+# Cheap CSS markers for each panel section (data-item-id info rows, the F7nice
+# rating block, the hours block). The presence probe counts these together with
+# every field selector in one call, so extractors for absent sections are skipped.
+SECTION_MARKERS = {
+    'address': ["[data-item-id='address']"],
+    'website': ["[data-item-id='authority']"],
+    'phone': ["[data-item-id^='phone']", "a[href^='tel:']"],
+    'rating': ["div.F7nice"],
+    'review_count': ["div.F7nice span[aria-label]"],
+    'status': ["span.ZDu9vd", "div.o0Svhf", "div.t39EBf"],
+    'hours': ["table.eK4R0e", "div.t39EBf table"],
+}
+
+# Phone number regex patterns for Indian numbers
+PHONE_PATTERNS = [
+    r'\+91[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # +91 format with spaces
+    r'0\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # 0 prefix format (like 044 2522 2944)
+    r'\d{3}[-.\s]?\d{4}[-.\s]?\d{4}',  # 3-4-4 format
+    r'\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # General landline format
+    r'[6-9]\d{9}',  # 10-digit mobile format
+    r'\+91[-.\s]?[6-9]\d{9}'  # +91 mobile format
+]
+
+# Filter out common non-category buttons
+# IMPORTANT: "book" should NOT be in excluded_terms as "Book store" is a valid category
+EXCLUDED_CATEGORY_TERMS = ['directions', 'save', 'share', 'nearby', 'call', 'website', 'menu', 'order']
+
+
+def phone_candidate_text(xpath, text, href):
+    """Text to validate for a phone candidate: the tel: href for links, the visible text otherwise"""
+    if "tel:" in xpath:
+        if href and href.startswith("tel:"):
+            return href.replace("tel:", "").strip()
+        return href
+    return text
+
+
+def parse_phone_text(phone_text):
+    """Return the cleaned phone number found in the text, or None"""
+    if not phone_text:
+        return None
+
+    for pattern in PHONE_PATTERNS:
+        phone_matches = re.findall(pattern, phone_text)
+        if phone_matches:
+            phone_number = phone_matches[0]
+            # Clean the phone number (keep digits and + only)
+            cleaned_number = ''.join(c for c in phone_number if c.isdigit() or c == '+')
+
+            # Validate length (Indian numbers: 10-13 digits)
+            digit_count = len(re.findall(r'\d', cleaned_number))
+            if 10 <= digit_count <= 13:
+                return cleaned_number
+    return None
+
+
+def is_store_type_text(category_text):
+    """True if the text looks like a business category rather than an action button"""
+    if not category_text:
+        return False
+    return not any(term in category_text.lower() for term in EXCLUDED_CATEGORY_TERMS)
+
+
+def parse_status_text(status_text):
+    """
+    Parse an operating status line such as "Open ⋅ Closes 9 pm".
+
+    Returns (status, operating_hours), or None if the text is not a status line.
+    If operating hours exist the business is operational (status "Open"); only
+    "Closed" without an opening time is reported as "Closed".
+    """
+    if not status_text or not any(keyword in status_text.lower() for keyword in ['open', 'closed', 'closes', 'opens']):
+        return None
+
+    status_text_lower = status_text.lower()
+    operating_hours = "Not Found"
+
+    # Handle "Closed ⋅ Opens 8 am" format - business is OPEN (has operating hours)
+    if "closed" in status_text_lower and "opens" in status_text_lower:
+        opens_patterns = [
+            r'opens\s+(.+?)(?:\s+\w{3})?$',  # "Opens 8 am Tue" -> "8 am"
+            r'opens\s+(.+)',  # General opens pattern
+        ]
+        for pattern in opens_patterns:
+            opens_match = re.search(pattern, status_text, re.IGNORECASE)
+            if opens_match:
+                time_part = opens_match.group(1).strip()
+                # Remove day abbreviations (Mon, Tue, etc.)
+                time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
+                operating_hours = f"Opens {time_part}"
+                break
+        return "Open", operating_hours
+
+    # Handle "Open ⋅ Closes 9 pm" format - business is OPEN
+    if "open" in status_text_lower and "closes" in status_text_lower:
+        status = "Open now" if "open now" in status_text_lower else "Open"
+        closes_patterns = [
+            r'closes\s+(.+?)(?:\s+\w{3})?$',  # "Closes 9 pm" -> "9 pm"
+            r'closes\s+(.+)',  # General closes pattern
+        ]
+        for pattern in closes_patterns:
+            closes_match = re.search(pattern, status_text, re.IGNORECASE)
+            if closes_match:
+                time_part = closes_match.group(1).strip()
+                # Remove day abbreviations
+                time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
+                operating_hours = f"Closes {time_part}"
+                break
+        return status, operating_hours
+
+    # Handle simple "Open now" or "Open" status
+    if "open now" in status_text_lower:
+        return "Open now", operating_hours
+    if "open" in status_text_lower:
+        return "Open", operating_hours
+
+    # Only set to "Closed" if no operating hours are found
+    if "closed" in status_text_lower and "opens" not in status_text_lower:
+        return "Closed", operating_hours
+
+    return None
+
+
+def parse_hours_text(hours_text):
+    """Return today's hours from the hours table cell (e.g. "9 am–9 pm"), or None"""
+    if hours_text and ("–" in hours_text or "-" in hours_text):
+        return hours_text
+    return None
+
+
+def parse_rating_text(rating_text):
+    """Return the rating if the text is a valid 0-5 rating, or None"""
+    if not rating_text:
+        return None
+
+    # Validate that it's a numeric rating
+    if rating_text.replace('.', '').replace(',', '').isdigit():
+        try:
+            rating_value = float(rating_text.replace(',', '.'))
+            if 0 <= rating_value <= 5:  # Valid rating range
+                return rating_text
+        except ValueError:
+            return None
+
+    # Also check for patterns like "4.5" or "5.0"
+    rating_match = re.search(r'^([0-5](?:\.[0-9])?)$', rating_text)
+    if rating_match:
+        return rating_match.group(1)
+    return None
+
+
+def parse_review_count(aria_label, review_text):
+    """Return the review count from an aria-label like "40 reviews" or text like "(40)", or None"""
+    if aria_label:
+        review_match = re.search(r'(\d+)\s+reviews?', aria_label)
+        if review_match and review_match.group(1).isdigit():
+            return review_match.group(1)
+
+    if review_text:
+        text_match = re.search(r'\((\d+)\)', review_text)
+        if text_match and text_match.group(1).isdigit():
+            return text_match.group(1)
+    return None
+
+
+def is_permanently_closed_text(text):
+    return bool(text) and "Permanently closed" in text
+
+
+def _candidates(raw, field):
+    """Yield (xpath, candidate) pairs for a field of a raw snapshot in selector order"""
+    for xpath, candidates in zip(FIELD_SELECTORS[field], raw.get(field) or []):
+        for candidate in candidates or []:
+            yield xpath, candidate
+
+
+def _first_text(raw, field):
+    for _, candidate in _candidates(raw, field):
+        return candidate.get('text')
+    return None
+
+
+def build_place_result(raw):
+    """
+    Build the result fields from a raw snapshot.
+
+    `raw` maps each FIELD_SELECTORS key to one list per selector of candidate
+    dicts with 'text', 'href' and 'aria' values. Returns the same fields (except
+    URL and coordinates) that the Selenium extractors produce.
+    """
+    name = _first_text(raw, 'name')
+    name = name.strip() if name else "Name Not Found"
+
+    address = _first_text(raw, 'address')
+    if address is None:
+        address = "Not Found"
+
+    website = "Not Found"
+    for _, candidate in _candidates(raw, 'website'):
+        website = candidate.get('href')
+        break
+
+    phone = "Phone Number Not Found"
+    for xpath, candidate in _candidates(raw, 'phone'):
+        number = parse_phone_text(phone_candidate_text(xpath, candidate.get('text'), candidate.get('href')))
+        if number:
+            phone = number
+            break
+
+    store_type = "Not Found"
+    for _, candidate in _candidates(raw, 'store_type'):
+        if is_store_type_text(candidate.get('text')):
+            store_type = candidate['text']
+            break
+
+    operating_status, operating_hours = "Not Found", "Not Found"
+    for _, candidate in _candidates(raw, 'status'):
+        parsed = parse_status_text(candidate.get('text'))
+        if parsed:
+            operating_status, operating_hours = parsed
+            break
+    else:
+        for _, candidate in _candidates(raw, 'hours'):
+            hours = parse_hours_text(candidate.get('text'))
+            if hours:
+                operating_hours = hours
+                break
+
+    rating = "Not Found"
+    for _, candidate in _candidates(raw, 'rating'):
+        parsed = parse_rating_text(candidate.get('text'))
+        if parsed:
+            rating = parsed
+            break
+
+    review_count = "Not Found"
+    for _, candidate in _candidates(raw, 'review_count'):
+        parsed = parse_review_count(candidate.get('aria'), candidate.get('text'))
+        if parsed:
+            review_count = parsed
+            break
+
+    permanently_closed = "No"
+    for _, candidate in _candidates(raw, 'permanently_closed'):
+        if is_permanently_closed_text(candidate.get('text')):
+            permanently_closed = "Yes"
+            break
+
+    return {
+        'Name': name,
+        'Address': address,
+        'Website': website,
+        'Phone': phone,
+        'Store_Type': store_type,
+        'Operating_Status': operating_status,
+        'Operating_Hours': operating_hours,
+        'Rating': rating,
+        'Review_Count': review_count,
+        'Permanently_Closed': permanently_closed,
+    }
+
+
+def probed_selectors(probe, field):
+    """
+    Selectors worth trying for a field given a presence probe
+    ({'selectors': {field: [hit per selector]}, 'markers': {field: hit}}):
+    the selectors that matched, in their usual order; the whole list when only a
+    section marker matched (content may still be rendering) or without a probe;
+    and an empty list when the section is absent.
+    """
+    selectors = FIELD_SELECTORS[field]
+    if not probe:
+        return selectors
+    hits = (probe.get('selectors') or {}).get(field) or []
+    matched = [selector for selector, hit in zip(selectors, hits) if hit]
+    if matched:
+        return matched
+    if (probe.get('markers') or {}).get(field):
+        return selectors
+    return []
+
+
+def absent_fields(probe):
+    """Fields whose section the probe found nowhere on the page"""
+    if not probe:
+        return []
+    return [field for field in FIELD_SELECTORS if not probed_selectors(probe, field)]
@@ -0,0 +1,83 @@
+"""
+Offline parser for captured Google Maps place panels.
+
+Runs the selector lists from place_fields.py against stored HTML with lxml and
+produces the same raw snapshot as the in-browser snapshot extractor, so a page
+can be parsed in a worker process (or re-parsed later after a selector fix)
+without holding a browser.
+"""
+
+import hashlib
+import os
+
+from place_fields import FIELD_SELECTORS, build_place_result
+
+try:
+    from lxml import html as lxml_html
+    from lxml.etree import XPathError
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    print("lxml not available. Install it with: pip install lxml")
+
+# First line of every stored page, so the source URL travels with the HTML
+URL_MARKER = "<!-- xtract-url: "
+
+
+def snapshot_from_html(page_html, limit=25):
+    """Evaluate every selector list against the HTML, mirroring the browser snapshot"""
+    tree = lxml_html.fromstring(page_html)
+    snapshot = {}
+    for field, selectors in FIELD_SELECTORS.items():
+        snapshot[field] = []
+        for xpath in selectors:
+            candidates = []
+            try:
+                for element in tree.xpath(xpath)[:limit]:
+                    if not hasattr(element, 'text_content'):
+                        continue
+                    candidates.append({
+                        'text': ' '.join(element.text_content().split()),
+                        'href': element.get('href'),
+                        'aria': element.get('aria-label'),
+                    })
+            except XPathError:
+                pass
+            snapshot[field].append(candidates)
+    return snapshot
+
+
+def parse_place_html(page_html):
+    """Parse one captured place panel into result fields (without URL and coordinates)"""
+    return build_place_result(snapshot_from_html(page_html))
+
+
+def stored_html_filename(url, html_dir):
+    return os.path.join(html_dir, hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + ".html")
+
+
+def save_place_html(url, page_html, html_dir):
+    """Store a captured panel so it can be re-parsed later; returns the file path"""
+    os.makedirs(html_dir, exist_ok=True)
+    path = stored_html_filename(url, html_dir)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f"{URL_MARKER}{url} -->\n")
+        file.write(page_html)
+    return path
+
+
+def load_place_html(path):
+    """Read a stored panel; returns (url, html)"""
+    with open(path, 'r', encoding='utf-8') as file:
+        first_line = file.readline()
+        page_html = file.read()
+    url = None
+    if first_line.startswith(URL_MARKER):
+        url = first_line[len(URL_MARKER):].rsplit(" -->", 1)[0]
+    return url, page_html
+
+
+def parse_stored_page(path):
+    """Process-pool entry point for re-parsing: returns (url, fields)"""
+    url, page_html = load_place_html(path)
+    return url, parse_place_html(page_html)
@@ -0,0 +1,183 @@
+"""
+Browser-free decoder for Google Maps place URLs.
+
+The place URLs collected by Google_Maps.py already carry most of a place's
+identity in their data= segment:
+
+    /maps/place/<name>/data=!4m7!3m6!1s<feature id>!8m2!3d<lat>!4d<lng>!16s%2Fg%2F<kg id>!19s<place id>
+
+decode_place_urls() turns a whole URL column into typed columns in one
+vectorised pass, so dedupe, geo-filtering and "lite" records need no browser.
+"""
+
+import os
+import re
+import sys
+from urllib.parse import unquote, unquote_plus
+
+import pandas as pd
+
+# Columns produced by the decoder, in order
+DECODED_COLUMNS = ['Name', 'Feature_ID', 'Place_ID', 'KG_ID', 'Latitude', 'Longitude']
+
+# One pattern for every field. Maps writes the data= fields in ascending field
+# number (1s, 3d, 4d, 16s, 19s), so each optional group scans forward from the last.
+PLACE_URL_PATTERN = re.compile(
+    r'^(?:.*?/maps/place/(?P<Name>[^/?#]+))?'
+    r'(?:.*?!1s(?P<Feature_ID>0x[0-9a-fA-F]+:0x[0-9a-fA-F]+))?'
+    r'(?:.*?!3d(?P<Latitude>-?\d+(?:\.\d+)?))?'
+    r'(?:.*?!4d(?P<Longitude>-?\d+(?:\.\d+)?))?'
+    r'(?:.*?!16s(?P<KG_ID>%2F[gm]%2F[^!?&#/]+))?'
+    r'(?:.*?!19s(?P<Place_ID>ChIJ[^!?&#/]+))?'
+)
+
+
+def decode_place_url(url):
+    """
+    Decode a single place URL.
+
+    Returns a dict with the DECODED_COLUMNS keys; missing parts are None and
+    coordinates are floats.
+    """
+    decoded = dict.fromkeys(DECODED_COLUMNS)
+    if not isinstance(url, str):
+        return decoded
+
+    match = PLACE_URL_PATTERN.match(url)
+    decoded.update(match.groupdict())
+    if decoded['Name']:
+        decoded['Name'] = unquote_plus(decoded['Name'])
+    if decoded['KG_ID']:
+        decoded['KG_ID'] = unquote(decoded['KG_ID'])
+    if decoded['Feature_ID']:
+        decoded['Feature_ID'] = decoded['Feature_ID'].lower()
+    for column in ['Latitude', 'Longitude']:
+        if decoded[column] is not None:
+            decoded[column] = float(decoded[column])
+    return decoded
+
+
+def canonical_place_key(url):
+    """
+    Stable identity for a place URL: the feature ID (0x...:0x...), else the
+    ChIJ place ID, else the URL without its query string. URLs that differ only
+    in slug, authuser or rclk map to the same key.
+    """
+    if not isinstance(url, str):
+        return None
+    match = PLACE_URL_PATTERN.match(url)
+    if match.group('Feature_ID'):
+        return match.group('Feature_ID').lower()
+    if match.group('Place_ID'):
+        return match.group('Place_ID')
+    return url.split('?', 1)[0].strip()
+
+
+def place_key_aliases(url):
+    """
+    Every identity key a place URL carries: its feature ID and its ChIJ place ID.
+    URLs with neither fall back to the URL without its query string.
+    """
+    if not isinstance(url, str):
+        return []
+    match = PLACE_URL_PATTERN.match(url)
+    aliases = []
+    if match.group('Feature_ID'):
+        aliases.append(match.group('Feature_ID').lower())
+    if match.group('Place_ID'):
+        aliases.append(match.group('Place_ID'))
+    return aliases or [url.split('?', 1)[0].strip()]
+
+
+class PlaceIndex:
+    """
+    Set of places keyed by URL, where two URLs are the same place when they share
+    any identity key. A URL carrying only a place ID still matches a stored URL
+    that had both IDs. Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, urls=()):
+        self._places = {}  # alias -> place number
+        self._count = 0
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url):
+        return any(alias in self._places for alias in place_key_aliases(url))
+
+    def __len__(self):
+        return self._count
+
+    def add(self, url):
+        """Record a URL's place; returns True if the place was not known yet"""
+        aliases = place_key_aliases(url)
+        if not aliases:
+            return False
+        known = [self._places[alias] for alias in aliases if alias in self._places]
+        if known:
+            # Remember any new alias so later URLs carrying only that alias match too
+            for alias in aliases:
+                self._places.setdefault(alias, known[0])
+            return False
+        self._count += 1
+        for alias in aliases:
+            self._places[alias] = self._count
+        return True
+
+    def clear(self):
+        self._places.clear()
+        self._count = 0
+
+
+def decode_place_urls(urls):
+    """
+    Decode a column of place URLs into a DataFrame with the DECODED_COLUMNS,
+    aligned with the input index. Coordinates are float columns (NaN when missing).
+    """
+    urls = pd.Series(urls, dtype='object')
+    match = PLACE_URL_PATTERN.match
+    empty = (None,) * PLACE_URL_PATTERN.groups
+    # A plain comprehension over the compiled pattern is ~2x faster than Series.str.extract
+    rows = [match(url).groups() if isinstance(url, str) else empty for url in urls]
+    decoded = pd.DataFrame(rows, columns=list(PLACE_URL_PATTERN.groupindex), index=urls.index)
+    decoded = decoded[DECODED_COLUMNS]
+
+    # Decode only the distinct values; names and KG ids repeat across searches
+    decoded['Name'] = decoded['Name'].map(_unique_decoder(decoded['Name'], unquote_plus))
+    decoded['KG_ID'] = decoded['KG_ID'].map(_unique_decoder(decoded['KG_ID'], unquote))
+    decoded['Feature_ID'] = decoded['Feature_ID'].str.lower()
+    decoded['Latitude'] = pd.to_numeric(decoded['Latitude'])
+    decoded['Longitude'] = pd.to_numeric(decoded['Longitude'])
+    return decoded
+
+
+def _unique_decoder(column, decode):
+    return {value: decode(value) for value in column.dropna().unique()}
+
+
+def build_lite_records(input_filename, output_filename):
+    """
+    Write one "lite" record per distinct place (search context plus decoded
+    name, ids and coordinates) without opening a browser
+    """
+    df = pd.read_csv(input_filename, dtype=str)
+    if 'URL' not in df.columns:
+        print(f"Error: 'URL' column not found in {input_filename}")
+        return 0
+
+    decoded = decode_place_urls(df['URL'])
+    lite = pd.concat([df, decoded], axis=1)
+
+    # Same place found through several searches: keep the first discovery
+    index = PlaceIndex()
+    lite = lite[[index.add(url) for url in lite['URL']]]
+
+    lite.to_csv(output_filename, index=False)
+    print(f"✅ Wrote {len(lite)} lite records ({len(df) - len(lite)} duplicates dropped) to {output_filename}")
+    return len(lite)
+
+
+if __name__ == "__main__":
+    input_filename = sys.argv[1] if len(sys.argv) > 1 else 'stationery_shops_chennai_master.csv'
+    output_filename = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(input_filename)[0] + '_lite.csv'
+    build_lite_records(input_filename, output_filename)
@@ -0,0 +1,199 @@
+"""
+Polite request pacing shared by all worker threads, and optionally by several
+processes (e.g. Google_Maps.py discovery and Extract_Maps.py extraction running
+side by side).
+
+RateLimiter is a token bucket: tokens refill at the current rate and every
+request start takes one. The rate adapts AIMD-style: each successful page adds
+`increase_per_success` requests/minute (up to max_rate) and each error or timeout
+multiplies it by `decrease_factor` (down to min_rate). With a state_file, the
+bucket and the current rate live in that JSON file, guarded by an OS file lock,
+so every process of the same `workload` draws from the same budget. Each
+workload (e.g. 'discovery', 'extraction') keeps its own rate and bucket in the
+file, and a persisted rate is always clamped to the reader's own bounds. A rate
+not touched for `stale_after` seconds is left over from an earlier run and
+restarts at the initial rate.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    import msvcrt
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter with adaptive rate. A rate of 0 or None disables limiting.
+    """
+
+    def __init__(self, rate_per_minute, burst=1, min_rate=None, max_rate=None,
+                 increase_per_success=0.5, decrease_factor=0.5, state_file=None, workload='default',
+                 stale_after=600):
+        self.enabled = bool(rate_per_minute)
+        self.initial_rate = float(rate_per_minute or 0)
+        self.burst = burst
+        self.min_rate = float(min_rate) if min_rate else self.initial_rate / 4
+        self.max_rate = float(max_rate) if max_rate else self.initial_rate * 2
+        self.increase_per_success = increase_per_success
+        self.decrease_factor = decrease_factor
+        self.state_file = state_file
+        self.workload = workload
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._state = None
+        self._recent = collections.deque()  # This process's request start times (last minute)
+        self.successes = 0
+        self.failures = 0
+
+    # Shared state
+
+    def _new_state(self):
+        return {'rate': self.initial_rate, 'tokens': float(self.burst), 'updated': time.time()}
+
+    def _checked_state(self, state):
+        """This workload's state, reset when stale and with its rate clamped to our bounds"""
+        if (not isinstance(state, dict) or 'rate' not in state
+                or time.time() - state.get('updated', 0) > self.stale_after):
+            return self._new_state()
+        state['rate'] = min(self.max_rate, max(self.min_rate, float(state['rate'])))
+        return state
+
+    def _update_state(self, update):
+        """Run update(state) under the thread lock (and the file lock when shared)"""
+        with self._lock:
+            if not self.state_file:
+                self._state = self._checked_state(self._state)
+                return update(self._state)
+
+            with open(self.state_file + '.lock', 'a+') as lock_file:
+                _lock_file(lock_file)
+                try:
+                    try:
+                        with open(self.state_file, 'r', encoding='utf-8') as file:
+                            workloads = json.load(file)
+                    except (OSError, ValueError):
+                        workloads = {}
+                    if not isinstance(workloads, dict) or 'rate' in workloads:
+                        workloads = {}  # Unreadable or old single-workload layout
+                    state = self._checked_state(workloads.get(self.workload))
+                    workloads[self.workload] = state
+                    result = update(state)
+                    temp_filename = f"{self.state_file}.{os.getpid()}.tmp"
+                    with open(temp_filename, 'w', encoding='utf-8') as file:
+                        json.dump(workloads, file)
+                    os.replace(temp_filename, self.state_file)
+                    return result
+                finally:
+                    _unlock_file(lock_file)
+
+    def _refill(self, state, now):
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(float(self.burst), state['tokens'] + elapsed * state['rate'] / 60.0)
+        state['updated'] = now
+
+    # Pacing
+
+    def acquire(self):
+        """Block until the caller may start its next request"""
+        if not self.enabled:
+            return
+
+        def take_token(state):
+            # _checked_state already clamped the shared rate to this limiter's bounds
+            self._refill(state, time.time())
+            if state['tokens'] >= 1:
+                state['tokens'] -= 1
+                return 0.0
+            # Time until one whole token has refilled
+            return (1 - state['tokens']) * 60.0 / state['rate']
+
+        while True:
+            wait = self._update_state(take_token)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+
+        with self._lock:
+            now = time.monotonic()
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+
+    def record_success(self):
+        """A page loaded fine: raise the shared rate a little"""
+        self.successes += 1
+        if not self.enabled:
+            return
+
+        def increase(state):
+            state['rate'] = min(self.max_rate, state['rate'] + self.increase_per_success)
+
+        self._update_state(increase)
+
+    def record_failure(self):
+        """An error or timeout: cut the shared rate"""
+        self.failures += 1
+        if not self.enabled:
+            return
+
+        def decrease(state):
+            self._refill(state, time.time())
+            state['rate'] = max(self.min_rate, state['rate'] * self.decrease_factor)
+
+        self._update_state(decrease)
+
+    # Visibility
+
+    def current_rate(self):
+        """Current allowed rate in requests/minute (shared across processes with a state_file)"""
+        if not self.enabled:
+            return None
+        return self._update_state(lambda state: state['rate'])
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            recent = sum(1 for started in self._recent if now - started <= 60)
+        return {
+            'rate_per_minute': self.current_rate(),
+            'requests_last_minute': recent,
+            'successes': self.successes,
+            'failures': self.failures,
+        }
+
+    def describe(self):
+        """One-line throughput summary for progress output"""
+        stats = self.stats()
+        if stats['rate_per_minute'] is None:
+            return f"rate: unlimited | last min: {stats['requests_last_minute']}"
+        return (f"rate: {stats['rate_per_minute']:.1f}/min | last min: {stats['requests_last_minute']} "
+                f"| ok/failed: {stats['successes']}/{stats['failures']}")
+
+
+def _lock_file(lock_file):
+    if FCNTL_AVAILABLE:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.05)
+
+
+def _unlock_file(lock_file):
+    if FCNTL_AVAILABLE:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,162 @@
+"""
+Batched asynchronous result writer.
+
+Workers hand finished rows to ResultWriter.submit(), which only puts them on a
+queue and never touches the disk. A single writer thread collects rows into
+batches and writes a batch when it reaches batch_size rows or when its oldest
+row has waited flush_interval seconds. close() drains everything still queued.
+
+Durability (fsync_policy):
+    'batch'    every written batch is flushed and fsynced before the next one is
+               collected: a crash loses at most the rows still queued or batching
+    'interval' batches are flushed to the OS immediately and fsynced at most every
+               fsync_interval seconds: a power loss can also drop the last interval
+    'none'     batches are flushed to the OS only; the OS decides when data hits disk
+A row counts as saved once its batch is written: submit() returns a Future that
+resolves then, or raises the sink's error if the batch could not be written.
+Rows lost in a crash were never written, so the resume index re-processes them
+on the next run.
+"""
+
+import csv
+import os
+import queue
+from concurrent.futures import Future
+import threading
+import time
+
+FSYNC_POLICIES = ('batch', 'interval', 'none')
+
+# Queue marker asking the writer thread to drain and stop
+_STOP = object()
+
+
+class CsvSink:
+    """Appends rows to one CSV file that stays open for the writer's lifetime"""
+
+    def __init__(self, csv_filename, fieldnames, write_header=False):
+        self.csv_filename = csv_filename
+        self._file = open(csv_filename, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def fsync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class StoreSink:
+    """Upserts rows into a storage.PlaceStore, one transaction per batch"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def write(self, rows):
+        self.store.upsert_places(rows)
+
+    def fsync(self):
+        # Each batch is its own committed transaction; SQLite syncs on commit
+        pass
+
+    def close(self):
+        self.store.flush()
+
+
+class ResultWriter:
+    """Single background thread that batches and writes rows for many workers"""
+
+    def __init__(self, sink, batch_size=25, flush_interval=2.0, fsync_policy='batch', fsync_interval=10.0):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}, got {fsync_policy!r}")
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.rows_written = 0
+        self.batches_written = 0
+        self.fsyncs = 0
+        self.failed_rows = 0
+        self._queue = queue.Queue()
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """Queue a row for writing; never blocks on file I/O. Returns a Future for the write."""
+        written = Future()
+        self._queue.put((row, written))
+        return written
+
+    def close(self, timeout=None):
+        """Write everything still queued, fsync, and stop the writer thread"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self.sink.close()
+
+    def stats(self):
+        return {
+            'rows_written': self.rows_written,
+            'batches_written': self.batches_written,
+            'fsyncs': self.fsyncs,
+            'failed_rows': self.failed_rows,
+            'queued': self._queue.qsize(),
+        }
+
+    def _run(self):
+        batch = []
+        batch_started = None
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(0.0, batch_started + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch, final=True)
+                return
+            if item is not None:
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() - batch_started >= self.flush_interval):
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch, final=False):
+        """Write (row, future) pairs and resolve each future with the outcome"""
+        if batch:
+            try:
+                self.sink.write([row for row, _ in batch])
+                self.rows_written += len(batch)
+                self.batches_written += 1
+            except Exception as e:
+                self.failed_rows += len(batch)
+                print(f"❌ Result writer failed to write {len(batch)} rows: {e}")
+                for _, written in batch:
+                    written.set_exception(e)
+                return
+
+        due = time.monotonic() - self._last_fsync >= self.fsync_interval
+        if (batch and self.fsync_policy == 'batch') or (self.fsync_policy == 'interval' and (due or final)):
+            try:
+                self.sink.fsync()
+                self.fsyncs += 1
+                self._last_fsync = time.monotonic()
+            except OSError as e:
+                print(f"⚠️  Result writer fsync failed: {e}")
+
+        # Confirmed after the policy's fsync, so 'batch' confirms rows that are on disk
+        for _, written in batch:
+            written.set_result(True)
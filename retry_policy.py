@@ -0,0 +1,138 @@
+"""
+Failure classification and retry scheduling for place extraction.
+
+A failed page is not written to the output. It is classified, recorded in the
+error store, and re-queued with exponential backoff until it either succeeds
+or runs out of attempts. Only the final outcome reaches the main output.
+
+Failure classes:
+    driver_crash  Chrome or chromedriver died or the session is gone
+    timeout       the page or an element wait ran out of time
+    navigation    Chrome reported a load/navigation error (net::ERR_..., renderer)
+    empty_panel   the page loaded but the place panel had no usable fields
+    write_error   the result writer could not write the row (the page is scraped again)
+    unknown       anything else (still retried)
+"""
+
+import csv
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, InvalidSessionIdException, NoSuchWindowException
+)
+
+DRIVER_CRASH = 'driver_crash'
+TIMEOUT = 'timeout'
+NAVIGATION = 'navigation'
+EMPTY_PANEL = 'empty_panel'
+WRITE_ERROR = 'write_error'
+UNKNOWN = 'unknown'
+
+ERROR_FIELDNAMES = ['URL', 'Attempt', 'Error_Class', 'Error', 'Final', 'Timestamp']
+
+# Message fragments that mean the browser or its session is gone
+DRIVER_CRASH_MARKERS = (
+    'invalid session id', 'session deleted', 'chrome not reachable', 'disconnected',
+    'no such window', 'target window already closed', 'failed to establish a new connection',
+    'connection refused', 'max retries exceeded', 'remote end closed connection',
+)
+NAVIGATION_MARKERS = ('net::err_', 'unknown error', 'cannot navigate', 'renderer')
+
+# Detail fields that are all missing when the place panel never rendered
+PANEL_FIELDS = ('Address', 'Website', 'Phone', 'Store_Type', 'Rating', 'Review_Count')
+MISSING_VALUES = ('', 'Not Found', 'Name Not Found', 'Phone Number Not Found', None)
+
+
+def is_empty_panel(result):
+    """True when a scraped result has no name and none of the panel fields"""
+    if result.get('Name') not in MISSING_VALUES:
+        return False
+    return all(result.get(field) in MISSING_VALUES for field in PANEL_FIELDS)
+
+
+def classify_failure(error):
+    """Failure class for an exception raised while scraping a page"""
+    message = str(error).lower()
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return DRIVER_CRASH
+    if isinstance(error, (ConnectionError, OSError)) or any(marker in message for marker in DRIVER_CRASH_MARKERS):
+        return DRIVER_CRASH
+    if isinstance(error, TimeoutException) or 'timed out' in message or 'timeout' in message:
+        return TIMEOUT
+    if isinstance(error, WebDriverException) or any(marker in message for marker in NAVIGATION_MARKERS):
+        return NAVIGATION
+    return UNKNOWN
+
+
+def backoff_delay(attempt, base=5.0, cap=120.0, jitter=0.25):
+    """
+    Seconds to wait before `attempt` (2 for the first retry): base * 2^(attempt-2),
+    capped, with +/- jitter so retries from several workers spread out
+    """
+    delay = min(cap, base * (2 ** max(0, attempt - 2)))
+    if jitter:
+        delay *= random.uniform(1 - jitter, 1 + jitter)
+    return delay
+
+
+class RetryQueue:
+    """URLs waiting for their next attempt, ordered by when they become ready"""
+
+    def __init__(self):
+        self._heap = []
+        self._order = itertools.count()
+
+    def schedule(self, delay, url, index, attempt):
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._order), url, index, attempt))
+
+    def pop_ready(self):
+        """(url, index, attempt) of the earliest ready retry, or None"""
+        if self._heap and self._heap[0][0] <= time.monotonic():
+            _, _, url, index, attempt = heapq.heappop(self._heap)
+            return url, index, attempt
+        return None
+
+    def next_ready_in(self):
+        """Seconds until the earliest retry is ready (None when empty)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class ErrorStore:
+    """Append-only CSV of every failed attempt, kept apart from the main output"""
+
+    def __init__(self, csv_filename):
+        self.csv_filename = csv_filename
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, url, attempt, error_class, error, final=False):
+        with self._lock:
+            self.counts[error_class] = self.counts.get(error_class, 0) + 1
+            write_header = not os.path.exists(self.csv_filename)
+            with open(self.csv_filename, 'a', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=ERROR_FIELDNAMES)
+                if write_header:
+                    writer.writeheader()
+                writer.writerow({
+                    'URL': url,
+                    'Attempt': attempt,
+                    'Error_Class': error_class,
+                    'Error': str(error)[:500],
+                    'Final': 'Yes' if final else 'No',
+                    'Timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                })
+
+    def describe(self):
+        if not self.counts:
+            return "none"
+        return ', '.join(f"{error_class}: {count}" for error_class, count in sorted(self.counts.items()))
@@ -0,0 +1,175 @@
+"""
+Per-selector hit statistics for the place field extractors.
+
+Every selector an extractor tries is recorded as a hit (it produced a valid
+value) or a miss, with how long the attempt took. The stats are kept in a JSON
+file between runs and used to try selectors in order of expected payoff:
+
+    payoff = smoothed hit rate / max(mean latency, MIN_COST)
+
+which is the order that minimizes the expected time to the first hit. The
+configured lists encode precedence, so selectors are only reordered within
+their precedence tier (`tiers`, aligned with the `configured` lists); without
+tiers a field keeps its configured order. Unseen selectors start from a prior
+that follows their position in the configured list, so the hand-written order
+holds until there is evidence against it.
+
+A field's reference selector is the one with the most recorded hits. When its
+hit rate over the last `window` tries falls below `collapse_ratio` times its
+long-run rate, a DOM-change alert is printed (once, until it recovers).
+"""
+
+import collections
+import json
+import os
+import threading
+
+# Floor for a selector's cost in seconds: every try is at least one WebDriver round-trip
+MIN_COST = 0.25
+# Cost assumed for a selector that has never been timed
+DEFAULT_COST = 1.0
+# Weight of the position prior, in tries
+PRIOR_TRIES = 2
+
+
+class SelectorStats:
+    """Thread-safe registry of selector outcomes, optionally persisted to state_file"""
+
+    def __init__(self, state_file=None, adaptive=True, window=30, min_samples=20, collapse_ratio=0.5,
+                 configured=None, tiers=None):
+        self.state_file = state_file
+        self.configured = configured or {}
+        self.tiers = tiers or {}
+        self.adaptive = adaptive
+        self.window = window
+        self.min_samples = min_samples
+        self.collapse_ratio = collapse_ratio
+        self._lock = threading.Lock()
+        self._stats = {}  # field -> selector -> {'tries', 'hits', 'timed', 'seconds'}
+        self._recent = collections.defaultdict(lambda: collections.deque(maxlen=self.window))
+        self._alerted = set()
+        self.alerts = []
+
+    # Persistence
+
+    def load(self, state_file=None):
+        """Read stats saved by an earlier run (a missing or unreadable file starts empty)"""
+        if state_file:
+            self.state_file = state_file
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as file:
+                stats = json.load(file)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self._stats = stats
+
+    def save(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            data = json.dumps(self._stats, indent=1)
+        temp_filename = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as file:
+            file.write(data)
+        os.replace(temp_filename, self.state_file)
+
+    # Recording
+
+    def record(self, field, selector, hit, seconds=None):
+        """
+        Record one try. seconds=None records a hit/miss without timing (e.g. a
+        selector the presence probe already found no match for).
+        """
+        with self._lock:
+            entry = self._stats.setdefault(field, {}).setdefault(
+                selector, {'tries': 0, 'hits': 0, 'timed': 0, 'seconds': 0.0})
+            entry['tries'] += 1
+            entry['hits'] += 1 if hit else 0
+            if seconds is not None:
+                entry['timed'] += 1
+                entry['seconds'] += seconds
+            self._recent[(field, selector)].append(bool(hit))
+            alert = self._check_collapse(field)
+        if alert:
+            print(alert)
+
+    def _check_collapse(self, field):
+        reference = self._reference(field)
+        if reference is None:
+            return None
+        entry = self._stats[field][reference]
+        recent = self._recent[(field, reference)]
+        if len(recent) < self.min_samples:
+            return None
+
+        long_run_rate = entry['hits'] / entry['tries']
+        recent_rate = sum(recent) / len(recent)
+        if recent_rate < long_run_rate * self.collapse_ratio:
+            if field in self._alerted:
+                return None
+            self._alerted.add(field)
+            alert = (f"🚨 Selector alert: '{field}' top selector hit rate fell to {recent_rate:.0%} "
+                     f"(long-run {long_run_rate:.0%}) - Google Maps may have changed its DOM: {reference}")
+            self.alerts.append(alert)
+            return alert
+        self._alerted.discard(field)
+        return None
+
+    def _reference(self, field):
+        """The field's most proven selector (most hits, with enough tries)"""
+        candidates = [(entry['hits'], selector) for selector, entry in self._stats.get(field, {}).items()
+                      if entry['tries'] >= self.min_samples and entry['hits']]
+        return max(candidates)[1] if candidates else None
+
+    # Ordering
+
+    def payoff(self, field, selector, position=0):
+        """Expected hits per second of trying this selector"""
+        with self._lock:
+            entry = self._stats.get(field, {}).get(selector)
+        prior = 0.5 ** position
+        if not entry:
+            return prior / DEFAULT_COST
+        hit_rate = (entry['hits'] + prior * PRIOR_TRIES) / (entry['tries'] + PRIOR_TRIES)
+        cost = entry['seconds'] / entry['timed'] if entry['timed'] else DEFAULT_COST
+        return hit_rate / max(cost, MIN_COST)
+
+    def _position(self, field, selector, default):
+        """Position of a selector in the field's configured list (default if not listed)"""
+        configured = self.configured.get(field) or []
+        return configured.index(selector) if selector in configured else default
+
+    def _tier(self, field, position):
+        tiers = self.tiers.get(field) or []
+        # No tier declared: the selector is pinned to its own position
+        return tiers[position] if position < len(tiers) else position
+
+    def ordered(self, field, selectors):
+        """
+        The selectors tier by tier, each tier in order of expected payoff
+        (configured order when not adaptive). `selectors` may be a subset of the
+        configured list, e.g. what the presence probe found.
+        """
+        if not self.adaptive or len(selectors) < 2:
+            return list(selectors)
+
+        def rank(item):
+            index, selector = item
+            position = self._position(field, selector, index)
+            return (self._tier(field, position), -self.payoff(field, selector, position), position)
+
+        return [selector for _, selector in sorted(enumerate(selectors), key=rank)]
+
+    # Visibility
+
+    def summary(self):
+        """{field: (selector with the most hits, its hit rate, its tries)}"""
+        result = {}
+        with self._lock:
+            for field, entries in self._stats.items():
+                best, entry = max(entries.items(), key=lambda item: (item[1]['hits'], -item[1]['tries']))
+                result[field] = (best, entry['hits'] / entry['tries'] if entry['tries'] else 0.0, entry['tries'])
+        return result
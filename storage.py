@@ -0,0 +1,308 @@
+"""
+SQLite storage backend for discovery results and place details.
+
+A single WAL-mode database holds both stages:
+
+    discoveries  one row per (place, search term, pincode) a search returned
+    places       one row per place with the extracted details
+
+Places are keyed by canonical_place_key (feature ID, else ChIJ place ID), so
+writes are upserts and URL variants of one place collapse into one row. A URL
+carrying only one of the IDs is matched to stored rows through their
+feature_id / place_id columns first, in both tables.
+Detail writes are buffered and committed in batches; discovery batches are
+committed per search. CSV stays available through the export functions and
+the command line at the bottom of this file.
+"""
+
+import csv
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from place_urls import canonical_place_key, decode_place_url
+
+DEFAULT_DB_FILENAME = 'xtract_places.db'
+
+# Detail rows buffered before a commit
+DEFAULT_BATCH_SIZE = 50
+
+# Place detail columns, in the same order as Extract_Maps.OUTPUT_FIELDNAMES
+PLACE_FIELDNAMES = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status',
+                    'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
+DISCOVERY_FIELDNAMES = ['URL', 'Search_Term', 'Pincode', 'Search_Query']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS discoveries (
+    place_key TEXT NOT NULL,
+    feature_id TEXT,
+    place_id TEXT,
+    search_term TEXT NOT NULL,
+    pincode TEXT NOT NULL,
+    search_query TEXT,
+    url TEXT NOT NULL,
+    discovered_at TEXT,
+    PRIMARY KEY (place_key, search_term, pincode)
+);
+CREATE INDEX IF NOT EXISTS idx_discoveries_pincode ON discoveries (pincode);
+CREATE INDEX IF NOT EXISTS idx_discoveries_search_term ON discoveries (search_term);
+
+CREATE TABLE IF NOT EXISTS places (
+    place_key TEXT PRIMARY KEY,
+    feature_id TEXT,
+    place_id TEXT,
+    url TEXT NOT NULL,
+    name TEXT,
+    address TEXT,
+    website TEXT,
+    phone TEXT,
+    store_type TEXT,
+    operating_status TEXT,
+    operating_hours TEXT,
+    rating TEXT,
+    review_count TEXT,
+    permanently_closed TEXT,
+    latitude TEXT,
+    longitude TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_places_store_type ON places (store_type);
+CREATE INDEX IF NOT EXISTS idx_places_place_id ON places (place_id);
+CREATE INDEX IF NOT EXISTS idx_places_feature_id ON places (feature_id);
+"""
+
+# Detail CSV column -> places table column
+PLACE_COLUMNS = {field: field.lower() for field in PLACE_FIELDNAMES}
+PLACE_COLUMNS['URL'] = 'url'
+
+UPSERT_PLACE_SQL = """
+INSERT INTO places (place_key, feature_id, place_id, {columns}, updated_at)
+VALUES (?, ?, ?, {placeholders}, ?)
+ON CONFLICT (place_key) DO UPDATE SET {updates},
+    feature_id = COALESCE(excluded.feature_id, feature_id),
+    place_id = COALESCE(excluded.place_id, place_id),
+    updated_at = excluded.updated_at
+""".format(
+    columns=', '.join(PLACE_COLUMNS.values()),
+    placeholders=', '.join('?' for _ in PLACE_COLUMNS),
+    updates=', '.join(f"{column} = excluded.{column}" for column in PLACE_COLUMNS.values()),
+)
+
+
+class PlaceStore:
+    """
+    Thread-safe access to the SQLite database. One connection is shared by all
+    threads and guarded by a lock; WAL mode lets other processes read meanwhile.
+    """
+
+    def __init__(self, db_filename=DEFAULT_DB_FILENAME, batch_size=DEFAULT_BATCH_SIZE):
+        self.db_filename = db_filename
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending_places = []
+        self._conn = sqlite3.connect(db_filename, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate_discoveries()
+        self._conn.commit()
+
+    def _migrate_discoveries(self):
+        """Add and backfill the discovery ID columns of databases created before they existed"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(discoveries)")]
+        if 'feature_id' not in columns:
+            self._conn.execute("ALTER TABLE discoveries ADD COLUMN feature_id TEXT")
+            self._conn.execute("ALTER TABLE discoveries ADD COLUMN place_id TEXT")
+            for rowid, url in self._conn.execute("SELECT rowid, url FROM discoveries").fetchall():
+                decoded = decode_place_url(url)
+                self._conn.execute("UPDATE discoveries SET feature_id = ?, place_id = ? WHERE rowid = ?",
+                                   (decoded['Feature_ID'], decoded['Place_ID'], rowid))
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_feature_id ON discoveries (feature_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_place_id ON discoveries (place_id)")
+
+    # Discoveries
+
+    def add_discoveries(self, rows):
+        """
+        Store one search's results in a single transaction.
+        Returns (new_for_term, new_overall): how many places were not yet known
+        for their search term, and not yet known at all.
+        """
+        new_for_term = 0
+        new_overall = 0
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self._conn:
+            for row in rows:
+                key = canonical_place_key(row.get('URL'))
+                if key is None:
+                    continue
+                decoded = decode_place_url(row.get('URL'))
+                key = self._resolve_discovery_key(key, decoded['Feature_ID'], decoded['Place_ID'])
+                known_overall = self._conn.execute(
+                    "SELECT 1 FROM discoveries WHERE place_key = ? LIMIT 1", (key,)).fetchone()
+                known_for_term = known_overall and self._conn.execute(
+                    "SELECT 1 FROM discoveries WHERE place_key = ? AND search_term = ? LIMIT 1",
+                    (key, row['Search_Term'])).fetchone()
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO discoveries"
+                    " (place_key, feature_id, place_id, search_term, pincode, search_query, url, discovered_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, decoded['Feature_ID'], decoded['Place_ID'], row['Search_Term'], row['Pincode'],
+                     row.get('Search_Query'), row['URL'], now))
+                new_for_term += 0 if known_for_term else 1
+                new_overall += 0 if known_overall else 1
+        return new_for_term, new_overall
+
+    def _resolve_discovery_key(self, key, feature_id, place_id):
+        """Key the place was first discovered under, which may have been its other ID"""
+        row = self._conn.execute(
+            "SELECT place_key FROM discoveries WHERE place_key = ? OR feature_id = ? OR place_id = ?"
+            " ORDER BY place_key = ? DESC LIMIT 1",
+            (key, feature_id, place_id, key)).fetchone()
+        return row[0] if row else key
+
+    def count_discovered_places(self, search_term=None):
+        with self._lock:
+            if search_term is None:
+                query, params = "SELECT COUNT(DISTINCT place_key) FROM discoveries", ()
+            else:
+                query, params = "SELECT COUNT(DISTINCT place_key) FROM discoveries WHERE search_term = ?", (search_term,)
+            return self._conn.execute(query, params).fetchone()[0]
+
+    # Place details
+
+    def upsert_place(self, result):
+        """Queue one extracted result; committed once batch_size results are pending"""
+        with self._lock:
+            self._pending_places.append(result)
+            if len(self._pending_places) >= self.batch_size:
+                self._commit_pending_places()
+
+    def upsert_places(self, results):
+        """Upsert several results in one transaction"""
+        with self._lock:
+            self._pending_places.extend(results)
+            self._commit_pending_places()
+
+    def flush(self):
+        with self._lock:
+            self._commit_pending_places()
+
+    def _resolve_place_key(self, key, feature_id, place_id):
+        """Key of the stored row for this place, which may have been saved under its other ID"""
+        row = self._conn.execute(
+            "SELECT place_key FROM places WHERE place_key = ? OR feature_id = ? OR place_id = ?"
+            " ORDER BY place_key = ? DESC LIMIT 1",
+            (key, feature_id, place_id, key)).fetchone()
+        return row[0] if row else key
+
+    def _commit_pending_places(self):
+        if not self._pending_places:
+            return
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+        with self._conn:
+            # One row at a time, so aliases also resolve to rows earlier in the batch
+            for result in self._pending_places:
+                decoded = decode_place_url(result.get('URL'))
+                key = canonical_place_key(result.get('URL'))
+                if key is None:
+                    continue
+                key = self._resolve_place_key(key, decoded['Feature_ID'], decoded['Place_ID'])
+                self._conn.execute(UPSERT_PLACE_SQL, [key, decoded['Feature_ID'], decoded['Place_ID']]
+                                   + [result.get(field) for field in PLACE_COLUMNS] + [now])
+        self._pending_places = []
+
+    def count_places(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+
+    def processed_urls(self, include_errors=True):
+        """
+        URLs of every place with stored details (including pending ones).
+        include_errors=False leaves out places whose retries were exhausted ('Error' rows).
+        """
+        query = "SELECT url FROM places" if include_errors else "SELECT url FROM places WHERE name IS NOT 'Error'"
+        with self._lock:
+            urls = [row[0] for row in self._conn.execute(query)]
+            return urls + [result.get('URL') for result in self._pending_places
+                           if include_errors or result.get('Name') != 'Error']
+
+    # Export / import
+
+    def export_places_csv(self, csv_filename):
+        """Write the place details in the Extract_Maps output CSV layout; returns the row count"""
+        self.flush()
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT {', '.join(PLACE_COLUMNS.values())} FROM places ORDER BY rowid")
+            return _write_csv(csv_filename, PLACE_FIELDNAMES, cursor)
+
+    def export_discoveries_csv(self, csv_filename, search_term=None):
+        """
+        Write discoveries in the discovery CSV layout, one row per place (first
+        discovery wins), optionally for a single search term
+        """
+        query = ("SELECT url, search_term, pincode, search_query FROM discoveries"
+                 " WHERE rowid IN (SELECT MIN(rowid) FROM discoveries {where} GROUP BY place_key) ORDER BY rowid")
+        params = ()
+        if search_term is None:
+            query = query.format(where='')
+        else:
+            query = query.format(where='WHERE search_term = ?')
+            params = (search_term,)
+        with self._lock:
+            return _write_csv(csv_filename, DISCOVERY_FIELDNAMES, self._conn.execute(query, params))
+
+    def import_places_csv(self, csv_filename):
+        with open(csv_filename, 'r', newline='', encoding='utf-8') as file:
+            results = [row for row in csv.DictReader(file) if row.get('URL')]
+        self.upsert_places(results)
+        return len(results)
+
+    def import_discoveries_csv(self, csv_filename):
+        with open(csv_filename, 'r', newline='', encoding='utf-8') as file:
+            rows = [row for row in csv.DictReader(file) if row.get('URL')]
+        return self.add_discoveries(rows)[1]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def _write_csv(csv_filename, fieldnames, rows):
+    count = 0
+    with open(csv_filename, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(fieldnames)
+        for row in rows:
+            writer.writerow(['' if value is None else value for value in row])
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    usage = ("Usage: python storage.py export-places OUTPUT.csv | export-discoveries OUTPUT.csv [SEARCH_TERM]"
+             " | import-places INPUT.csv | import-discoveries INPUT.csv  (database: XTRACT_DB or xtract_places.db)")
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    command, filename = sys.argv[1], sys.argv[2]
+    store = PlaceStore(os.environ.get('XTRACT_DB', DEFAULT_DB_FILENAME))
+    try:
+        if command == 'export-places':
+            print(f"✅ Exported {store.export_places_csv(filename)} places to {filename}")
+        elif command == 'export-discoveries':
+            search_term = sys.argv[3] if len(sys.argv) > 3 else None
+            print(f"✅ Exported {store.export_discoveries_csv(filename, search_term)} discoveries to {filename}")
+        elif command == 'import-places':
+            print(f"✅ Imported {store.import_places_csv(filename)} place rows from {filename}")
+        elif command == 'import-discoveries':
+            print(f"✅ Imported {store.import_discoveries_csv(filename)} new places from {filename}")
+        else:
+            print(usage)
+    finally:
+        store.close()
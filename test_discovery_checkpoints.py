@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the discovery checkpoint journal and the restart plan built from it
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import Google_Maps
+from Google_Maps import load_discovery_checkpoints, record_discovery_checkpoint, plan_discovery_searches
+
+TERMS = ['Stationery store', 'Pens']
+PINCODES = ['600001', '600002']
+
+
+def outcome(search_term, pincode, result_count=0, error=None):
+    return {'search_term': search_term, 'pincode': pincode, 'result_count': result_count,
+            'master_new_count': result_count, 'end_reason': 'end_of_list', 'error': error}
+
+
+def plan(checkpoints, rerun_failed_or_empty=False):
+    """plan_discovery_searches over the small TERMS x PINCODES grid"""
+    saved = Google_Maps.SEARCH_TERMS, Google_Maps.CHENNAI_PINCODES
+    Google_Maps.SEARCH_TERMS, Google_Maps.CHENNAI_PINCODES = TERMS, PINCODES
+    try:
+        return plan_discovery_searches(checkpoints, rerun_failed_or_empty)
+    finally:
+        Google_Maps.SEARCH_TERMS, Google_Maps.CHENNAI_PINCODES = saved
+
+
+def test_journal_status_and_latest_row():
+    """Each finished search is journalled as done/empty/failed, and the latest row per search wins"""
+    print("🧪 Testing the checkpoint journal")
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = os.path.join(tmp, 'checkpoints.csv')
+        assert load_discovery_checkpoints(journal) == {}
+
+        assert record_discovery_checkpoint(outcome('Pens', '600001', 12), journal) == 'done'
+        assert record_discovery_checkpoint(outcome('Pens', '600002'), journal) == 'empty'
+        assert record_discovery_checkpoint(outcome('Stationery store', '600001', error='no chrome'), journal) == 'failed'
+        # The failed search succeeds on a later run
+        assert record_discovery_checkpoint(outcome('Stationery store', '600001', 30), journal) == 'done'
+
+        with open(journal, newline='', encoding='utf-8') as file:
+            assert len(list(csv.DictReader(file))) == 4
+
+        checkpoints = load_discovery_checkpoints(journal)
+        assert set(checkpoints) == {('Pens', '600001'), ('Pens', '600002'), ('Stationery store', '600001')}
+        assert checkpoints[('Stationery store', '600001')]['Status'] == 'done'
+        assert checkpoints[('Stationery store', '600001')]['Result_Count'] == '30'
+        assert checkpoints[('Pens', '600002')]['Status'] == 'empty'
+    print("✅ PASSED")
+
+
+def test_restart_plan():
+    """Normal runs skip done/empty searches; rerun mode picks only failed/empty ones"""
+    print("🧪 Testing the restart plan")
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = os.path.join(tmp, 'checkpoints.csv')
+        assert plan({}) == [('Stationery store', '600001'), ('Pens', '600001'),
+                            ('Stationery store', '600002'), ('Pens', '600002')]
+
+        record_discovery_checkpoint(outcome('Stationery store', '600001', 5), journal)
+        record_discovery_checkpoint(outcome('Pens', '600001'), journal)
+        record_discovery_checkpoint(outcome('Stationery store', '600002', error='timeout'), journal)
+        checkpoints = load_discovery_checkpoints(journal)
+
+        # Failed and never-run searches are still to do, pincode-major
+        assert plan(checkpoints) == [('Stationery store', '600002'), ('Pens', '600002')]
+        # Rerun mode: only what failed or came back empty, not what never ran
+        assert plan(checkpoints, rerun_failed_or_empty=True) == [('Pens', '600001'), ('Stationery store', '600002')]
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_journal_status_and_latest_row()
+    test_restart_plan()
+    print("\n🎉 ALL DISCOVERY CHECKPOINT TESTS PASSED!")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the parallel discovery loop (scroll_google_maps_multiple_searches)
+with a stub driver factory and stub searches: no Chrome is started
+"""
+
+import sys
+import os
+import csv
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import Google_Maps
+
+TERMS = ['Stationery store', 'Pens']
+PINCODES = [str(600001 + offset) for offset in range(8)]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that remembers the most futures it had outstanding at once"""
+    peak = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._outstanding = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, *args, **kwargs):
+        with self._count_lock:
+            self._outstanding += 1
+            CountingExecutor.peak = max(CountingExecutor.peak, self._outstanding)
+        future = super().submit(*args, **kwargs)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._count_lock:
+            self._outstanding -= 1
+
+
+def place_url(search_term, pincode):
+    feature = abs(hash((search_term, pincode))) % 10**9
+    return f"https://www.google.com/maps/place/x/data=!4m2!3m1!1s0x3a52:0x{feature:x}"
+
+
+def stub_search(search_term, pincode, driver=None, search_stats=None, viewport=None):
+    """One place per search; the search for the third pincode blows up"""
+    time.sleep(0.01)
+    if pincode == PINCODES[2]:
+        raise RuntimeError("results feed never loaded")
+    search_stats['end_reason'] = 'end_of_list'
+    return [{'URL': place_url(search_term, pincode), 'Search_Term': search_term, 'Pincode': pincode,
+             'Search_Query': f"{search_term} {pincode}"}]
+
+
+def run_discovery(tmp, driver_factory, strategy='flat'):
+    """Run the discovery loop in tmp with the stubs; returns the new results and the checkpoint rows"""
+    patched = {
+        'SEARCH_TERMS': TERMS, 'CHENNAI_PINCODES': PINCODES, 'DISCOVERY_STRATEGY': strategy,
+        'RERUN_FAILED_OR_EMPTY': False, 'STORAGE_BACKEND': 'csv', 'RATE_LIMIT_STATE_FILE': None,
+        'END_OF_RUN_CHROME_SWEEP': False, 'DISCOVERY_SEARCHES_PER_MINUTE': 6000,
+        'DISCOVERY_MIN_SEARCHES_PER_MINUTE': 6000, 'DISCOVERY_MAX_SEARCHES_PER_MINUTE': 6000,
+        'DISCOVERY_WORKERS': 2, 'DISCOVERY_MAX_IN_FLIGHT': 4,
+        'create_stable_driver': driver_factory, 'safe_driver_quit': lambda driver: None,
+        'scroll_google_maps_single_search': stub_search, 'ThreadPoolExecutor': CountingExecutor,
+    }
+    saved = {name: getattr(Google_Maps, name) for name in patched}
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    Google_Maps.discovery_indexes.clear()
+    CountingExecutor.peak = 0
+    try:
+        for name, value in patched.items():
+            setattr(Google_Maps, name, value)
+        new_results = Google_Maps.scroll_google_maps_multiple_searches()
+        if not os.path.exists(Google_Maps.DISCOVERY_CHECKPOINT_FILENAME):
+            return new_results, []
+        with open(Google_Maps.DISCOVERY_CHECKPOINT_FILENAME, newline='', encoding='utf-8') as file:
+            return new_results, list(csv.DictReader(file))
+    finally:
+        for name, value in saved.items():
+            setattr(Google_Maps, name, value)
+        Google_Maps.discovery_indexes.clear()
+        os.chdir(cwd)
+
+
+def test_bounded_window_and_failed_searches():
+    """All searches run through a bounded window; failing ones are journalled as 'failed' and the run carries on"""
+    print("🧪 Testing the discovery loop with a failing search and a failing driver start")
+    starts = {'count': 0}
+
+    def flaky_driver_factory():
+        starts['count'] += 1
+        if starts['count'] == 1:
+            raise RuntimeError("Chrome failed to start")
+        return object()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        new_results, checkpoints = run_discovery(tmp, flaky_driver_factory)
+
+    statuses = {(row['Search_Term'], row['Pincode']): row['Status'] for row in checkpoints}
+    assert len(statuses) == len(TERMS) * len(PINCODES)
+    failed = [key for key, status in statuses.items() if status == 'failed']
+    print(f"  failed: {failed}, peak outstanding searches: {CountingExecutor.peak}")
+    # Both searches of the broken pincode, plus the one that hit the failed driver start
+    assert sum(1 for term, pincode in failed if pincode == PINCODES[2]) == 2
+    assert len(failed) == 3
+    assert new_results == len(statuses) - len(failed)
+    assert CountingExecutor.peak <= 4
+    print("✅ PASSED")
+
+
+def test_driver_that_never_starts():
+    """A driver factory that always fails still journals every search instead of aborting the run"""
+    print("🧪 Testing the discovery loop when Chrome never starts")
+
+    def broken_driver_factory():
+        raise RuntimeError("Chrome failed to start")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        new_results, checkpoints = run_discovery(tmp, broken_driver_factory)
+    assert new_results == 0
+    assert len(checkpoints) == len(TERMS) * len(PINCODES)
+    assert all(row['Status'] == 'failed' for row in checkpoints)
+    print("✅ PASSED")
+
+
+def test_quadtree_first_run_without_master_csv():
+    """'quadtree' discovery before any master CSV exists stops with an error instead of crashing"""
+    print("🧪 Testing quadtree discovery on a first run")
+    with tempfile.TemporaryDirectory() as tmp:
+        new_results, checkpoints = run_discovery(tmp, lambda: object(), strategy='quadtree')
+    assert new_results == 0 and checkpoints == []
+    print("✅ PASSED")
+
+
+class FeedDriver:
+    """Fake driver on a results feed: every scroll pass loads three more cards"""
+
+    def __init__(self):
+        self.cards = 0
+        self.harvested = 0
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        return object()
+
+    def find_elements(self, by, value):
+        return [object()]
+
+    def execute_script(self, script, *args):
+        if script == Google_Maps.FIND_SCROLLABLE_CONTAINER_JS:
+            return {'selector': 'div[role="feed"]', 'element': object()}
+        if script == Google_Maps.HARVEST_NEW_PLACE_URLS_JS:
+            new_cards = range(self.harvested, self.cards)
+            self.harvested = self.cards
+            return [place_url('Pens', card) for card in new_cards]
+        return None
+
+    def execute_async_script(self, script, *args):
+        time.sleep(0.05)
+        before, self.cards = self.cards, self.cards + 3
+        return {'before': before, 'after': self.cards, 'waited': 50, 'end': False}
+
+
+def test_search_timeout_harvests_last_pass():
+    """A search stopped by its time limit still returns the cards its last scroll pass loaded"""
+    print("🧪 Testing the final harvest after a search timeout")
+    saved = Google_Maps.DISCOVERY_ENTRY_MODE, Google_Maps.SEARCH_TIME_LIMIT_SECONDS
+    Google_Maps.DISCOVERY_ENTRY_MODE, Google_Maps.SEARCH_TIME_LIMIT_SECONDS = 'url', 0.2
+    try:
+        driver = FeedDriver()
+        search_stats = {}
+        results = Google_Maps.scroll_google_maps_single_search('Pens', '600001', driver=driver,
+                                                                search_stats=search_stats)
+    finally:
+        Google_Maps.DISCOVERY_ENTRY_MODE, Google_Maps.SEARCH_TIME_LIMIT_SECONDS = saved
+    assert search_stats['end_reason'] == 'search_timeout'
+    assert driver.cards > 0 and len(results) == driver.cards
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_bounded_window_and_failed_searches()
+    test_driver_that_never_starts()
+    test_quadtree_first_run_without_master_csv()
+    test_search_timeout_harvests_last_pass()
+    print("\n🎉 ALL DISCOVERY LOOP TESTS PASSED!")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the quadtree discovery planner against a simulated results feed
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from discovery_planner import (
+    make_tile, split_tile, tile_bounds, tile_contains, tile_span, root_tiles,
+    plan_discovery, nearest_pincode, pincode_centers_from_csv, TILE_RESULT_CAP
+)
+
+# Maps stops a results feed at roughly this many places
+FEED_LIMIT = 120
+
+
+def simulated_places(seed=7):
+    """A dense market cluster (George Town-like) plus sparse places across the city"""
+    rng = random.Random(seed)
+    places = [(rng.gauss(13.089, 0.02), rng.gauss(80.284, 0.02)) for _ in range(1500)]
+    places += [(rng.uniform(12.95, 13.15), rng.uniform(80.15, 80.30)) for _ in range(400)]
+    return places
+
+
+def simulated_feed(places):
+    """search_tile callback: the places inside the tile, truncated like a real feed"""
+    found = set()
+
+    def search_tile(tile):
+        inside = [index for index, (lat, lng) in enumerate(places) if tile_contains(tile, lat, lng)]
+        feed = inside[:FEED_LIMIT]
+        found.update(feed)
+        return {
+            'result_count': len(feed),
+            'end_reason': 'end_of_list' if len(inside) <= FEED_LIMIT else 'no_new_content',
+        }
+
+    return search_tile, found
+
+
+def test_tile_geometry():
+    """Children exactly cover their parent and root tiles cover every centre"""
+    print("🧪 Testing tile geometry")
+    tile = make_tile(327, 2007, 13)
+    south, west, north, east = tile_bounds(tile)
+    children = split_tile(tile)
+    assert len(children) == 4
+    assert all(child['zoom'] == 14 for child in children)
+    assert min(tile_bounds(child)[0] for child in children) == south
+    assert max(tile_bounds(child)[3] for child in children) == east
+    assert abs(tile_span(14) * 2 - tile_span(13)) < 1e-12
+    assert tile_contains(tile, tile['lat'], tile['lng'])
+
+    centers = [(13.089, 80.284), (13.091, 80.286), (12.90, 80.10)]
+    roots = root_tiles(centers)
+    assert len(roots) == 2  # the two George Town centres share a root tile
+    assert all(any(tile_contains(root, lat, lng) for root in roots) for lat, lng in centers)
+    print("✅ PASSED")
+
+
+def test_quadtree_splits_dense_tiles_only():
+    """Capped tiles are split until every feed reaches its end; sparse tiles stay single searches"""
+    print("🧪 Testing quadtree planning on a simulated feed")
+    places = simulated_places()
+    search_tile, found = simulated_feed(places)
+    roots = root_tiles([(lat, lng) for lat, lng in places])
+    summary = plan_discovery(roots, search_tile)
+
+    print(f"  roots {len(roots)}, searches {summary['searches']}, splits {summary['splits']}, "
+          f"found {len(found)}/{len(places)}")
+    assert summary['capped_leaves'] == 0
+    assert len(found) == len(places)
+    for tile, outcome in summary['tiles']:
+        if outcome['result_count'] < TILE_RESULT_CAP:
+            # Sparse and ordinary tiles are never split
+            assert not any(child_tile['zoom'] > tile['zoom'] and tile_contains(tile, child_tile['lat'], child_tile['lng'])
+                           for child_tile, _ in summary['tiles'])
+    print("✅ PASSED")
+
+
+def test_quadtree_beats_flat_pincode_loop():
+    """More places per search and fewer searches than one fixed search per pincode"""
+    print("🧪 Testing coverage per search against the flat loop")
+    places = simulated_places()
+    rng = random.Random(11)
+    # 57 pincode centres spread like the real Chennai list: many in the dense core
+    pincode_centers = {f"6000{index:02d}": places[rng.randrange(len(places))] for index in range(57)}
+
+    # Flat loop: one fixed zoom-15 viewport per pincode centre
+    flat_search, flat_found = simulated_feed(places)
+    span = tile_span(15)
+    for lat, lng in pincode_centers.values():
+        flat_search(make_tile(int(lat // span), int(lng // span), 15))
+    flat_searches = len(pincode_centers)
+
+    tiled_search, tiled_found = simulated_feed(places)
+    summary = plan_discovery(root_tiles(pincode_centers.values()), tiled_search)
+
+    flat_rate = len(flat_found) / flat_searches
+    tiled_rate = len(tiled_found) / summary['searches']
+    print(f"  flat: {flat_searches} searches, {len(flat_found)} places ({flat_rate:.1f}/search)")
+    print(f"  tiled: {summary['searches']} searches, {len(tiled_found)} places ({tiled_rate:.1f}/search)")
+    assert summary['searches'] < flat_searches
+    assert len(tiled_found) > len(flat_found)
+    assert tiled_rate > flat_rate
+
+    tile = summary['tiles'][0][0]
+    assert nearest_pincode(tile, pincode_centers) in pincode_centers
+    print("✅ PASSED")
+
+
+def test_pincode_centers_from_csv():
+    """Centres are the median place per pincode; a master CSV that doesn't exist yet gives none"""
+    print("🧪 Testing pincode centres from a discovery CSV")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_filename = os.path.join(tmp, 'master.csv')
+        assert pincode_centers_from_csv(csv_filename) == {}
+
+        with open(csv_filename, 'w', encoding='utf-8') as file:
+            file.write("URL,Search_Term,Pincode,Search_Query\n")
+            for lat in (13.08, 13.09, 13.10):
+                file.write(f"https://www.google.com/maps/place/x/data=!4m6!3m5!1s0x1:0x2!8m2!3d{lat}!4d80.28,Pens,600001,Pens 600001\n")
+        centers = pincode_centers_from_csv(csv_filename)
+        assert list(centers) == ['600001']
+        assert abs(centers['600001'][0] - 13.09) < 1e-9 and abs(centers['600001'][1] - 80.28) < 1e-9
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_tile_geometry()
+    test_quadtree_splits_dense_tiles_only()
+    test_quadtree_beats_flat_pincode_loop()
+    test_pincode_centers_from_csv()
+    print("\n🎉 ALL DISCOVERY PLANNER TESTS PASSED!")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the driver pool reuses drivers and applies its recycle policies
+"""
+
+import sys
+import os
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    """Stand-in for a Chrome driver that only records whether it was quit"""
+
+    def __init__(self, slot_id):
+        self.slot_id = slot_id
+        self.quit_called = False
+
+
+def fake_quit(driver):
+    driver.quit_called = True
+
+
+def test_driver_reused_across_pages():
+    """One worker scraping many pages should launch a single driver"""
+    print("🧪 Testing driver reuse")
+    pool = DriverPool(FakeDriver, fake_quit, size=1, recycle_after_pages=0)
+
+    drivers = set()
+    for _ in range(10):
+        slot = pool.checkout()
+        drivers.add(id(slot['driver']))
+        pool.checkin(slot)
+
+    assert len(drivers) == 1, f"Expected 1 driver, got {len(drivers)}"
+    assert pool.stats()['drivers_created'] == 1
+    print("✅ PASSED")
+
+
+def test_recycle_after_pages():
+    """The driver is restarted after the configured number of pages"""
+    print("🧪 Testing recycle-after-N-pages")
+    pool = DriverPool(FakeDriver, fake_quit, size=1, recycle_after_pages=3)
+
+    slot = pool.checkout()
+    first = slot['driver']
+    for _ in range(3):
+        pool.checkin(slot)
+        slot = pool.checkout()
+
+    assert first.quit_called, "Driver should be quit after 3 pages"
+    assert slot['driver'] is not first, "A fresh driver should have been created"
+    assert pool.stats()['drivers_recycled'] == 1
+    print("✅ PASSED")
+
+
+def test_recycle_on_error():
+    """A failed page recycles the driver only when the policy is enabled"""
+    print("🧪 Testing recycle-on-error")
+    pool = DriverPool(FakeDriver, fake_quit, size=1, recycle_after_pages=0, recycle_on_error=True)
+    slot = pool.checkout()
+    first = slot['driver']
+    pool.checkin(slot, failed=True)
+    assert first.quit_called, "Driver should be quit after a failed page"
+
+    pool = DriverPool(FakeDriver, fake_quit, size=1, recycle_after_pages=0, recycle_on_error=False)
+    slot = pool.checkout()
+    first = slot['driver']
+    pool.checkin(slot, failed=True)
+    assert not first.quit_called, "Driver should be kept when recycle_on_error is off"
+    print("✅ PASSED")
+
+
+def test_retire_killed_driver():
+    """A driver killed by the watchdog is replaced even when recycle_on_error is off"""
+    print("🧪 Testing forced retire")
+    pool = DriverPool(FakeDriver, fake_quit, size=1, recycle_after_pages=0, recycle_on_error=False)
+    slot = pool.checkout()
+    first = slot['driver']
+    pool.checkin(slot, failed=True, retire=True)
+    assert first.quit_called
+    assert pool.checkout()['driver'] is not first
+    print("✅ PASSED")
+
+
+def test_concurrent_workers_share_pool():
+    """Several threads never create more drivers than the pool size"""
+    print("🧪 Testing concurrent checkout")
+    pool = DriverPool(FakeDriver, fake_quit, size=3, recycle_after_pages=0)
+
+    def worker():
+        for _ in range(20):
+            slot = pool.checkout()
+            pool.checkin(slot)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert pool.stats()['drivers_created'] <= 3
+    pool.close()
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_driver_reused_across_pages()
+    test_recycle_after_pages()
+    test_recycle_on_error()
+    test_retire_killed_driver()
+    test_concurrent_workers_share_pool()
+    print("\n🎉 ALL DRIVER POOL TESTS PASSED!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the per-URL watchdog and driver process-tree cleanup
+"""
+
+import sys
+import os
+import time
+import subprocess
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from driver_watchdog import (
+    PSUTIL_AVAILABLE, Watchdog, kill_driver_process_tree, driver_process_records, kill_recorded_process_trees
+)
+
+# Parent that starts a long-sleeping child, like chromedriver starting Chrome
+PARENT_SCRIPT = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "print(child.pid, flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    def __init__(self, process=None):
+        self.service = FakeService(process)
+
+
+def test_watchdog_kills_only_overdue_pages():
+    """Pages released within budget are left alone; overdue ones are killed, then re-killed if stuck"""
+    print("🧪 Testing watchdog budget")
+    killed = []
+    lock = threading.Lock()
+
+    def on_expire(driver):
+        with lock:
+            killed.append(driver)
+
+    watchdog = Watchdog(0.2, on_expire, grace_seconds=0.2, check_interval=0.02)
+    fast, slow = FakeDriver(), FakeDriver()
+    fast_token = watchdog.watch(fast, 'fast')
+    slow_token = watchdog.watch(slow, 'slow')
+    assert watchdog.release(fast_token) is False
+
+    time.sleep(0.3)
+    assert watchdog.expired(slow_token)
+    assert killed == [slow]
+
+    time.sleep(0.3)
+    assert killed == [slow, slow], "A worker still not back after the grace period is killed again"
+    assert watchdog.release(slow_token) is True
+    watchdog.close()
+
+    stats = watchdog.stats()
+    assert (stats['watched'], stats['expired'], stats['stuck'], stats['active']) == (2, 1, 1, 0)
+    print("✅ PASSED")
+
+
+def test_disabled_watchdog():
+    """A budget of None never starts the thread"""
+    print("🧪 Testing disabled watchdog")
+    watchdog = Watchdog(None)
+    token = watchdog.watch(FakeDriver())
+    assert token is None and watchdog.release(token) is False
+    watchdog.close()
+    print("✅ PASSED")
+
+
+def test_kill_process_tree():
+    """The driver's service process and its children are all killed"""
+    print("🧪 Testing process tree kill")
+    parent = subprocess.Popen([sys.executable, '-c', PARENT_SCRIPT], stdout=subprocess.PIPE, text=True)
+    child_pid = int(parent.stdout.readline())
+
+    killed = kill_driver_process_tree(FakeDriver(parent))
+    parent.wait(timeout=5)
+    parent.stdout.close()
+    assert parent.returncode is not None
+
+    if PSUTIL_AVAILABLE:
+        import psutil
+        assert killed == 2
+        assert not psutil.pid_exists(child_pid) or psutil.Process(child_pid).status() == psutil.STATUS_ZOMBIE
+    print("✅ PASSED")
+
+
+def test_kill_recorded_process_trees():
+    """Only the recorded driver's processes are swept; an unrelated process survives"""
+    print("🧪 Testing the recorded-process sweep")
+    if not PSUTIL_AVAILABLE:
+        assert kill_recorded_process_trees([]) is None
+        print("✅ PASSED (psutil not installed)")
+        return
+    ours = subprocess.Popen([sys.executable, '-c', PARENT_SCRIPT], stdout=subprocess.PIPE, text=True)
+    ours.stdout.readline()
+    other = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    records = driver_process_records(FakeDriver(ours))
+    assert [pid for pid, _ in records] == [ours.pid]
+
+    # A record whose PID was reused by another process is skipped
+    assert kill_recorded_process_trees([(other.pid, 0.0)]) == 0
+    assert kill_recorded_process_trees(records) == 2
+    ours.wait(timeout=5)
+    ours.stdout.close()
+    assert other.poll() is None
+    other.kill()
+    other.wait(timeout=5)
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_watchdog_kills_only_overdue_pages()
+    test_disabled_watchdog()
+    test_kill_process_tree()
+    test_kill_recorded_process_trees()
+    print("\n🎉 ALL DRIVER WATCHDOG TESTS PASSED!")
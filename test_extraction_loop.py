@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the bounded extraction loop (process_urls_multithreaded)
+with a stub driver factory and stub pages: no Chrome is started
+"""
+
+import sys
+import os
+import csv
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import Extract_Maps
+
+URLS = [f"https://www.google.com/maps/place/x/data=!4m2!3m1!1s0x3a52:0x{index:x}" for index in range(1, 21)]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that remembers the most futures it had outstanding at once"""
+    peak = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._outstanding = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, *args, **kwargs):
+        with self._count_lock:
+            self._outstanding += 1
+            CountingExecutor.peak = max(CountingExecutor.peak, self._outstanding)
+        future = super().submit(*args, **kwargs)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._count_lock:
+            self._outstanding -= 1
+
+
+class StubDriver:
+    def quit(self):
+        pass
+
+
+def stub_page(failing_urls):
+    """scrape_data stand-in: a full row, or a page error for the URLs in failing_urls"""
+    def scrape_data(url, driver, wait, parse_executor=None):
+        time.sleep(0.005)
+        if url in failing_urls:
+            raise RuntimeError("net::ERR_CONNECTION_RESET")
+        result = {field: 'x' for field in Extract_Maps.OUTPUT_FIELDNAMES}
+        result.update({'URL': url, 'Name': f"Place {url[-2:]}"})
+        return result
+    return scrape_data
+
+
+def run_extraction(tmp, failing_urls, driver_factory=None):
+    """Run the extraction loop over URLS into tmp/output.csv; returns the output rows"""
+    output_filename = os.path.join(tmp, 'output.csv')
+    patched = {
+        'create_chrome_driver': driver_factory or (lambda thread_id=0: StubDriver()),
+        'safe_driver_quit': lambda driver: None,
+        'scrape_data': stub_page(failing_urls),
+        'ThreadPoolExecutor': CountingExecutor,
+        'STORAGE_BACKEND': 'csv', 'EXTRACTION_MODE': 'selenium', 'RATE_LIMIT_STATE_FILE': None,
+        'SELECTOR_STATS_FILE': os.path.join(tmp, 'selector_stats.json'),
+        'PAGES_PER_MINUTE': 60000, 'MIN_PAGES_PER_MINUTE': 60000, 'MAX_PAGES_PER_MINUTE': 60000,
+        'RETRY_BACKOFF_SECONDS': 0.01, 'RETRY_BACKOFF_MAX_SECONDS': 0.02, 'MAX_ATTEMPTS': 2,
+        'RETRY_EXHAUSTED_NEXT_RUN': True, 'URL_TIME_BUDGET_SECONDS': None,
+    }
+    saved = {name: getattr(Extract_Maps, name) for name in patched}
+    Extract_Maps.processed_index_source = None
+    CountingExecutor.peak = 0
+    try:
+        for name, value in patched.items():
+            setattr(Extract_Maps, name, value)
+        Extract_Maps.process_urls_multithreaded(iter(URLS), output_filename, os.path.exists(output_filename))
+    finally:
+        for name, value in saved.items():
+            setattr(Extract_Maps, name, value)
+        Extract_Maps.processed_index_source = None
+
+    with open(output_filename, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def test_bounded_window_and_failing_pages():
+    """URLs stream through a bounded window; pages that keep failing end as one 'Error' row each"""
+    print("🧪 Testing the extraction loop with failing pages")
+    failing = set(URLS[3:6])
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = run_extraction(tmp, failing)
+        with open(os.path.join(tmp, 'output_errors.csv'), newline='', encoding='utf-8') as file:
+            attempts = list(csv.DictReader(file))
+
+    print(f"  rows: {len(rows)}, peak outstanding pages: {CountingExecutor.peak}")
+    assert sorted(row['URL'] for row in rows) == sorted(URLS)
+    assert {row['URL'] for row in rows if row['Name'] == 'Error'} == failing
+    # Two attempts each, the last one final
+    assert len(attempts) == 2 * len(failing)
+    assert sum(1 for row in attempts if row['Final'] == 'Yes') == len(failing)
+    # MAX_THREADS * 2 pages queued or running at most
+    assert CountingExecutor.peak <= 4
+    print("✅ PASSED")
+
+
+def test_resume_replaces_error_rows():
+    """A resumed run retries 'Error' rows; a success replaces the old row instead of adding a second one"""
+    print("🧪 Testing resume over exhausted URLs")
+    failing = set(URLS[:8])
+    with tempfile.TemporaryDirectory() as tmp:
+        first = run_extraction(tmp, failing)
+        assert sum(1 for row in first if row['Name'] == 'Error') == 8
+
+        # Half of them recover, the rest fail again
+        second = run_extraction(tmp, set(URLS[:4]))
+    print(f"  rows after resume: {len(second)}")
+    assert sorted(row['URL'] for row in second) == sorted(URLS)
+    assert {row['URL'] for row in second if row['Name'] == 'Error'} == set(URLS[:4])
+    print("✅ PASSED")
+
+
+def test_driver_that_never_starts():
+    """A driver factory that always fails turns every page into a retried error, not a crashed run"""
+    print("🧪 Testing the extraction loop when Chrome never starts")
+
+    def broken_driver_factory(thread_id=0):
+        raise RuntimeError("Chrome failed to start")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = run_extraction(tmp, set(), broken_driver_factory)
+    assert len(rows) == len(URLS)
+    assert all(row['Name'] == 'Error' for row in rows)
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_bounded_window_and_failing_pages()
+    test_resume_replaces_error_rows()
+    test_driver_that_never_starts()
+    print("\n🎉 ALL EXTRACTION LOOP TESTS PASSED!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the geo-fence pre-filter for place URLs
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from geofence import CHENNAI_GEOFENCE, haversine_km, point_in_polygon, geofence_check, check_place_url
+
+CHENNAI_URL = "https://www.google.com/maps/place/Golden+Paper+%26+Stationery+Stores/data=!4m7!3m6!1s0x3a526f511066c25b:0xc854cd80c9159e73!8m2!3d13.0886349!4d80.2839207!16s%2Fg%2F1tf3mblz!19sChIJW8JmEFFvUjoRc54VyYDNVMg?authuser=0&hl=en&rclk=1"
+# Labelled pincode 600001 in 1_to_2k.csv, but located in Hyderabad
+HYDERABAD_URL = "https://www.google.com/maps/place/Hasti+Stationery+mart/data=!4m7!3m6!1s0x3bcb915ca0940321:0xb95ea91f1a8b1bfa!8m2!3d17.4402189!4d78.3944511!16s%2Fg%2F1yglp_lwh!19sChIJIQOUoFyRyzsR-huLGh-pXrk?authuser=0&hl=en&rclk=1"
+
+
+def test_distance_and_polygon():
+    """Haversine distance and ray-casting polygon test"""
+    print("🧪 Testing distance and polygon checks")
+    distance = haversine_km(13.0827, 80.2707, 17.3850, 78.4867)
+    print(f"  Chennai -> Hyderabad: {distance:.0f} km")
+    assert 500 < distance < 530
+
+    square = [(13.0, 80.2), (13.0, 80.3), (13.1, 80.3), (13.1, 80.2)]
+    assert point_in_polygon(13.05, 80.25, square)
+    assert not point_in_polygon(13.15, 80.25, square)
+    assert not point_in_polygon(13.05, 80.35, square)
+
+    inside, distance_km = geofence_check(13.05, 80.25, {'polygon': square})
+    assert inside and distance_km is None
+    inside, _ = geofence_check(13.05, 80.25, {'center': (13.05, 80.25), 'radius_km': 5, 'polygon': square[:3]})
+    assert not inside  # inside the radius but outside the triangle
+    print("✅ PASSED")
+
+
+def test_place_urls_against_city_fence():
+    """Chennai places pass, Hyderabad places are flagged, coordinate-less URLs are unknown"""
+    print("🧪 Testing place URLs against the Chennai fence")
+    inside, lat, lng, distance_km = check_place_url(CHENNAI_URL, CHENNAI_GEOFENCE)
+    assert inside and lat == 13.0886349 and distance_km < 5
+
+    inside, lat, lng, distance_km = check_place_url(HYDERABAD_URL, CHENNAI_GEOFENCE)
+    print(f"  Hyderabad place: {distance_km:.0f} km from Chennai")
+    assert inside is False and lng == 78.3944511
+
+    assert check_place_url("https://www.google.com/maps/search/stationery", CHENNAI_GEOFENCE) == (None, None, None, None)
+    print("✅ PASSED")
+
+
+def test_quarantine_file_is_rewritten_each_run():
+    """Out-of-area input rows go to the quarantine file; a clean run leaves no stale one behind"""
+    print("🧪 Testing the out-of-area quarantine file")
+    from Extract_Maps import iter_input_urls
+
+    def write_input(filename, urls):
+        with open(filename, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=['URL'])
+            writer.writeheader()
+            writer.writerows({'URL': url} for url in urls)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_filename = os.path.join(tmp, 'input.csv')
+        quarantine_filename = os.path.join(tmp, 'input_out_of_area.csv')
+
+        write_input(input_filename, [CHENNAI_URL, HYDERABAD_URL])
+        assert list(iter_input_urls(input_filename, CHENNAI_GEOFENCE)) == [CHENNAI_URL]
+        with open(quarantine_filename, newline='', encoding='utf-8') as file:
+            assert [row['URL'] for row in csv.DictReader(file)] == [HYDERABAD_URL]
+
+        write_input(input_filename, [CHENNAI_URL])
+        assert list(iter_input_urls(input_filename, CHENNAI_GEOFENCE)) == [CHENNAI_URL]
+        assert not os.path.exists(quarantine_filename)
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_distance_and_polygon()
+    test_place_urls_against_city_fence()
+    test_quarantine_file_is_rewritten_each_run()
+    print("\n🎉 ALL GEOFENCE TESTS PASSED!")
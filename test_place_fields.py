@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared field validation rules, the snapshot result builder
+and the offline HTML parser
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from place_fields import (
+    FIELD_SELECTORS, PHONE_XPATHS, RATING_SELECTORS, parse_phone_text, parse_status_text,
+    parse_rating_text, parse_review_count, is_store_type_text, build_place_result,
+    probed_selectors, absent_fields, SELECTOR_TIERS
+)
+from place_parser import parse_place_html, save_place_html, parse_stored_page
+
+# Trimmed-down place panel with the class names the selectors rely on
+SAMPLE_PANEL_HTML = """
+<div role="main" aria-label="Krishika stationery">
+  <h1 class="DUwDvf lfPIob">Krishika stationery</h1>
+  <div class="F7nice">
+    <span><span aria-hidden="true">5.0</span></span>
+    <span><span aria-label="12 reviews">(12)</span></span>
+  </div>
+  <button class="DkEaL" jsaction="pane.wfvdle18.category">Office supply wholesaler</button>
+  <span class="ZDu9vd"><span>Open</span> ⋅ Closes 9 pm</span>
+  <div class="rogA2c"><div class="Io6YTe fontBodyMedium kR99db">270, Linghi Chetty Street, George Town, Chennai 600001</div></div>
+  <a aria-label="Website: instagram.com" href="https://www.instagram.com/krishika_stationery_94">instagram.com</a>
+  <div class="AeaXub"><div class="Io6YTe fontBodyMedium kR99db">044 2522 2944</div></div>
+</div>
+"""
+
+
+def test_status_parsing():
+    """Operating status lines map to the same status/hours as the Selenium extractor"""
+    print("🧪 Testing operating status parsing")
+    cases = [
+        ("Open ⋅ Closes 9 pm", ("Open", "Closes 9 pm")),
+        ("Closed ⋅ Opens 8 am Tue", ("Open", "Opens 8 am")),
+        ("Open now", ("Open now", "Not Found")),
+        ("Closed", ("Closed", "Not Found")),
+        ("Directions", None),
+    ]
+    for text, expected in cases:
+        result = parse_status_text(text)
+        print(f"  {text!r} -> {result}")
+        assert result == expected, f"Expected {expected}, got {result}"
+    print("✅ PASSED")
+
+
+def test_value_validation():
+    """Phone, rating, review count and category validation"""
+    print("🧪 Testing value validation")
+    assert parse_phone_text("044 2522 2944") == "04425222944"
+    assert parse_phone_text("+91 44 2522 2944") == "+914425222944"
+    assert parse_phone_text("Send to phone") is None
+
+    assert parse_rating_text("4.5") == "4.5"
+    assert parse_rating_text("7.5") is None
+    assert parse_rating_text("") is None
+
+    assert parse_review_count("478 reviews", "") == "478"
+    assert parse_review_count(None, "(40)") == "40"
+    assert parse_review_count("Write a review", "") is None
+
+    assert is_store_type_text("Book store")
+    assert not is_store_type_text("Directions")
+    print("✅ PASSED")
+
+
+def empty_snapshot():
+    return {field: [[] for _ in selectors] for field, selectors in FIELD_SELECTORS.items()}
+
+
+def test_build_place_result():
+    """A raw snapshot is turned into the same result fields as scrape_data"""
+    print("🧪 Testing snapshot result builder")
+    raw = empty_snapshot()
+    raw['name'][0] = [{'text': ' Golden Paper & Stationery Stores ', 'href': None, 'aria': None}]
+    raw['address'][0] = [{'text': 'D, 25, Anderson Street, George Town, Chennai 600001', 'href': None, 'aria': None}]
+    # Phone only available through the tel: link fallback
+    raw['phone'][PHONE_XPATHS.index("//a[contains(@href, 'tel:')]")] = [
+        {'text': '', 'href': 'tel:+919499917450', 'aria': None}
+    ]
+    # First category candidate is an action button and must be skipped
+    raw['store_type'][0] = [
+        {'text': 'Directions', 'href': None, 'aria': None},
+        {'text': 'Stationery store', 'href': None, 'aria': None},
+    ]
+    raw['status'][0] = [{'text': 'Open ⋅ Closes 9 pm', 'href': None, 'aria': None}]
+    raw['rating'][0] = [{'text': '4.5', 'href': None, 'aria': None}]
+    raw['review_count'][0] = [{'text': '(478)', 'href': None, 'aria': '478 reviews'}]
+
+    result = build_place_result(raw)
+    print(f"  {result}")
+    assert result['Name'] == 'Golden Paper & Stationery Stores'
+    assert result['Address'].startswith('D, 25, Anderson Street')
+    assert result['Website'] == 'Not Found'
+    assert result['Phone'] == '+919499917450'
+    assert result['Store_Type'] == 'Stationery store'
+    assert (result['Operating_Status'], result['Operating_Hours']) == ('Open', 'Closes 9 pm')
+    assert result['Rating'] == '4.5'
+    assert result['Review_Count'] == '478'
+    assert result['Permanently_Closed'] == 'No'
+    print("✅ PASSED")
+
+
+def test_hours_table_fallback():
+    """Today's hours come from the hours table only when no status line was found"""
+    print("🧪 Testing hours table fallback")
+    raw = empty_snapshot()
+    raw['hours'][2] = [{'text': '9 am–9 pm', 'href': None, 'aria': None}]
+    result = build_place_result(raw)
+    assert result['Name'] == 'Name Not Found'
+    assert (result['Operating_Status'], result['Operating_Hours']) == ('Not Found', '9 am–9 pm')
+    print("✅ PASSED")
+
+
+def test_presence_probe_selection():
+    """Only matched selectors are tried, marker-only sections get the full list, absent ones none"""
+    print("🧪 Testing presence probe selector choice")
+    probe = {
+        'selectors': {field: [False] * len(selectors) for field, selectors in FIELD_SELECTORS.items()},
+        'markers': {field: False for field in FIELD_SELECTORS},
+    }
+    probe['selectors']['name'][0] = True
+    probe['selectors']['phone'][3] = True
+    probe['markers']['rating'] = True
+
+    assert probed_selectors(probe, 'phone') == [PHONE_XPATHS[3]]
+    assert probed_selectors(probe, 'rating') == RATING_SELECTORS
+    assert probed_selectors(probe, 'website') == []
+    assert probed_selectors(None, 'website') == FIELD_SELECTORS['website']
+    assert absent_fields(probe) == ['address', 'website', 'store_type', 'status', 'hours',
+                                    'review_count', 'permanently_closed']
+    assert absent_fields(None) == []
+    print("✅ PASSED")
+
+
+def test_selector_tiers():
+    """Every selector has a tier, and tiers never put a later selector ahead of an earlier one"""
+    print("🧪 Testing selector precedence tiers")
+    assert set(SELECTOR_TIERS) == set(FIELD_SELECTORS)
+    for field, selectors in FIELD_SELECTORS.items():
+        tiers = SELECTOR_TIERS[field]
+        assert len(tiers) == len(selectors), field
+        assert tiers == sorted(tiers) and tiers[0] == 0, field
+        assert tiers.count(0) == 1 or field == 'permanently_closed', field
+    print("✅ PASSED")
+
+
+def test_offline_html_parser():
+    """Stored panel HTML parses to the same fields, including after a save/load round-trip"""
+    print("🧪 Testing offline HTML parser")
+    fields = parse_place_html(SAMPLE_PANEL_HTML)
+    print(f"  {fields}")
+    assert fields['Name'] == 'Krishika stationery'
+    assert fields['Address'].startswith('270, Linghi Chetty Street')
+    assert fields['Website'] == 'https://www.instagram.com/krishika_stationery_94'
+    assert fields['Phone'] == '04425222944'
+    assert fields['Store_Type'] == 'Office supply wholesaler'
+    assert (fields['Operating_Status'], fields['Operating_Hours']) == ('Open', 'Closes 9 pm')
+    assert fields['Rating'] == '5.0'
+    assert fields['Review_Count'] == '12'
+
+    url = "https://www.google.com/maps/place/Krishika+stationery/data=!4m7!3m6!1s0x3a526f4e4aa272af:0xd5a0483b1c0a29e6"
+    with tempfile.TemporaryDirectory() as html_dir:
+        path = save_place_html(url, SAMPLE_PANEL_HTML, html_dir)
+        stored_url, stored_fields = parse_stored_page(path)
+    assert stored_url == url
+    assert stored_fields == fields
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_status_parsing()
+    test_value_validation()
+    test_build_place_result()
+    test_hours_table_fallback()
+    test_presence_probe_selection()
+    test_selector_tiers()
+    test_offline_html_parser()
+    print("\n🎉 ALL PLACE FIELD TESTS PASSED!")
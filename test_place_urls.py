@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the browser-free place URL decoder
+"""
+
+import sys
+import os
+import math
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from place_urls import decode_place_url, decode_place_urls, canonical_place_key, PlaceIndex
+
+GOLDEN_PAPER_URL = "https://www.google.com/maps/place/Golden+Paper+%26+Stationery+Stores/data=!4m7!3m6!1s0x3a526f511066c25b:0xc854cd80c9159e73!8m2!3d13.0886349!4d80.2839207!16s%2Fg%2F1tf3mblz!19sChIJW8JmEFFvUjoRc54VyYDNVMg?authuser=0&hl=en&rclk=1"
+NO_KG_URL = "https://www.google.com/maps/place/Sri+Balaji+Stores/data=!4m7!3m6!1s0x3a5265f0b2a8a6f5:0x5f1b4c9c7d7e0c11!8m2!3d13.0401!4d80.2339!19sChIJ9aaosvBlUjoREQx-fZxMG18?authuser=0&hl=en&rclk=1"
+SEARCH_URL = "https://www.google.com/maps/search/restaurants"
+
+
+def test_decode_single_url():
+    """All identity parts are decoded from a full place URL"""
+    print("🧪 Testing single URL decoding")
+    decoded = decode_place_url(GOLDEN_PAPER_URL)
+    print(f"  {decoded}")
+    assert decoded == {
+        'Name': 'Golden Paper & Stationery Stores',
+        'Feature_ID': '0x3a526f511066c25b:0xc854cd80c9159e73',
+        'Place_ID': 'ChIJW8JmEFFvUjoRc54VyYDNVMg',
+        'KG_ID': '/g/1tf3mblz',
+        'Latitude': 13.0886349,
+        'Longitude': 80.2839207,
+    }
+
+    decoded = decode_place_url(NO_KG_URL)
+    assert decoded['KG_ID'] is None
+    assert decoded['Place_ID'] == 'ChIJ9aaosvBlUjoREQx-fZxMG18'
+
+    decoded = decode_place_url(SEARCH_URL)
+    assert all(value is None for value in decoded.values())
+    assert all(value is None for value in decode_place_url(None).values())
+    print("✅ PASSED")
+
+
+def test_decode_url_column():
+    """The vectorised decoder matches the single-URL decoder row by row"""
+    print("🧪 Testing URL column decoding")
+    urls = [GOLDEN_PAPER_URL, NO_KG_URL, SEARCH_URL, None]
+    decoded = decode_place_urls(urls)
+    print(decoded.to_string())
+
+    assert list(decoded.columns) == ['Name', 'Feature_ID', 'Place_ID', 'KG_ID', 'Latitude', 'Longitude']
+    assert len(decoded) == len(urls)
+    for row, url in zip(decoded.to_dict('records'), urls):
+        expected = decode_place_url(url)
+        for column, value in expected.items():
+            if value is None:
+                assert row[column] is None or (isinstance(row[column], float) and math.isnan(row[column])), column
+            else:
+                assert row[column] == value, f"{column}: {row[column]} != {value}"
+    assert str(decoded['Latitude'].dtype) == 'float64'
+    print("✅ PASSED")
+
+
+def test_canonical_place_key():
+    """URLs differing only in slug, authuser or rclk share one key"""
+    print("🧪 Testing canonical place keys")
+    variant = GOLDEN_PAPER_URL.replace("Golden+Paper+%26+Stationery+Stores", "Golden+Paper").replace("authuser=0&hl=en&rclk=1", "authuser=1")
+    assert canonical_place_key(GOLDEN_PAPER_URL) == '0x3a526f511066c25b:0xc854cd80c9159e73'
+    assert canonical_place_key(variant) == canonical_place_key(GOLDEN_PAPER_URL)
+    assert canonical_place_key(SEARCH_URL + "?hl=en") == SEARCH_URL
+    assert canonical_place_key(None) is None
+    print("✅ PASSED")
+
+
+def test_place_index_aliases():
+    """A URL with only a place ID or only a feature ID matches a stored URL carrying both"""
+    print("🧪 Testing alias-aware place index")
+    index = PlaceIndex([GOLDEN_PAPER_URL])
+    place_id_only = "https://www.google.com/maps/place/Golden+Paper/data=!4m2!3m1!19sChIJW8JmEFFvUjoRc54VyYDNVMg?hl=en"
+    feature_id_only = "https://www.google.com/maps/place/Golden+Paper/data=!4m7!3m6!1s0x3a526f511066c25b:0xc854cd80c9159e73!8m2!3d13.0886349!4d80.2839207"
+    assert place_id_only in index
+    assert feature_id_only in index
+    assert not index.add(place_id_only)
+    assert index.add(NO_KG_URL)
+    assert index.add(SEARCH_URL)
+    assert not index.add(SEARCH_URL + "?authuser=1")
+    assert not index.add(None)
+    assert len(index) == 3
+
+    # A full URL teaches the index the feature ID of a place first seen by place ID
+    index = PlaceIndex([place_id_only])
+    assert feature_id_only not in index
+    assert not index.add(GOLDEN_PAPER_URL)
+    assert feature_id_only in index
+    assert len(index) == 1
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_decode_single_url()
+    test_decode_url_column()
+    test_canonical_place_key()
+    test_place_index_aliases()
+    print("\n🎉 ALL PLACE URL TESTS PASSED!")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared request rate limiter
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+import multiprocessing
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rate_limiter import RateLimiter
+
+
+def test_requests_are_spaced_across_threads():
+    """Request starts from several threads are spaced by the configured interval"""
+    print("🧪 Testing request spacing across threads")
+    limiter = RateLimiter(rate_per_minute=1200)  # one start every 50ms
+    starts = []
+    starts_lock = threading.Lock()
+
+    def worker():
+        for _ in range(3):
+            limiter.acquire()
+            with starts_lock:
+                starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    starts.sort()
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    print(f"  {len(starts)} starts, smallest gap {min(gaps)*1000:.1f}ms")
+    assert len(starts) == 9
+    assert min(gaps) >= 0.04
+    print("✅ PASSED")
+
+
+def test_disabled_limiter():
+    """A rate of 0 never blocks"""
+    print("🧪 Testing disabled limiter")
+    limiter = RateLimiter(rate_per_minute=0)
+    started = time.monotonic()
+    for _ in range(100):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.1
+    print("✅ PASSED")
+
+
+def test_adaptive_rate():
+    """Successes raise the rate additively, failures cut it multiplicatively, within bounds"""
+    print("🧪 Testing adaptive rate")
+    limiter = RateLimiter(rate_per_minute=10, min_rate=4, max_rate=12, increase_per_success=1, decrease_factor=0.5)
+    limiter.record_success()
+    assert limiter.current_rate() == 11
+    for _ in range(5):
+        limiter.record_success()
+    assert limiter.current_rate() == 12
+    limiter.record_failure()
+    assert limiter.current_rate() == 6
+    limiter.record_failure()
+    assert limiter.current_rate() == 4
+    print(f"  {limiter.describe()}")
+    assert limiter.stats()['failures'] == 2
+    print("✅ PASSED")
+
+
+def acquire_in_process(state_file, count, results):
+    limiter = RateLimiter(rate_per_minute=600, state_file=state_file)
+    for _ in range(count):
+        limiter.acquire()
+        results.append(time.time())
+
+
+def test_shared_across_processes():
+    """Two processes sharing a state file split one budget instead of each getting their own"""
+    print("🧪 Testing rate shared across processes")
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'rate.json')
+        manager = multiprocessing.Manager()
+        results = manager.list()
+        processes = [multiprocessing.Process(target=acquire_in_process, args=(state_file, 4, results)) for _ in range(2)]
+        started = time.time()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        starts = sorted(results)
+        manager.shutdown()
+
+        # 8 starts at 600/min (one per 100ms) with one token banked: at least ~0.7s
+        print(f"  8 starts spread over {starts[-1] - starts[0]:.2f}s")
+        assert len(starts) == 8
+        assert starts[-1] - started >= 0.6
+
+        # A failure seen by one process slows the other down too
+        limiter = RateLimiter(rate_per_minute=600, state_file=state_file)
+        limiter.record_failure()
+        other = RateLimiter(rate_per_minute=600, state_file=state_file)
+        assert other.current_rate() == 300
+    print("✅ PASSED")
+
+
+def test_workloads_keep_their_own_bounds():
+    """Workloads sharing a file keep separate rates, clamped to each reader's bounds, and stale rates reset"""
+    print("🧪 Testing per-workload rates in a shared file")
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'rate.json')
+        extraction = RateLimiter(20, min_rate=4, max_rate=60, increase_per_success=1,
+                                 state_file=state_file, workload='extraction')
+        for _ in range(200):
+            extraction.record_success()
+        discovery = RateLimiter(6, min_rate=2, max_rate=15, state_file=state_file, workload='discovery')
+        for _ in range(5):
+            discovery.record_failure()
+        assert extraction.current_rate() == 60
+        assert discovery.current_rate() == 2
+
+        # Another process of the same workload with a tighter cap never goes above it
+        capped = RateLimiter(20, min_rate=4, max_rate=30, state_file=state_file, workload='extraction')
+        assert capped.current_rate() == 30
+
+        # A rate left over from an old run starts again from the default
+        fresh = RateLimiter(20, min_rate=4, max_rate=60, state_file=state_file, workload='extraction',
+                            stale_after=0)
+        time.sleep(0.01)
+        assert fresh.current_rate() == 20
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_requests_are_spaced_across_threads()
+    test_disabled_limiter()
+    test_adaptive_rate()
+    test_shared_across_processes()
+    test_workloads_keep_their_own_bounds()
+    print("\n🎉 ALL RATE LIMITER TESTS PASSED!")
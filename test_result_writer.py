@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the batched asynchronous result writer
+"""
+
+import sys
+import os
+import csv
+import time
+import tempfile
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from result_writer import ResultWriter, CsvSink
+
+FIELDNAMES = ['URL', 'Name']
+
+
+class RecordingSink:
+    """Sink that remembers every batch and fsync"""
+
+    def __init__(self):
+        self.batches = []
+        self.fsyncs = 0
+        self.closed = False
+
+    def write(self, rows):
+        self.batches.append(list(rows))
+
+    def fsync(self):
+        self.fsyncs += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_batches_on_size_and_drains_on_close():
+    """Rows from many threads are written in full batches, and close() drains the rest"""
+    print("🧪 Testing size-based batching and drain on close")
+    sink = RecordingSink()
+    writer = ResultWriter(sink, batch_size=10, flush_interval=60, fsync_policy='batch')
+
+    def worker(worker_id):
+        for index in range(12):
+            writer.submit({'URL': f"u{worker_id}-{index}", 'Name': 'x'})
+
+    threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    sizes = [len(batch) for batch in sink.batches]
+    print(f"  batch sizes: {sizes}, fsyncs: {sink.fsyncs}")
+    assert sum(sizes) == 48
+    assert sizes[:4] == [10, 10, 10, 10] and sizes[4] == 8
+    assert sink.fsyncs == len(sizes)
+    assert sink.closed
+    assert writer.stats()['rows_written'] == 48
+    print("✅ PASSED")
+
+
+def test_flushes_on_time():
+    """A partial batch is written once its oldest row has waited flush_interval"""
+    print("🧪 Testing time-based flushing")
+    sink = RecordingSink()
+    writer = ResultWriter(sink, batch_size=100, flush_interval=0.1, fsync_policy='none')
+    writer.submit({'URL': 'a', 'Name': 'x'})
+    writer.submit({'URL': 'b', 'Name': 'x'})
+    time.sleep(0.5)
+    assert [len(batch) for batch in sink.batches] == [2]
+    writer.close()
+    assert sink.fsyncs == 0
+    print("✅ PASSED")
+
+
+def test_interval_fsync_and_csv_sink():
+    """The 'interval' policy fsyncs at close even between intervals; CSV rows land in order"""
+    print("🧪 Testing interval fsync with the CSV sink")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_filename = os.path.join(tmp, 'output.csv')
+        writer = ResultWriter(CsvSink(csv_filename, FIELDNAMES, write_header=True),
+                              batch_size=2, flush_interval=60, fsync_policy='interval', fsync_interval=3600)
+        for index in range(5):
+            writer.submit({'URL': f"u{index}", 'Name': f"n{index}"})
+        writer.close()
+        assert writer.stats()['fsyncs'] == 1
+
+        with open(csv_filename, newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert [row['URL'] for row in rows] == ['u0', 'u1', 'u2', 'u3', 'u4']
+    print("✅ PASSED")
+
+
+class FailingSink(RecordingSink):
+    """Sink whose writes fail for rows marked 'bad'"""
+
+    def write(self, rows):
+        if any(row['Name'] == 'bad' for row in rows):
+            raise OSError("disk full")
+        super().write(rows)
+
+
+def test_write_futures_report_outcome():
+    """Each submit() returns a Future resolved once its batch is written, or failed with the sink's error"""
+    print("🧪 Testing write confirmation and failure reporting")
+    sink = FailingSink()
+    writer = ResultWriter(sink, batch_size=2, flush_interval=60, fsync_policy='none')
+    good = [writer.submit({'URL': 'a', 'Name': 'x'}), writer.submit({'URL': 'b', 'Name': 'x'})]
+    bad = [writer.submit({'URL': 'c', 'Name': 'bad'}), writer.submit({'URL': 'd', 'Name': 'x'})]
+    writer.close()
+
+    assert all(written.result(timeout=1) is True for written in good)
+    assert all(isinstance(written.exception(timeout=1), OSError) for written in bad)
+    stats = writer.stats()
+    assert stats['rows_written'] == 2 and stats['failed_rows'] == 2
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_batches_on_size_and_drains_on_close()
+    test_flushes_on_time()
+    test_interval_fsync_and_csv_sink()
+    test_write_futures_report_outcome()
+    print("\n🎉 ALL RESULT WRITER TESTS PASSED!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify failure classification and retry scheduling
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from selenium.common.exceptions import TimeoutException, WebDriverException, InvalidSessionIdException
+
+from retry_policy import (
+    DRIVER_CRASH, TIMEOUT, NAVIGATION, UNKNOWN, RetryQueue, ErrorStore,
+    classify_failure, is_empty_panel, backoff_delay
+)
+
+
+def test_classify_failure():
+    """Exceptions map to driver crash, timeout, navigation or unknown"""
+    print("🧪 Testing failure classification")
+    assert classify_failure(InvalidSessionIdException("invalid session id")) == DRIVER_CRASH
+    assert classify_failure(WebDriverException("chrome not reachable")) == DRIVER_CRASH
+    assert classify_failure(ConnectionRefusedError("[Errno 111] Connection refused")) == DRIVER_CRASH
+    assert classify_failure(TimeoutException("")) == TIMEOUT
+    assert classify_failure(WebDriverException("timeout: Timed out receiving message from renderer")) == TIMEOUT
+    assert classify_failure(WebDriverException("unknown error: net::ERR_NAME_NOT_RESOLVED")) == NAVIGATION
+    assert classify_failure(KeyError('Name')) == UNKNOWN
+    print("✅ PASSED")
+
+
+def test_empty_panel():
+    """A result with no name and no panel fields is an empty panel"""
+    print("🧪 Testing empty panel detection")
+    empty = {'Name': 'Name Not Found', 'Address': 'Not Found', 'Website': 'Not Found',
+             'Phone': 'Phone Number Not Found', 'Store_Type': 'Not Found', 'Rating': 'Not Found',
+             'Review_Count': 'Not Found', 'Permanently_Closed': 'No'}
+    assert is_empty_panel(empty)
+    assert not is_empty_panel(dict(empty, Phone='04425222944'))
+    assert not is_empty_panel(dict(empty, Name='AVM Stationery'))
+    print("✅ PASSED")
+
+
+def test_backoff_and_queue():
+    """Backoff doubles per attempt up to the cap; retries come out when due, earliest first"""
+    print("🧪 Testing backoff and retry queue")
+    assert [backoff_delay(attempt, 5, 30, jitter=0) for attempt in (2, 3, 4, 5)] == [5, 10, 20, 30]
+    assert 3.75 <= backoff_delay(2, 5, 30) <= 6.25
+
+    queue = RetryQueue()
+    queue.schedule(60, 'late', 1, 2)
+    queue.schedule(0, 'due', 2, 3)
+    assert len(queue) == 2
+    assert queue.pop_ready() == ('due', 2, 3)
+    assert queue.pop_ready() is None
+    assert 59 < queue.next_ready_in() <= 60
+    print("✅ PASSED")
+
+
+def test_error_store():
+    """Every failed attempt is logged with its class, and the final one is marked"""
+    print("🧪 Testing error store")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ErrorStore(os.path.join(tmp, 'output_errors.csv'))
+        store.record('u1', 1, TIMEOUT, TimeoutException("page"))
+        store.record('u1', 2, TIMEOUT, TimeoutException("page"), final=True)
+        store.record('u2', 1, DRIVER_CRASH, "chrome not reachable")
+        with open(store.csv_filename, newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert [(row['URL'], row['Attempt'], row['Final']) for row in rows] == [('u1', '1', 'No'), ('u1', '2', 'Yes'), ('u2', '1', 'No')]
+        assert store.describe() == "driver_crash: 1, timeout: 2"
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_classify_failure()
+    test_empty_panel()
+    test_backoff_and_queue()
+    test_error_store()
+    print("\n🎉 ALL RETRY POLICY TESTS PASSED!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the selector registry: payoff ordering, persistence and DOM-change alerts
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from selector_stats import SelectorStats
+
+SELECTORS = ['primary', 'fallback', 'last_resort']
+
+
+def test_configured_order_until_evidence():
+    """Unseen selectors keep their configured order; a proven fallback overtakes its tier peers only"""
+    print("🧪 Testing payoff ordering within tiers")
+    configured = {'rating': SELECTORS}
+    stats = SelectorStats(min_samples=1000, configured=configured, tiers={'rating': [0, 1, 1]})
+    assert stats.ordered('rating', SELECTORS) == SELECTORS
+
+    # Cheap misses alone do not make a selector look attractive
+    for _ in range(5):
+        stats.record('rating', 'last_resort', False, 0.01)
+    for _ in range(30):
+        stats.record('rating', 'fallback', False, 0.6)
+    for _ in range(30):
+        stats.record('rating', 'last_resort', True, 0.6)
+    assert stats.ordered('rating', SELECTORS) == ['primary', 'last_resort', 'fallback']
+
+    # A failing primary is pinned: fallbacks never jump ahead of it
+    for _ in range(40):
+        stats.record('rating', 'primary', False, 15.0)
+    assert stats.ordered('rating', SELECTORS)[0] == 'primary'
+
+    # The position prior comes from the configured list, also for a probe-filtered subset
+    fresh = SelectorStats(configured=configured, tiers={'rating': [0, 0, 0]})
+    assert fresh.ordered('rating', ['last_resort', 'fallback']) == ['fallback', 'last_resort']
+
+    # Without tiers a field keeps its configured order
+    untiered = SelectorStats(configured=configured)
+    for _ in range(30):
+        untiered.record('rating', 'last_resort', True, 0.3)
+    assert untiered.ordered('rating', SELECTORS) == SELECTORS
+
+    stats.adaptive = False
+    assert stats.ordered('rating', SELECTORS) == SELECTORS
+    print("✅ PASSED")
+
+
+def test_persistence():
+    """Stats survive a save/load round-trip, and a bad file starts empty"""
+    print("🧪 Testing persistence")
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'selector_stats.json')
+        stats = SelectorStats(state_file, configured={'phone': SELECTORS}, tiers={'phone': [0, 0, 0]})
+        for _ in range(10):
+            stats.record('phone', 'fallback', True, 0.3)
+            stats.record('phone', 'primary', False)
+        stats.save()
+
+        reloaded = SelectorStats(configured={'phone': SELECTORS}, tiers={'phone': [0, 0, 0]})
+        reloaded.load(state_file)
+        assert reloaded.ordered('phone', SELECTORS)[0] == 'fallback'
+        assert reloaded.summary()['phone'][1:] == (1.0, 10)
+
+        with open(state_file, 'w', encoding='utf-8') as file:
+            file.write('{not json')
+        broken = SelectorStats(state_file, configured={'phone': SELECTORS}, tiers={'phone': [0, 0, 0]})
+        broken.load()
+        assert broken.ordered('phone', SELECTORS) == SELECTORS
+    print("✅ PASSED")
+
+
+def test_collapse_alert():
+    """A collapse of the top selector's recent hit rate alerts once, and again after recovery"""
+    print("🧪 Testing DOM-change alert")
+    stats = SelectorStats(window=10, min_samples=10, collapse_ratio=0.5)
+    for _ in range(50):
+        stats.record('store_type', 'primary', True, 0.5)
+    assert stats.alerts == []
+
+    for _ in range(10):
+        stats.record('store_type', 'primary', False, 0.1)
+    assert len(stats.alerts) == 1 and "'store_type'" in stats.alerts[0]
+
+    for _ in range(10):
+        stats.record('store_type', 'primary', True, 0.5)
+    for _ in range(10):
+        stats.record('store_type', 'primary', False, 0.1)
+    assert len(stats.alerts) == 2
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_configured_order_until_evidence()
+    test_persistence()
+    test_collapse_alert()
+    print("\n🎉 ALL SELECTOR STATS TESTS PASSED!")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the SQLite storage backend
+"""
+
+import sys
+import os
+import csv
+import sqlite3
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from storage import PlaceStore, PLACE_FIELDNAMES
+
+GOLDEN_PAPER_URL = "https://www.google.com/maps/place/Golden+Paper+%26+Stationery+Stores/data=!4m7!3m6!1s0x3a526f511066c25b:0xc854cd80c9159e73!8m2!3d13.0886349!4d80.2839207!16s%2Fg%2F1tf3mblz!19sChIJW8JmEFFvUjoRc54VyYDNVMg?authuser=0&hl=en&rclk=1"
+GOLDEN_PAPER_VARIANT = GOLDEN_PAPER_URL.replace("authuser=0&hl=en&rclk=1", "authuser=1")
+GOLDEN_PAPER_PLACE_ID_URL = "https://www.google.com/maps/place/?q=place_id:x/data=!4m2!3m1!19sChIJW8JmEFFvUjoRc54VyYDNVMg"
+AVM_URL = "https://www.google.com/maps/place/AVM+STATIONERY+STORES/data=!4m7!3m6!1s0x3a5265c89bef6bd9:0x1f75faf67e6d38f3!8m2!3d13.0887797!4d80.2838219!16s%2Fg%2F1tjddm46!19sChIJ2Wvvm8hlUjoR8zhtfvb6dR8?authuser=0&hl=en&rclk=1"
+
+
+def discovery(url, search_term, pincode):
+    return {'URL': url, 'Search_Term': search_term, 'Pincode': pincode, 'Search_Query': f"{search_term} {pincode}"}
+
+
+def test_discoveries():
+    """Discovery batches count new places per term and overall, across URL variants"""
+    print("🧪 Testing discovery storage")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PlaceStore(os.path.join(tmp, 'places.db'))
+        assert store.add_discoveries([
+            discovery(GOLDEN_PAPER_URL, 'Stationery store', '600001'),
+            discovery(AVM_URL, 'Stationery store', '600001'),
+        ]) == (2, 2)
+        # Same place under another URL variant and pincode: known for this term
+        assert store.add_discoveries([discovery(GOLDEN_PAPER_VARIANT, 'Stationery store', '600003')]) == (0, 0)
+        # Known overall, but new for another term
+        assert store.add_discoveries([discovery(GOLDEN_PAPER_VARIANT, 'Pens', '600001')]) == (1, 0)
+
+        assert store.count_discovered_places() == 2
+        assert store.count_discovered_places('Pens') == 1
+
+        export = os.path.join(tmp, 'master.csv')
+        assert store.export_discoveries_csv(export) == 2
+        with open(export, newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert rows[0]['URL'] == GOLDEN_PAPER_URL and rows[0]['Pincode'] == '600001'
+        store.close()
+    print("✅ PASSED")
+
+
+def test_discovery_aliases_share_a_place():
+    """A place discovered under its place ID only and then its feature ID only counts once"""
+    print("🧪 Testing alias-aware discoveries")
+    feature_only_url = GOLDEN_PAPER_URL.split('!8m2')[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PlaceStore(os.path.join(tmp, 'places.db'))
+        assert store.add_discoveries([discovery(GOLDEN_PAPER_PLACE_ID_URL, 'Pens', '600001')]) == (1, 1)
+        # The full URL links both IDs, so a feature-ID-only URL then matches too
+        assert store.add_discoveries([discovery(GOLDEN_PAPER_URL, 'Pens', '600002')]) == (0, 0)
+        assert store.add_discoveries([discovery(feature_only_url, 'Stationery store', '600003')]) == (1, 0)
+        assert store.count_discovered_places() == 1
+        assert store.export_discoveries_csv(os.path.join(tmp, 'master.csv')) == 1
+        store.close()
+    print("✅ PASSED")
+
+
+def test_discoveries_migration():
+    """A database from before the discovery ID columns is migrated and backfilled on open"""
+    print("🧪 Testing the discovery ID column migration")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_filename = os.path.join(tmp, 'places.db')
+        with sqlite3.connect(db_filename) as conn:
+            conn.execute("CREATE TABLE discoveries (place_key TEXT NOT NULL, search_term TEXT NOT NULL,"
+                         " pincode TEXT NOT NULL, search_query TEXT, url TEXT NOT NULL, discovered_at TEXT,"
+                         " PRIMARY KEY (place_key, search_term, pincode))")
+            conn.execute("INSERT INTO discoveries VALUES ('ChIJW8JmEFFvUjoRc54VyYDNVMg', 'Pens', '600001', 'Pens 600001', ?, '')",
+                         (GOLDEN_PAPER_PLACE_ID_URL,))
+        store = PlaceStore(db_filename)
+        assert store.add_discoveries([discovery(GOLDEN_PAPER_URL, 'Pens', '600002')]) == (0, 0)
+        assert store.count_discovered_places() == 1
+        store.close()
+    print("✅ PASSED")
+
+
+def test_place_upserts():
+    """Detail writes are batched, upserted by place key and exported in the output layout"""
+    print("🧪 Testing place detail upserts")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_filename = os.path.join(tmp, 'places.db')
+        store = PlaceStore(db_filename, batch_size=2)
+        assert sqlite3.connect(db_filename).execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        store.upsert_place({'URL': GOLDEN_PAPER_URL, 'Name': 'Golden Paper', 'Store_Type': 'Stationery store'})
+        # Still pending: not committed until the batch fills
+        assert sqlite3.connect(db_filename).execute("SELECT COUNT(*) FROM places").fetchone()[0] == 0
+        assert GOLDEN_PAPER_URL in store.processed_urls()
+
+        store.upsert_place({'URL': GOLDEN_PAPER_VARIANT, 'Name': 'Golden Paper & Stationery Stores',
+                            'Store_Type': 'Stationery store'})
+        assert sqlite3.connect(db_filename).execute("SELECT COUNT(*) FROM places").fetchone()[0] == 1
+
+        store.upsert_places([{'URL': AVM_URL, 'Name': 'AVM', 'Phone': '04425222944'}])
+        assert store.count_places() == 2
+
+        export = os.path.join(tmp, 'output.csv')
+        assert store.export_places_csv(export) == 2
+        with open(export, newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            rows = list(reader)
+        assert reader.fieldnames == PLACE_FIELDNAMES
+        assert rows[0]['Name'] == 'Golden Paper & Stationery Stores'
+        assert rows[1]['Phone'] == '04425222944' and rows[1]['Website'] == ''
+        store.close()
+    print("✅ PASSED")
+
+
+def test_place_aliases_share_a_row():
+    """A place-ID-only URL and a full URL of the same place end up in one row, in either order"""
+    print("🧪 Testing alias-aware place upserts")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PlaceStore(os.path.join(tmp, 'places.db'), batch_size=1)
+        store.upsert_place({'URL': GOLDEN_PAPER_PLACE_ID_URL, 'Name': 'Golden Paper'})
+        store.upsert_place({'URL': GOLDEN_PAPER_URL, 'Name': 'Golden Paper & Stationery Stores'})
+        assert store.count_places() == 1
+
+        # Both IDs are kept, so a later place-ID-only URL still lands on the same row
+        store.upsert_places([{'URL': GOLDEN_PAPER_PLACE_ID_URL, 'Name': 'Golden Paper Stores'}])
+        with sqlite3.connect(os.path.join(tmp, 'places.db')) as conn:
+            rows = conn.execute("SELECT feature_id, place_id, name FROM places").fetchall()
+        assert rows == [('0x3a526f511066c25b:0xc854cd80c9159e73', 'ChIJW8JmEFFvUjoRc54VyYDNVMg', 'Golden Paper Stores')]
+
+        # Within one batch too
+        store.upsert_places([{'URL': AVM_URL, 'Name': 'AVM'},
+                             {'URL': AVM_URL.split('!8m2')[0], 'Name': 'AVM Stationery'}])
+        assert store.count_places() == 2
+        store.close()
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_discoveries()
+    test_discovery_aliases_share_a_place()
+    test_discoveries_migration()
+    test_place_upserts()
+    test_place_aliases_share_a_row()
+    print("\n🎉 ALL STORAGE TESTS PASSED!")